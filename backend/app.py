@@ -7,6 +7,7 @@ from sqlalchemy import text
 from dotenv import load_dotenv
 from twilio.rest import Client
 import os
+import click
 import cloudinary
 
 # --- Models / DB ---
@@ -21,6 +22,20 @@ from models import (
 # --- Routes / Blueprint ---
 # <- use same bcrypt instance as routes
 from routes.routes import routes, register_mail_instance, bcrypt
+from utils.scope_helper import backfill_landlord_ids
+from utils.activity_helper import backfill_activity_events
+from utils.search_helper import ensure_search_index
+from utils.phone_helper import backfill_phone_keys
+from utils.billing_helper import backfill_billing_periods, require_billing_periods
+from utils.alerts_helper import refresh_transfer_alerts, DEFAULT_MONTHS, DEFAULT_THRESHOLD
+from utils.recurring_expense_helper import generate_recurring_expenses
+from utils.vacate_notice_helper import process_vacate_notices
+from utils.unit_status_helper import load_unit_statuses
+from utils.expense_import_helper import (
+    import_expenses, ImportAborted, ImportFormatError, BATCH_SIZE as EXPENSE_BATCH_SIZE
+)
+from migrations import run_migrations
+from utils.pool_metrics import engine_options_from_env, pool_stats
 
 # Load env
 load_dotenv()
@@ -32,6 +47,9 @@ app = Flask(__name__)
 # -------------------------
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URL")
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Pool sizing / pre-ping / recycle (DB_POOL_* env vars)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options_from_env(
+    app.config['SQLALCHEMY_DATABASE_URI'])
 app.config['JWT_SECRET_KEY'] = os.getenv("JWT_SECRET_KEY")
 app.config['JWT_IDENTITY_CLAIM'] = 'identity'
 
@@ -93,6 +111,13 @@ register_mail_instance(mail)
 # Register blueprint
 app.register_blueprint(routes)
 
+# Unit status name <-> ID registry (loads lazily instead if the DB isn't ready)
+with app.app_context():
+    try:
+        load_unit_statuses()
+    except Exception as e:
+        app.logger.warning(f"Unit statuses not loaded at startup: {e}")
+
 # -------------------------
 # Health checks
 # -------------------------
@@ -118,20 +143,119 @@ def health_db():
         with db.engine.connect() as conn:
             conn.execute(text("SELECT 1"))
         db_name = db.engine.url.database  # portable way to show DB name
-        return {"ok": True, "database": db_name}, 200
+        return {"ok": True, "database": db_name, "pool": pool_stats(db.engine)}, 200
     except Exception as e:
         return {"ok": False, "error": str(e)}, 500
 
 
+# -------------------------
+# Scheduled jobs (cron: flask --app app <command>)
+# -------------------------
+@app.cli.command("refresh-alerts")
+@click.option("--months", default=DEFAULT_MONTHS, show_default=True)
+@click.option("--threshold", default=DEFAULT_THRESHOLD, show_default=True)
+def refresh_alerts_command(months, threshold):
+    """Recompute repeat-transfer alerts for every landlord (nightly)."""
+    n = refresh_transfer_alerts(months, threshold)
+    click.echo(f"✅ {n} repeat-transfer alert(s) stored.")
+
+
+@app.cli.command("generate-recurring-expenses")
+@click.option("--as-of", "as_of", type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m"]),
+              help="Generate up to this month (default: current month)")
+def generate_recurring_expenses_command(as_of):
+    """Materialize due recurring expenses, catching up missed months (daily)."""
+    result = generate_recurring_expenses(as_of.date() if as_of else None)
+    click.echo(f"✅ {result['generated']} expense(s) generated for "
+               f"{result['definitions']} recurring definition(s).")
+
+
+@app.cli.command("process-vacate-notices")
+@click.option("--as-of", "as_of", type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Complete notices due on or before this date (default: today)")
+@click.option("--notify", is_flag=True, help="Text each vacated tenant a move-out confirmation")
+def process_vacate_notices_command(as_of, notify):
+    """Vacate tenants whose pending vacate notice is due (daily; safe to run concurrently)."""
+    result = process_vacate_notices(as_of.date() if as_of else None, notify=notify)
+    click.echo(f"✅ {result['claimed']} notice(s) processed: {result['vacated']} tenant(s) vacated, "
+               f"{result['already_vacated']} already gone, {result['canceled']} canceled.")
+
+
+# -------------------------
+# Data imports
+# -------------------------
+@app.cli.command("import-expenses")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--landlord", "landlord_id", type=int, required=True, help="Owning landlord's UserID")
+@click.option("--apartment", "apartment_id", type=int, help="Default ApartmentID for rows without one")
+@click.option("--type", "expense_type", help="Default ExpenseType for rows without one")
+@click.option("--batch-size", default=EXPENSE_BATCH_SIZE, show_default=True)
+@click.option("--dry-run", is_flag=True, help="Validate and count without inserting")
+def import_expenses_command(path, landlord_id, apartment_id, expense_type, batch_size, dry_run):
+    """Bulk-import expenses from a CSV / bank-statement export (idempotent on PaymentRef)."""
+    try:
+        with open(path, "rb") as f:   # decoded line by line by the importer
+            result = import_expenses(landlord_id, f, default_apartment_id=apartment_id,
+                                     default_type=expense_type, dry_run=dry_run,
+                                     batch_size=batch_size)
+    except ImportFormatError as e:
+        raise click.ClickException(f"Could not read CSV: {e}")
+    except ImportAborted as e:
+        raise click.ClickException(
+            f"Could not read line {e.line}: {e}. {e.result['inserted']} row(s) before it "
+            f"{'would be ' if dry_run else 'were '}imported.")
+    for err in result["errors"]:
+        click.echo(f"  line {err['line']}: {err['message']}", err=True)
+    verb = "would be imported" if dry_run else "imported"
+    click.echo(f"✅ {result['inserted']} of {result['rows']} row(s) {verb}; "
+               f"{result['duplicates']} duplicate(s), {result['failed']} error(s).")
+
+
+# -------------------------
+# Schema & backfills (run on every deploy; idempotent)
+# -------------------------
+def upgrade_database(echo=print):
+    """create_all, index migrations, then the data backfills the hot paths rely on."""
+    db.create_all()
+    echo("✅ All tables created/verified.")
+    created = run_migrations(db.engine)
+    if created:
+        echo(f"✅ Migrations created: {', '.join(created)}")
+    # Legacy bills/payments without LandlordID are invisible to scoped queries
+    filled = backfill_landlord_ids()
+    if filled:
+        echo(f"✅ Backfilled LandlordID on {filled} rows.")
+    periods = backfill_billing_periods()
+    if periods:
+        echo(f"✅ Backfilled billing periods on {periods} rows.")
+    altered, blocked = require_billing_periods(db.engine)
+    if altered:
+        echo(f"✅ Made NOT NULL: {', '.join(altered)}")
+    for column, rows in blocked.items():
+        echo(f"⚠️ {column} stays nullable: {rows} row(s) have a BillingMonth that is not a month.")
+    phones = backfill_phone_keys()
+    if phones:
+        echo(f"✅ Backfilled canonical phone key on {phones} rows.")
+    # the /logs timeline reads ActivityEvents only
+    events = backfill_activity_events()
+    if events:
+        echo(f"✅ Backfilled {events} activity events.")
+    echo(f"✅ Search backend: {ensure_search_index()}")
+
+
+@app.cli.command("upgrade-db")
+def upgrade_db_command():
+    """Create tables and indexes, then run every backfill (deploy step)."""
+    upgrade_database(click.echo)
+
+
 # -------------------------
 # Run (dev)
 # -------------------------
 if __name__ == "__main__":
     with app.app_context():
         try:
-            # Ensure tables exist (use migrations in production)
-            db.create_all()
-            print("✅ All tables created/verified.")
+            upgrade_database()
         except Exception as e:
             print("❌ Database init failed:", e)
 
@@ -0,0 +1,35 @@
+# backend/migrations/__init__.py
+#
+# Lightweight, idempotent schema migrations.
+# db.create_all() never alters tables that already exist, so indexes added to
+# the models later have to be created explicitly on live databases.
+# Each migration module exposes NAME, upgrade(engine) and downgrade(engine).
+
+from . import (
+    m0001_hot_path_indexes, m0002_keyset_indexes, m0003_phone_key_indexes,
+    m0004_billing_period_indexes, m0005_expense_listing_indexes,
+    m0006_expense_import_indexes, m0007_recurring_expense_indexes,
+    m0008_vacate_notice_indexes, m0009_unit_status_indexes,
+    m0010_export_job_indexes,
+)
+
+MIGRATIONS = [
+    m0001_hot_path_indexes,
+    m0002_keyset_indexes,
+    m0003_phone_key_indexes,
+    m0004_billing_period_indexes,
+    m0005_expense_listing_indexes,
+    m0006_expense_import_indexes,
+    m0007_recurring_expense_indexes,
+    m0008_vacate_notice_indexes,
+    m0009_unit_status_indexes,
+    m0010_export_job_indexes,
+]
+
+
+def run_migrations(engine) -> list[str]:
+    """Apply every migration in order. Safe to run on every startup."""
+    applied = []
+    for migration in MIGRATIONS:
+        applied.extend(migration.upgrade(engine))
+    return applied
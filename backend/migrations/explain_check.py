@@ -0,0 +1,309 @@
+# backend/migrations/explain_check.py
+#
+# Runs EXPLAIN on the hot queries against a seeded database and exits non-zero
+# if any of them falls back to a full table scan.
+#
+#   python -m migrations.explain_check                      # throwaway SQLite, seeded
+#   python -m migrations.explain_check --database-url URL   # existing DB (not seeded)
+#
+# PostgreSQL: sequential scans are disabled for the check so that a Seq Scan in
+# the plan means "no usable index", not "the planner preferred it on small data".
+# SQL Server: uses SHOWPLAN_TEXT and flags Table Scan / Clustered Index Scan.
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from models.models import (
+    db, User, Apartment, RentalUnit, Tenant, TenantBill, RentPayment,
+    TransferLog, VacateLog, VacateNotice, LandlordExpense, ActivityEvent, ExportJob
+)
+from migrations import run_migrations
+
+PERIOD = date(2025, 7, 1)
+MONTH_START, MONTH_END = datetime(2025, 7, 1), datetime(2025, 8, 1)
+
+
+def hot_queries():
+    """(name, table, statement) for the queries the indexes exist for."""
+    return [
+        ("bill_for_tenant_month", TenantBill.__tablename__,
+         select(TenantBill.BillID).where(TenantBill.TenantID == 1,
+                                         TenantBill.BillingPeriod == PERIOD)),
+        ("bills_for_unit", TenantBill.__tablename__,
+         select(TenantBill.BillID).where(TenantBill.RentalUnitID == 1)),
+        ("landlord_bills_month", TenantBill.__tablename__,
+         select(TenantBill.BillID).where(TenantBill.LandlordID == 1,
+                                         TenantBill.BillingPeriod == PERIOD)),
+        ("paid_to_date_for_bill", RentPayment.__tablename__,
+         select(func.sum(RentPayment.AmountPaid))
+         .where(RentPayment.TenantID == 1, RentPayment.RentalUnitID == 1,
+                RentPayment.IntendedBillingPeriod == PERIOD)),
+        ("tenant_latest_payment", RentPayment.__tablename__,
+         select(RentPayment.PaymentID).where(RentPayment.TenantID == 1)
+         .order_by(RentPayment.PaymentDate.desc()).limit(1)),
+        ("landlord_payments_window", RentPayment.__tablename__,
+         select(RentPayment.PaymentID).where(RentPayment.LandlordID == 1,
+                                             RentPayment.PaymentDate >= MONTH_START,
+                                             RentPayment.PaymentDate < MONTH_END)),
+        ("vacant_units_for_landlord", RentalUnit.__tablename__,
+         select(RentalUnit.UnitID, RentalUnit.Label)
+         .where(RentalUnit.ApartmentID.in_([1, 2, 3]), RentalUnit.StatusID == 1)),
+        ("tenants_in_unit", Tenant.__tablename__,
+         select(Tenant.TenantID).where(Tenant.RentalUnitID == 1)),
+        ("tenants_keyset_page", Tenant.__tablename__,
+         select(Tenant.TenantID)
+         .where((Tenant.CreatedAt < MONTH_START) |
+                ((Tenant.CreatedAt == MONTH_START) & (Tenant.TenantID < 500)))
+         .order_by(Tenant.CreatedAt.desc(), Tenant.TenantID.desc()).limit(21)),
+        ("tenant_by_phone_key", Tenant.__tablename__,
+         select(Tenant.TenantID).where(Tenant.PhoneE164 == "+254700000001",
+                                       Tenant.IDNumber == "1")),
+        ("user_by_phone_key", User.__tablename__,
+         select(User.UserID).where(User.PhoneE164 == "+254700000001")),
+        ("tenants_by_status", Tenant.__tablename__,
+         select(Tenant.TenantID).where(Tenant.Status == "Vacated")),
+        ("transfers_from_unit", TransferLog.__tablename__,
+         select(TransferLog.LogID).where(TransferLog.OldUnitID == 1)
+         .order_by(TransferLog.TransferDate.desc())),
+        ("transfers_to_unit", TransferLog.__tablename__,
+         select(TransferLog.LogID).where(TransferLog.NewUnitID == 1)
+         .order_by(TransferLog.TransferDate.desc())),
+        ("transfers_in_month", TransferLog.__tablename__,
+         select(TransferLog.LogID).where(TransferLog.TransferDate >= MONTH_START,
+                                         TransferLog.TransferDate < MONTH_END)),
+        ("vacates_for_apartment_month", VacateLog.__tablename__,
+         select(VacateLog.LogID).where(VacateLog.ApartmentID == 1,
+                                       VacateLog.VacateDate >= MONTH_START,
+                                       VacateLog.VacateDate < MONTH_END)),
+        ("expenses_for_apartment_month", LandlordExpense.__tablename__,
+         select(LandlordExpense.ExpenseID).where(LandlordExpense.ApartmentID == 1,
+                                                 LandlordExpense.ExpenseDate >= MONTH_START,
+                                                 LandlordExpense.ExpenseDate < MONTH_END)),
+        ("landlord_expenses_keyset_page", LandlordExpense.__tablename__,
+         select(LandlordExpense.ExpenseID, Apartment.ApartmentName)
+         .join(Apartment, Apartment.ApartmentID == LandlordExpense.ApartmentID)
+         .where(Apartment.UserID == 1,
+                (LandlordExpense.ExpenseDate < MONTH_START) |
+                ((LandlordExpense.ExpenseDate == MONTH_START) & (LandlordExpense.ExpenseID < 500)))
+         .order_by(LandlordExpense.ExpenseDate.desc(), LandlordExpense.ExpenseID.desc()).limit(51)),
+        ("unpaid_expenses_for_apartment", LandlordExpense.__tablename__,
+         select(LandlordExpense.ExpenseID).where(LandlordExpense.ApartmentID == 1,
+                                                 LandlordExpense.ExpensePaymentDate.is_(None))),
+        ("expense_refs_for_import", LandlordExpense.__tablename__,
+         select(LandlordExpense.PaymentRef, LandlordExpense.ApartmentID)
+         .where(LandlordExpense.PaymentRef.in_(["REF-1", "REF-2"]))),
+        ("recurring_already_generated", LandlordExpense.__tablename__,
+         select(LandlordExpense.RecurringExpenseID, LandlordExpense.RecurringPeriod)
+         .where(LandlordExpense.RecurringExpenseID.in_([1, 2]),
+                LandlordExpense.RecurringPeriod >= PERIOD)),
+        ("landlord_expense_summary", LandlordExpense.__tablename__,
+         select(func.extract("month", LandlordExpense.ExpenseDate), func.sum(LandlordExpense.Amount))
+         .join(Apartment, Apartment.ApartmentID == LandlordExpense.ApartmentID)
+         .where(Apartment.UserID == 1)
+         .group_by(func.extract("month", LandlordExpense.ExpenseDate))),
+        ("due_vacate_notices", VacateNotice.__tablename__,
+         select(VacateNotice.NoticeID)
+         .where(VacateNotice.Status == "Pending", VacateNotice.ExpectedVacateDate <= PERIOD)
+         .order_by(VacateNotice.ExpectedVacateDate, VacateNotice.NoticeID).limit(500)),
+        ("active_export_for_key", ExportJob.__tablename__,
+         select(ExportJob.JobID)
+         .where(ExportJob.ContentKey == "0" * 64, ExportJob.Status.in_(["queued", "running"]))),
+        ("activity_keyset_page", ActivityEvent.__tablename__,
+         select(ActivityEvent.EventID)
+         .where(ActivityEvent.LandlordID == 1,
+                (ActivityEvent.OccurredAt < MONTH_START) |
+                ((ActivityEvent.OccurredAt == MONTH_START) & (ActivityEvent.EventID < 500)))
+         .order_by(ActivityEvent.OccurredAt.desc(), ActivityEvent.EventID.desc()).limit(101)),
+        ("repeat_transfers_grouped", ActivityEvent.__tablename__,
+         select(ActivityEvent.TenantID, func.count(ActivityEvent.EventID))
+         .where(ActivityEvent.LandlordID == 1, ActivityEvent.EventType == "transfer",
+                ActivityEvent.OccurredAt >= MONTH_START)
+         .group_by(ActivityEvent.TenantID)
+         .having(func.count(ActivityEvent.EventID) > 2)),
+    ]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Seeding
+# ──────────────────────────────────────────────────────────────────────────────
+
+def seed(engine, landlords=5, apartments=4, units=25, months=12):
+    """Bulk-insert a realistic spread of rows (one executemany per table)."""
+    users, apts, rental_units, tenants = [], [], [], []
+    bills, payments, transfers, vacates, expenses = [], [], [], [], []
+    notices = []
+
+    unit_id = tenant_id = apt_id = 0
+    for uid in range(1, landlords + 1):
+        users.append({"UserID": uid, "FullName": f"Landlord {uid}",
+                      "Email": f"landlord{uid}@example.com", "Password": "x",
+                      "Phone": f"2547{uid:08d}", "PhoneE164": f"+2547{uid:08d}",
+                      "IsAdmin": True})
+        for _ in range(apartments):
+            apt_id += 1
+            apts.append({"ApartmentID": apt_id, "ApartmentName": f"Apt {apt_id}",
+                         "Location": "Nairobi", "UserID": uid})
+            for n in range(units):
+                unit_id += 1
+                tenant_id += 1
+                rental_units.append({"UnitID": unit_id, "ApartmentID": apt_id,
+                                     "Label": f"U{n}", "MonthlyRent": 10000.0,
+                                     "StatusID": 1 if n % 10 == 0 else 2})
+                tenants.append({"TenantID": tenant_id, "FullName": f"Tenant {tenant_id}",
+                                "Phone": f"2547{tenant_id:08d}", "PhoneE164": f"+2547{tenant_id:08d}",
+                                "IDNumber": str(tenant_id),
+                                "RentalUnitID": unit_id, "MoveInDate": date(2024, 1, 1),
+                                "Status": "Vacated" if n % 10 == 0 else "Active"})
+                for k in range(months):
+                    period = date(2024 + (6 + k) // 12, (6 + k) % 12 + 1, 1)
+                    label = period.strftime("%B %Y")
+                    bills.append({"TenantID": tenant_id, "RentalUnitID": unit_id,
+                                  "LandlordID": uid, "BillingMonth": label,
+                                  "BillingPeriod": period, "RentAmount": 10000.0,
+                                  "TotalAmountDue": 10000.0,
+                                  "DueDate": period + timedelta(days=4)})
+                    payments.append({"TenantID": tenant_id, "RentalUnitID": unit_id,
+                                     "LandlordID": uid, "BillingMonth": label,
+                                     "IntendedBillingPeriod": period,
+                                     "BilledAmount": 10000.0, "AmountPaid": 10000.0,
+                                     "PaymentDate": datetime.combine(period, datetime.min.time()) + timedelta(days=3),
+                                     "PaidViaMobile": "MPesa"})
+                    expenses.append({"ApartmentID": apt_id, "ExpenseType": "Repairs",
+                                     "Amount": 500.0,
+                                     "PaymentRef": f"REF-{unit_id}-{k}",
+                                     "ExpenseDate": datetime.combine(period, datetime.min.time())})
+                if n % 5 == 0 and n + 1 < units:
+                    transfers.append({"TenantID": tenant_id, "OldUnitID": unit_id,
+                                      "NewUnitID": unit_id + 1, "TransferredBy": uid,
+                                      "TransferDate": datetime(2025, 1 + n % 12, 10)})
+                notices.append({"TenantID": tenant_id, "RentalUnitID": unit_id,
+                                "ExpectedVacateDate": date(2025, 1 + n % 12, 28),
+                                "Status": "Pending" if n % 10 == 5 else "Completed"})
+                if n % 10 == 0:
+                    vacates.append({"TenantID": tenant_id, "UnitID": unit_id,
+                                    "ApartmentID": apt_id, "VacatedBy": uid,
+                                    "VacateDate": datetime(2025, 1 + n % 12, 20)})
+
+    with engine.begin() as conn:
+        for model, rows in ((User, users), (Apartment, apts), (RentalUnit, rental_units),
+                            (Tenant, tenants), (TenantBill, bills), (RentPayment, payments),
+                            (TransferLog, transfers), (VacateLog, vacates),
+                            (VacateNotice, notices), (LandlordExpense, expenses)):
+            if rows:
+                conn.execute(insert(model.__table__), rows)
+        if engine.dialect.name == "sqlite":
+            conn.execute(text("ANALYZE"))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Plan inspection (per dialect)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _compile(engine, stmt) -> str:
+    return str(stmt.compile(dialect=engine.dialect,
+                            compile_kwargs={"literal_binds": True}))
+
+
+def _plan_sqlite(conn, sql):
+    rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql)).fetchall()
+    return [r[-1] for r in rows]
+
+
+def _plan_postgresql(conn, sql):
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    return [r[0] for r in conn.execute(text("EXPLAIN " + sql)).fetchall()]
+
+
+def _plan_mssql(conn, sql):
+    raw = conn.connection.dbapi_connection
+    cur = raw.cursor()
+    try:
+        cur.execute("SET SHOWPLAN_TEXT ON")
+        cur.execute(sql)
+        lines = []
+        while True:
+            lines.extend(str(r[0]) for r in cur.fetchall())
+            if not cur.nextset():
+                break
+        return lines
+    finally:
+        cur.execute("SET SHOWPLAN_TEXT OFF")
+        cur.close()
+
+
+FULL_SCAN = {
+    # SQLite reports "SCAN <table>" (optionally "USING [COVERING] INDEX ...")
+    # for full passes; "SEARCH <table> USING INDEX" is a seek.
+    "sqlite": lambda line, table: re.match(rf"^SCAN {re.escape(table)}\b", line),
+    "postgresql": lambda line, table: re.search(rf'Seq Scan on "?{re.escape(table.lower())}"?\b', line.lower()),
+    "mssql": lambda line, table: (
+        ("Table Scan" in line or "Clustered Index Scan" in line) and table in line),
+}
+
+PLANNERS = {
+    "sqlite": _plan_sqlite,
+    "postgresql": _plan_postgresql,
+    "mssql": _plan_mssql,
+}
+
+
+def check(engine) -> list[tuple[str, list[str]]]:
+    """Returns [(query_name, plan_lines)] for every query that full-scans."""
+    dialect = engine.dialect.name
+    if dialect not in PLANNERS:
+        raise SystemExit(f"❌ EXPLAIN check not supported for dialect '{dialect}'.")
+
+    failures = []
+    for name, table, stmt in hot_queries():
+        sql = _compile(engine, stmt)
+        with engine.begin() as conn:
+            plan = PLANNERS[dialect](conn, sql)
+        ok = not any(FULL_SCAN[dialect](line, table) for line in plan)
+        print(f"{'✅' if ok else '❌'} {name}: {' | '.join(plan)}")
+        if not ok:
+            failures.append((name, plan))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN the hot queries and fail on full table scans.")
+    parser.add_argument("--database-url", default=os.getenv("EXPLAIN_DATABASE_URL"),
+                        help="Existing database to check (default: throwaway seeded SQLite)")
+    args = parser.parse_args(argv)
+
+    tmp = None
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        tmp.close()
+        engine = create_engine(f"sqlite:///{tmp.name}")
+        db.metadata.create_all(engine)
+
+    try:
+        run_migrations(engine)
+        if tmp:
+            seed(engine)
+        failures = check(engine)
+    finally:
+        engine.dispose()
+        if tmp:
+            os.unlink(tmp.name)
+
+    if failures:
+        print(f"❌ {len(failures)} hot quer{'y' if len(failures) == 1 else 'ies'} "
+              f"fell back to a full scan: {', '.join(n for n, _ in failures)}")
+        return 1
+    print("✅ All hot queries use an index.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
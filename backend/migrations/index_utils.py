@@ -0,0 +1,35 @@
+# backend/migrations/index_utils.py
+#
+# Shared helpers for index-only migrations. Index objects are declared on the
+# models; these create/drop them by name on an existing database.
+
+from sqlalchemy import inspect
+
+
+def _indexes(indexes):
+    for model, names in indexes.items():
+        by_name = {ix.name: ix for ix in model.__table__.indexes}
+        for name in names:
+            yield model.__table__, by_name[name]
+
+
+def create_missing(engine, indexes) -> list[str]:
+    """Create any index from `indexes` that the database lacks; returns names created."""
+    insp = inspect(engine)
+    created = []
+    for table, index in _indexes(indexes):
+        if not insp.has_table(table.name):
+            continue  # create_all will build it with the table
+        existing = {ix["name"] for ix in insp.get_indexes(table.name)}
+        if index.name not in existing:
+            index.create(bind=engine, checkfirst=True)
+            created.append(index.name)
+    return created
+
+
+def drop_indexes(engine, indexes) -> list[str]:
+    dropped = []
+    for _, index in _indexes(indexes):
+        index.drop(bind=engine, checkfirst=True)
+        dropped.append(index.name)
+    return dropped
@@ -0,0 +1,31 @@
+# backend/migrations/m0001_hot_path_indexes.py
+#
+# Composite/single-column indexes for the hot filters that previously had none.
+# The Index objects live on the models (__table_args__); this migration only
+# creates the ones missing from an existing database.
+
+from models.models import (
+    Tenant, TenantBill, RentPayment, TransferLog, VacateLog, LandlordExpense
+)
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0001_hot_path_indexes"
+
+INDEXES = {
+    TenantBill: ("ix_tenantbills_tenant_month", "ix_tenantbills_unit"),
+    RentPayment: ("ix_rentpayments_tenant_date",),
+    Tenant: ("ix_tenants_unit", "ix_tenants_status"),
+    TransferLog: ("ix_transferlogs_old_unit_date",
+                  "ix_transferlogs_new_unit_date",
+                  "ix_transferlogs_date"),
+    VacateLog: ("ix_vacatelogs_apartment_date",),
+    LandlordExpense: ("ix_expenses_apartment_date",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
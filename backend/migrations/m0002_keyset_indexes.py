@@ -0,0 +1,22 @@
+# backend/migrations/m0002_keyset_indexes.py
+#
+# Index backing keyset (cursor) pagination of the tenants list.
+# The activity timeline is covered by ix_activity_landlord_time, created
+# together with the ActivityEvents table.
+
+from models.models import Tenant
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0002_keyset_indexes"
+
+INDEXES = {
+    Tenant: ("ix_tenants_created",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
@@ -0,0 +1,24 @@
+# backend/migrations/m0003_phone_key_indexes.py
+#
+# PhoneE164 is the canonical phone key for every lookup (login recovery,
+# registration uniqueness, tenant de-dup, search box). The column was added
+# to live databases after the tables existed, so its index may be missing.
+# Values are filled by utils.phone_helper.backfill_phone_keys().
+
+from models.models import User, Tenant
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0003_phone_key_indexes"
+
+INDEXES = {
+    User: ("ix_Users_PhoneE164",),
+    Tenant: ("ix_Tenants_PhoneE164",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
@@ -0,0 +1,23 @@
+# backend/migrations/m0004_billing_period_indexes.py
+#
+# Month filters on bills/payments moved from the BillingMonth label to the
+# canonical first-of-month dates. Values are filled by
+# utils.billing_helper.backfill_billing_periods().
+
+from models.models import TenantBill, RentPayment
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0004_billing_period_indexes"
+
+INDEXES = {
+    TenantBill: ("ix_tenantbills_landlord_period", "ix_tenantbills_tenant_period"),
+    RentPayment: ("ix_rentpayments_tenant_period",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
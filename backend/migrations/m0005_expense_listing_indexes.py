@@ -0,0 +1,22 @@
+# backend/migrations/m0005_expense_listing_indexes.py
+#
+# The /landlord-expenses listing seeks ix_expenses_apartment_date (m0001) per
+# apartment for ExpenseDate windows and keyset pages; this adds the matching
+# index for paid-date windows and the unpaid view.
+
+from models.models import LandlordExpense
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0005_expense_listing_indexes"
+
+INDEXES = {
+    LandlordExpense: ("ix_expenses_apartment_paid",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
@@ -0,0 +1,21 @@
+# backend/migrations/m0006_expense_import_indexes.py
+#
+# Bulk expense imports skip rows whose PaymentRef already exists; each batch
+# looks its refs up with one PaymentRef IN (...) query.
+
+from models.models import LandlordExpense
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0006_expense_import_indexes"
+
+INDEXES = {
+    LandlordExpense: ("ix_expenses_paymentref",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
@@ -0,0 +1,23 @@
+# backend/migrations/m0007_recurring_expense_indexes.py
+#
+# Expenses generated from a RecurringExpense carry (RecurringExpenseID,
+# RecurringPeriod); the filtered unique index keeps one row per definition
+# and month and serves the scheduler's "already generated?" lookup.
+# RecurringExpenses itself is new and gets its indexes from create_all.
+
+from models.models import LandlordExpense
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0007_recurring_expense_indexes"
+
+INDEXES = {
+    LandlordExpense: ("ux_expenses_recurring_period",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
@@ -0,0 +1,22 @@
+# backend/migrations/m0008_vacate_notice_indexes.py
+#
+# The vacate-notice processor looks up Pending notices that are due
+# (Status, ExpectedVacateDate <= today); the upcoming-vacates views filter the
+# same pair with a date window.
+
+from models.models import VacateNotice
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0008_vacate_notice_indexes"
+
+INDEXES = {
+    VacateNotice: ("ix_vacate_notices_status_date",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
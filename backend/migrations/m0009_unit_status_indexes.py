@@ -0,0 +1,22 @@
+# backend/migrations/m0009_unit_status_indexes.py
+#
+# /units/vacant and the per-apartment occupancy counts filter RentalUnits by
+# (ApartmentID IN landlord's apartments, StatusID = vacant); the same index
+# serves plain "units of this apartment" lookups through its leading column.
+
+from models.models import RentalUnit
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0009_unit_status_indexes"
+
+INDEXES = {
+    RentalUnit: ("ix_units_apartment_status",),
+}
+
+
+def upgrade(engine) -> list[str]:
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
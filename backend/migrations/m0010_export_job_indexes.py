@@ -0,0 +1,41 @@
+# backend/migrations/m0010_export_job_indexes.py
+#
+# One queued/running export job per ContentKey, enforced by a filtered unique
+# index so concurrent POST /exports from different processes share a job.
+# Duplicate active jobs left by the old in-process check are marked failed
+# (newest kept) first, or the index could not be built.
+
+from sqlalchemy import func, inspect, select, update
+
+from models.models import ExportJob
+from migrations.index_utils import create_missing, drop_indexes
+
+NAME = "0010_export_job_indexes"
+
+INDEXES = {
+    ExportJob: ("ux_exportjobs_active_key",),
+}
+
+ACTIVE = ("queued", "running")
+
+
+def _retire_duplicates(engine):
+    jobs = ExportJob.__table__
+    if not inspect(engine).has_table(jobs.name):
+        return
+    newest = (select(func.max(jobs.c.JobID))
+              .where(jobs.c.Status.in_(ACTIVE))
+              .group_by(jobs.c.ContentKey))
+    with engine.begin() as conn:
+        conn.execute(update(jobs)
+                     .where(jobs.c.Status.in_(ACTIVE), jobs.c.JobID.not_in(newest))
+                     .values(Status="failed", Error="Superseded by a duplicate job."))
+
+
+def upgrade(engine) -> list[str]:
+    _retire_duplicates(engine)
+    return create_missing(engine, INDEXES)
+
+
+def downgrade(engine) -> list[str]:
+    return drop_indexes(engine, INDEXES)
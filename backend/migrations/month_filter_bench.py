@@ -0,0 +1,113 @@
+# backend/migrations/month_filter_bench.py
+#
+# Month filters: func.extract('year'/'month', col) versus the half-open range
+# from utils.date_helper.month_range. Prints each plan and the median time,
+# and exits non-zero if a range filter does not seek.
+#
+#   python -m migrations.month_filter_bench                  # seeded SQLite
+#   python -m migrations.month_filter_bench --scale 8 --repeat 20
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import and_, create_engine, func, select
+
+from models.models import db, TransferLog, RentPayment, LandlordExpense
+from migrations import run_migrations
+from migrations.explain_check import FULL_SCAN, PLANNERS, _compile, seed
+from utils.date_helper import month_range
+
+YEAR, MONTH = 2025, 3
+
+
+def _extract(col):
+    return and_(func.extract("year", col) == YEAR, func.extract("month", col) == MONTH)
+
+
+def cases():
+    """(name, table, build(where_fn) -> statement)."""
+    return [
+        ("transfers_in_month", TransferLog.__tablename__,
+         lambda w: select(func.count()).select_from(TransferLog)
+         .where(w(TransferLog.TransferDate))),
+        ("landlord_payments_month", RentPayment.__tablename__,
+         lambda w: select(func.sum(RentPayment.AmountPaid))
+         .where(RentPayment.LandlordID == 1, w(RentPayment.PaymentDate))),
+        ("apartment_expenses_month", LandlordExpense.__tablename__,
+         lambda w: select(func.sum(LandlordExpense.Amount))
+         .where(LandlordExpense.ApartmentID == 1, w(LandlordExpense.ExpenseDate))),
+    ]
+
+
+def _time(engine, stmt, repeat: int) -> float:
+    samples = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            conn.execute(stmt).all()
+            samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def run(engine, repeat: int) -> list[str]:
+    dialect = engine.dialect.name
+    failures = []
+    for name, table, build in cases():
+        print(f"── {name}")
+        for label, where in (("extract", _extract),
+                             ("range", lambda col: month_range(col, YEAR, MONTH))):
+            stmt = build(where)
+            with engine.begin() as conn:
+                plan = PLANNERS[dialect](conn, _compile(engine, stmt))
+            scans = any(FULL_SCAN[dialect](line, table) for line in plan)
+            ms = _time(engine, stmt, repeat)
+            print(f"   {label:<8} {ms:8.2f} ms  {'SCAN' if scans else 'SEEK'}  {' | '.join(plan)}")
+            if label == "range" and scans:
+                failures.append(name)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark extract() month filters against sargable ranges.")
+    parser.add_argument("--database-url", default=os.getenv("EXPLAIN_DATABASE_URL"),
+                        help="Existing database (default: throwaway seeded SQLite)")
+    parser.add_argument("--scale", type=int, default=4,
+                        help="Seed size multiplier for the throwaway database")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    tmp = None
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        tmp.close()
+        engine = create_engine(f"sqlite:///{tmp.name}")
+        db.metadata.create_all(engine)
+
+    try:
+        if engine.dialect.name not in PLANNERS:
+            raise SystemExit(f"❌ Benchmark not supported for dialect '{engine.dialect.name}'.")
+        run_migrations(engine)
+        if tmp:
+            seed(engine, landlords=5 * args.scale, units=50)
+        failures = run(engine, args.repeat)
+    finally:
+        engine.dispose()
+        if tmp:
+            os.unlink(tmp.name)
+
+    if failures:
+        print(f"❌ Range filter did not seek: {', '.join(failures)}")
+        return 1
+    print("✅ Range filters seek the date indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
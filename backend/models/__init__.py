@@ -1,4 +1,5 @@
 from .models import (
     db, User, Apartment, UnitCategory, RentalUnitStatus, RentalUnit, Tenant,
-    VacateNotice, TenantBill, RentPayment, LandlordExpense, Profile, SMSUsageLog, NotificationTag, Notification, VacateLog, TransferLog, Feedback, Rating,  PaymentAllocation, OutgoingMessage, MessageTemplate, WebhookLog, CommsSetting
+    VacateNotice, TenantBill, RentPayment, LandlordExpense, Profile, SMSUsageLog, NotificationTag, Notification, VacateLog, TransferLog, Feedback, Rating,  PaymentAllocation, OutgoingMessage, MessageTemplate, WebhookLog, CommsSetting,
+    ActivityEvent, ExportJob, TransferAlert, RecurringExpense
 )
@@ -85,7 +85,7 @@ class Apartment(db.Model):
 
     # Relationship
     rental_units = db.relationship(
-        'RentalUnit', backref='apartment', lazy=True)
+        'RentalUnit', backref='apartment', lazy=True, order_by='RentalUnit.UnitID')
 
     def __repr__(self):
         return f"<Apartment {self.ApartmentName}>"
@@ -138,6 +138,11 @@ class RentalUnit(db.Model):
     current_tenant = db.relationship(
         'Tenant', backref='assigned_unit', foreign_keys=[CurrentTenantID])
 
+    __table_args__ = (
+        # vacancy lists/counts per apartment and the apartment's units
+        Index('ix_units_apartment_status', 'ApartmentID', 'StatusID'),
+    )
+
     def __repr__(self):
         return f"<RentalUnit {self.Label} | Apt {self.ApartmentID}>"
 
@@ -175,6 +180,13 @@ class Tenant(db.Model):
     rental_unit = db.relationship(
         'RentalUnit', backref='tenants', foreign_keys=[RentalUnitID])
 
+    __table_args__ = (
+        Index('ix_tenants_unit', 'RentalUnitID'),
+        Index('ix_tenants_status', 'Status'),
+        # keyset pagination of the tenants list
+        Index('ix_tenants_created', 'CreatedAt', 'TenantID'),
+    )
+
     def __repr__(self):
         return f"<Tenant {self.FullName}>"
 
@@ -200,10 +212,29 @@ class VacateNotice(db.Model):
     tenant = db.relationship('Tenant', backref='vacate_notices')
     rental_unit = db.relationship('RentalUnit', backref='vacate_notices')
 
+    __table_args__ = (
+        # due-notice processor and the upcoming-vacates views
+        Index('ix_vacate_notices_status_date', 'Status', 'ExpectedVacateDate'),
+    )
+
     def __repr__(self):
         return f"<VacateNotice TenantID={self.TenantID} ExpectedVacateDate={self.ExpectedVacateDate}>"
 
 
+def billing_period_for(label: str | None) -> date | None:
+    """'July 2025' / 'july 2025' / '2025-07' → date(2025, 7, 1); None if unparseable."""
+    if not label:
+        return None
+    label = label.strip()
+    for fmt in ("%B %Y", "%Y-%m"):
+        try:
+            dt = datetime.strptime(label, fmt)
+            return date(dt.year, dt.month, 1)
+        except ValueError:
+            continue
+    return None
+
+
 class TenantBill(db.Model):
     __tablename__ = 'TenantBills'
 
@@ -224,8 +255,9 @@ class TenantBill(db.Model):
     BillingMonth = db.Column(
         db.String(20), nullable=False)  # e.g., "July 2025"
 
-    # Canonical first-of-month (optional but useful)
-    BillingPeriod = db.Column(db.Date, nullable=True)  # e.g., date(2025, 7, 1)
+    # Canonical first-of-month; filled from BillingMonth on every write
+    # (utils/billing_helper.py), NOT NULL once upgrade-db has backfilled it
+    BillingPeriod = db.Column(db.Date, nullable=False)  # e.g., date(2025, 7, 1)
 
     # Money (keep Float for backward-compat)
     RentAmount = db.Column(db.Float, nullable=False)
@@ -260,6 +292,12 @@ class TenantBill(db.Model):
     # Helpful composite index for landlord dashboards & month filtering
     __table_args__ = (
         Index('ix_tenantbills_landlord_month', 'LandlordID', 'BillingMonth'),
+        # bill generation / payments look up a tenant's bill for a month
+        Index('ix_tenantbills_tenant_month', 'TenantID', 'BillingMonth'),
+        Index('ix_tenantbills_unit', 'RentalUnitID'),
+        # month filters: date equality on the canonical period
+        Index('ix_tenantbills_landlord_period', 'LandlordID', 'BillingPeriod'),
+        Index('ix_tenantbills_tenant_period', 'TenantID', 'BillingPeriod'),
     )
 
     def __repr__(self):
@@ -267,11 +305,9 @@ class TenantBill(db.Model):
 
     # Convenience: derive BillingPeriod from BillingMonth safely
     def set_billing_period_from_label(self):
-        try:
-            dt = datetime.strptime(self.BillingMonth, "%B %Y")
-            self.BillingPeriod = date(dt.year, dt.month, 1)
-        except Exception:
-            pass
+        period = billing_period_for(self.BillingMonth)
+        if period:
+            self.BillingPeriod = period
 
 
 class RentPayment(db.Model):
@@ -294,7 +330,7 @@ class RentPayment(db.Model):
     BillingMonth = db.Column(
         db.String(20), nullable=False)  # e.g., "July 2025"
     IntendedBillingPeriod = db.Column(
-        db.Date, nullable=True)  # e.g., date(2025, 7, 1)
+        db.Date, nullable=False)  # e.g., date(2025, 7, 1); see BillingPeriod
 
     # Amounts (kept Float for compatibility)
     BilledAmount = db.Column(db.Float, nullable=False)
@@ -324,11 +360,21 @@ class RentPayment(db.Model):
 
     __table_args__ = (
         Index('ix_rentpayments_landlord_date', 'LandlordID', 'PaymentDate'),
+        # a tenant's latest payments (calculate_bill_amount, get_tenant)
+        Index('ix_rentpayments_tenant_date', 'TenantID', 'PaymentDate'),
+        # paid-to-date per bill: (tenant, period)
+        Index('ix_rentpayments_tenant_period', 'TenantID', 'IntendedBillingPeriod'),
     )
 
     def __repr__(self):
         return f"<RentPayment {self.BillingMonth} | TenantID {self.TenantID} | AmountPaid {self.AmountPaid}>"
 
+    # Convenience: derive IntendedBillingPeriod from BillingMonth safely
+    def set_billing_period_from_label(self):
+        period = billing_period_for(self.BillingMonth)
+        if period:
+            self.IntendedBillingPeriod = period
+
 
 class LandlordExpense(db.Model):
     __tablename__ = 'LandlordExpenses'
@@ -357,15 +403,79 @@ class LandlordExpense(db.Model):
     # Transaction reference
     PaymentRef = db.Column(db.String(100), nullable=True)
 
+    # Set on rows generated from a RecurringExpense: which definition and
+    # which month (first day), so each (definition, month) exists once
+    RecurringExpenseID = db.Column(db.Integer, db.ForeignKey(
+        'RecurringExpenses.RecurringExpenseID'), nullable=True)
+    RecurringPeriod = db.Column(db.Date, nullable=True)
+
     # Audit trail
     CreatedAt = db.Column(db.DateTime, default=datetime.utcnow)
 
     apartment = db.relationship('Apartment', backref='expenses')
 
+    __table_args__ = (
+        Index('ix_expenses_apartment_date', 'ApartmentID', 'ExpenseDate'),
+        # ?field=paid windows and the unpaid view (ExpensePaymentDate IS NULL)
+        Index('ix_expenses_apartment_paid', 'ApartmentID', 'ExpensePaymentDate'),
+        # bulk-import duplicate check (PaymentRef IN (...))
+        Index('ix_expenses_paymentref', 'PaymentRef'),
+        # one generated expense per (definition, month); filtered because
+        # SQL Server treats NULLs as equal in unique indexes
+        Index('ux_expenses_recurring_period', 'RecurringExpenseID', 'RecurringPeriod',
+              unique=True,
+              mssql_where=db.text('"RecurringExpenseID" IS NOT NULL'),
+              postgresql_where=db.text('"RecurringExpenseID" IS NOT NULL'),
+              sqlite_where=db.text('"RecurringExpenseID" IS NOT NULL')),
+    )
+
     def __repr__(self):
         return f"<Expense {self.ExpenseType} | {self.Amount} | For: {self.ExpenseDate.strftime('%B %Y')} | Paid: {self.ExpensePaymentDate.strftime('%Y-%m-%d') if self.ExpensePaymentDate else 'Unpaid'}>"
 
 
+class RecurringExpense(db.Model):
+    """
+    A monthly expense (security, garbage, caretaker...) that
+    utils/recurring_expense_helper.py materializes into LandlordExpenses
+    once per month from StartPeriod until EndPeriod or deactivation.
+    """
+    __tablename__ = 'RecurringExpenses'
+
+    RecurringExpenseID = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    LandlordID = db.Column(db.Integer, db.ForeignKey(
+        'Users.UserID'), nullable=False)
+    ApartmentID = db.Column(db.Integer, db.ForeignKey(
+        'Apartments.ApartmentID'), nullable=False)
+
+    ExpenseType = db.Column(db.String(100), nullable=False)
+    Amount = db.Column(db.Float, nullable=False)
+    Description = db.Column(db.String(300))
+    Payee = db.Column(db.String(150), nullable=True)
+    PaymentMethod = db.Column(db.String(50), nullable=True)
+
+    # ExpenseDate of each generated row (clamped to the month's last day)
+    DayOfMonth = db.Column(db.Integer, nullable=False, default=1)
+    # First day of the first / last month to generate (EndPeriod NULL = open)
+    StartPeriod = db.Column(db.Date, nullable=False)
+    EndPeriod = db.Column(db.Date, nullable=True)
+    # Latest month generated so far; the scheduler resumes after it
+    LastGeneratedPeriod = db.Column(db.Date, nullable=True)
+
+    IsActive = db.Column(db.Boolean, nullable=False, default=True)
+    CreatedAt = db.Column(db.DateTime, default=datetime.utcnow)
+
+    apartment = db.relationship('Apartment', backref='recurring_expenses')
+
+    __table_args__ = (
+        CheckConstraint('DayOfMonth BETWEEN 1 AND 31', name='ck_recurring_day'),
+        Index('ix_recurring_active_last', 'IsActive', 'LastGeneratedPeriod'),
+        Index('ix_recurring_landlord', 'LandlordID'),
+    )
+
+    def __repr__(self):
+        return f"<RecurringExpense {self.ExpenseType} | {self.Amount} | Apt {self.ApartmentID}>"
+
+
 class NotificationTag(db.Model):
     __tablename__ = 'NotificationTags'
 
@@ -426,6 +536,10 @@ class VacateLog(db.Model):
     apartment = db.relationship('Apartment')
     user = db.relationship('User')
 
+    __table_args__ = (
+        Index('ix_vacatelogs_apartment_date', 'ApartmentID', 'VacateDate'),
+    )
+
 
 class TransferLog(db.Model):
     __tablename__ = 'TransferLogs'
@@ -447,6 +561,12 @@ class TransferLog(db.Model):
     new_unit = db.relationship('RentalUnit', foreign_keys=[NewUnitID])
     user = db.relationship('User')
 
+    __table_args__ = (
+        Index('ix_transferlogs_old_unit_date', 'OldUnitID', 'TransferDate'),
+        Index('ix_transferlogs_new_unit_date', 'NewUnitID', 'TransferDate'),
+        Index('ix_transferlogs_date', 'TransferDate'),
+    )
+
 
 class SMSUsageLog(db.Model):
     __tablename__ = 'SMSUsageLogs'
@@ -746,3 +866,125 @@ class CommsSetting(db.Model):
 
     def __repr__(self):
         return f"<CommsSetting LandlordID={self.LandlordID}>"
+
+
+class ActivityEvent(db.Model):
+    """
+    Unified, landlord-scoped feed of TransferLog / VacateLog rows.
+    Written alongside each log (see utils/activity_helper.py) so the logs
+    timeline is one indexed query with SQL pagination.
+    """
+    __tablename__ = "ActivityEvents"
+
+    EventID = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    LandlordID = db.Column(db.Integer, db.ForeignKey(
+        "Users.UserID"), nullable=False)
+
+    # "transfer" | "vacate"; SourceLogID is the TransferLog/VacateLog LogID
+    EventType = db.Column(db.String(20), nullable=False)
+    SourceLogID = db.Column(db.Integer, nullable=False)
+
+    # Apartment of the (new / vacated) unit; transfers also keep the origin
+    ApartmentID = db.Column(db.Integer, db.ForeignKey(
+        "Apartments.ApartmentID"), nullable=True)
+    FromApartmentID = db.Column(db.Integer, db.ForeignKey(
+        "Apartments.ApartmentID"), nullable=True)
+    UnitID = db.Column(db.Integer, db.ForeignKey(
+        "RentalUnits.UnitID"), nullable=True)
+    FromUnitID = db.Column(db.Integer, db.ForeignKey(
+        "RentalUnits.UnitID"), nullable=True)
+
+    TenantID = db.Column(db.Integer, db.ForeignKey(
+        "Tenants.TenantID"), nullable=False)
+    Reason = db.Column(db.String(255))
+    Notes = db.Column(db.Text)
+
+    OccurredAt = db.Column(db.DateTime, nullable=False,
+                           default=datetime.utcnow)
+    # Lower-cased reason/notes/tenant/unit labels for timeline search
+    SearchText = db.Column(db.String(1000))
+
+    __table_args__ = (
+        UniqueConstraint("EventType", "SourceLogID",
+                         name="uq_activity_source"),
+        Index("ix_activity_landlord_time",
+              "LandlordID", "OccurredAt", "EventID"),
+        Index("ix_activity_landlord_type_time",
+              "LandlordID", "EventType", "OccurredAt"),
+        Index("ix_activity_apartment_time", "ApartmentID", "OccurredAt"),
+        Index("ix_activity_from_apartment_time",
+              "FromApartmentID", "OccurredAt"),
+    )
+
+    def __repr__(self):
+        return f"<ActivityEvent {self.EventType}:{self.SourceLogID} LandlordID={self.LandlordID}>"
+
+
+class ExportJob(db.Model):
+    """
+    Background export (see utils/export_job_helper.py). ContentKey hashes the
+    landlord, kind, format and filters so identical requests share one job.
+    """
+    __tablename__ = "ExportJobs"
+
+    JobID = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    LandlordID = db.Column(db.Integer, db.ForeignKey(
+        "Users.UserID"), nullable=False)
+
+    Kind = db.Column(db.String(20), nullable=False)      # "logs" | "expenses"
+    Format = db.Column(db.String(10), nullable=False)    # "csv" | "xlsx" | "parquet"
+    Params = db.Column(db.Text)                          # JSON filters
+    ContentKey = db.Column(db.String(64), nullable=False)
+
+    # "queued" | "running" | "done" | "failed"
+    Status = db.Column(db.String(10), nullable=False, default="queued")
+    RowCount = db.Column(db.Integer)
+    FilePath = db.Column(db.String(500))
+    FileSize = db.Column(db.Integer)
+    Error = db.Column(db.String(500))
+
+    CreatedAt = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    StartedAt = db.Column(db.DateTime)
+    FinishedAt = db.Column(db.DateTime)
+
+    __table_args__ = (
+        Index("ix_exportjobs_key_created", "ContentKey", "CreatedAt"),
+        Index("ix_exportjobs_landlord_created", "LandlordID", "CreatedAt"),
+        # at most one queued/running job per ContentKey across workers and
+        # processes; filtered so finished jobs for the same key can pile up
+        Index("ux_exportjobs_active_key", "ContentKey", unique=True,
+              mssql_where=db.text("\"Status\" IN ('queued', 'running')"),
+              postgresql_where=db.text("\"Status\" IN ('queued', 'running')"),
+              sqlite_where=db.text("\"Status\" IN ('queued', 'running')")),
+    )
+
+    def __repr__(self):
+        return f"<ExportJob {self.JobID} {self.Kind}.{self.Format} {self.Status}>"
+
+
+class TransferAlert(db.Model):
+    """
+    Precomputed repeat-transfer flags (utils/alerts_helper.py), refreshed
+    nightly so the dashboard toolbar never scans transfer history.
+    """
+    __tablename__ = "TransferAlerts"
+
+    AlertID = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    LandlordID = db.Column(db.Integer, db.ForeignKey(
+        "Users.UserID"), nullable=False)
+    TenantID = db.Column(db.Integer, db.ForeignKey(
+        "Tenants.TenantID"), nullable=False)
+    TenantName = db.Column(db.String(100))
+
+    TransfersInPeriod = db.Column(db.Integer, nullable=False)
+    LastTransfer = db.Column(db.DateTime)
+    WindowMonths = db.Column(db.Integer, nullable=False)
+    Threshold = db.Column(db.Integer, nullable=False)
+    ComputedAt = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_transferalerts_landlord_last", "LandlordID", "LastTransfer"),
+    )
+
+    def __repr__(self):
+        return f"<TransferAlert Tenant={self.TenantID} x{self.TransfersInPeriod} LandlordID={self.LandlordID}>"
@@ -1,12 +1,15 @@
 from twilio.base.exceptions import TwilioRestException
 from flask import current_app
-from flask import current_app, Blueprint, request, jsonify
+from flask import current_app, Blueprint, request, jsonify, send_file, Response
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
-from sqlalchemy import func, case, cast, Date
+from sqlalchemy import func, case, cast, literal, Date
+from sqlalchemy.orm import joinedload
 from flask_mail import Message, Mail
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from datetime import datetime, timedelta, date
+import csv
+import io
 import jwt
 import os
 import re
@@ -19,12 +22,47 @@ from uuid import uuid4
 from utils.sms_helper import send_sms
 from utils.billing_helper import calculate_bill_amount
 from utils.cloudinary_helper import upload_to_cloudinary
+from utils.auth_helper import current_landlord, landlord_claims
+from utils.scope_helper import (
+    landlord_scope, invalidate_landlord_scope,
+    apartment_owned, unit_owned, landlord_owned, transfer_owned
+)
+from utils.activity_helper import activity_query, record_transfer, record_vacate
+from utils.pagination_helper import keyset_page
+from utils.search_helper import search_criterion, search_ranked
+from utils.phone_helper import canonical_phone, legacy_phone, phone_search_key
+from utils.export_helper import (
+    ACTIVITY_HEADER, EXPENSE_HEADER, activity_rows, expense_rows, csv_response
+)
+from utils.export_job_helper import submit_export, job_dict, MIMETYPES
+from utils.alerts_helper import repeat_transfers, DEFAULT_MONTHS, DEFAULT_THRESHOLD
+from utils.statement_helper import (
+    tenant_statement as build_tenant_statement, ledger_rows, pdf_available,
+    render_statement_pdf, LEDGER_HEADER
+)
+from utils.expense_helper import (
+    expense_query, expense_item, group_items, expense_summary, expense_pivot,
+    DIMENSIONS as EXPENSE_DIMENSIONS
+)
+from utils.unit_status_helper import status_id, VACANT, OCCUPIED, RESERVED
+from utils.apartment_helper import apartment_detail, parse_includes
+from utils.tenant_bulk_helper import (
+    onboard_tenants, vacate_tenants, transfer_tenants, welcome_body, transfer_body, BulkConflict, MAX_ROWS as BULK_TENANTS_MAX,
+    FIELDS as BULK_TENANT_FIELDS
+)
+from utils.noi_helper import noi_report, MAX_MONTHS as NOI_MAX_MONTHS
+from utils.recurring_expense_helper import generate_recurring_expenses, recurring_dict
+from utils.expense_import_helper import (
+    import_expenses, ImportAborted, ImportFormatError, VALID_METHODS as EXPENSE_PAYMENT_METHODS
+)
+from utils.date_helper import parse_month_any as _parse_month_any, month_period, day_bounds
 
 from models import (
     db, User, Apartment, UnitCategory, RentalUnitStatus, RentalUnit, Tenant,
     VacateLog, TransferLog, VacateNotice, SMSUsageLog, TenantBill,
     RentPayment, LandlordExpense, Profile, Feedback, Rating, PaymentAllocation,
-    OutgoingMessage, MessageTemplate, WebhookLog, CommsSetting
+    OutgoingMessage, MessageTemplate, WebhookLog, CommsSetting, ActivityEvent, ExportJob,
+    TransferAlert, RecurringExpense
 )
 
 # ✅ Initialize Blueprint
@@ -79,83 +117,30 @@ def _fmt_dt(d):
     return d.strftime("%Y-%m-%d %H:%M:%S") if d else None
 
 
+def _want_total(cursor) -> bool:
+    """
+    COUNT(*) is opt-in (?with_total=true) in cursor mode; legacy ?page=
+    callers keep getting it by default.
+    """
+    flag = (request.args.get("with_total") or "").strip().lower()
+    if flag:
+        return flag in ("1", "true", "yes")
+    return cursor is None
+
+
 def normalize_phone(phone: str) -> str:
+    """Legacy 2547XXXXXXXX form (display / SupportPhone)."""
     if not phone:
         return ""
-    p = re.sub(r'\D', '', phone.strip())
-    if p.startswith('0'):         # 07xx → 2547xx
-        p = '254' + p[1:]
-    if p.startswith('7') and len(p) == 9:  # 7xx… → 2547xx…
-        p = '254' + p
-    return p
+    return legacy_phone(canonical_phone(phone)) or re.sub(r'\D', '', phone)
 
 
-def normalize_phone_e164(phone: str) -> str | None:
+def normalize_phone_e164(phone: str, country_code: str | None = None) -> str | None:
     """
     Accepts 07xxxxxxxx, 7xxxxxxxx, 2547xxxxxxxx, or +2547xxxxxxxx.
     Returns +2547xxxxxxxx (E.164) or None if invalid.
     """
-    if not phone:
-        return None
-    p = re.sub(r'\D', '', phone.strip())
-
-    # 07xxxxxxxx -> 2547xxxxxxxx
-    if p.startswith('0') and len(p) == 10 and p[1] == '7':
-        p = '254' + p[1:]
-
-    # 7xxxxxxxxx -> 2547xxxxxxxx
-    if p.startswith('7') and len(p) == 9:
-        p = '254' + p
-
-    # already 2547xxxxxxxx
-    if p.startswith('2547') and len(p) == 12:
-        return f'+{p}'
-
-    # already +2547xxxxxxxx (came in with +)
-    if phone.strip().startswith('+2547') and len(re.sub(r'\D', '', phone)) == 12:
-        return '+2547' + re.sub(r'\D', '', phone)[3:]
-
-    return None
-
-
-def _parse_month_any(month_str: str):
-    """
-    Accepts either 'YYYY-MM' or 'MMMM YYYY' (e.g., '2025-08' or 'August 2025').
-    Returns (year:int, month:int) or (None, None) if invalid/empty.
-    """
-    if not month_str:
-        return None, None
-    month_str = month_str.strip()
-    # try YYYY-MM
-    try:
-        y, m = month_str.split("-")
-        return int(y), int(m)
-    except Exception:
-        pass
-    # try 'MMMM YYYY'
-    try:
-        dt = datetime.strptime(month_str, "%B %Y")
-        return dt.year, dt.month
-    except Exception:
-        return None, None
-
-
-def _landlord_scope_ids(user_id: int, apartment_id: int | None = None):
-    """
-    Returns (apartment_ids, unit_ids, unit_by_id) scoped to the landlord.
-    Optionally restrict to a specific apartment_id.
-    """
-    a_q = Apartment.query.filter_by(UserID=user_id)
-    if apartment_id:
-        a_q = a_q.filter(Apartment.ApartmentID == apartment_id)
-    apartments = a_q.all()
-    apartment_ids = [a.ApartmentID for a in apartments]
-
-    units = RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids)).all()
-    unit_ids = [u.UnitID for u in units]
-    unit_by_id = {u.UnitID: u for u in units}
-    return apartment_ids, unit_ids, unit_by_id
+    return canonical_phone(phone, country_code)
 
 
 def profile_completeness(profile, user) -> int:
@@ -454,7 +439,7 @@ def register_landlord():
     if User.query.filter(func.lower(User.Email) == email).first():
         return jsonify({'message': 'Email is already registered'}), 409
 
-    if User.query.filter((User.PhoneE164 == phone_e164) | (User.Phone == phone_e164.replace('+', ''))).first():
+    if User.query.filter(User.PhoneE164 == phone_e164).first():
         return jsonify({'message': 'Phone number is already registered'}), 409
 
     # ✅ Password strength
@@ -467,13 +452,11 @@ def register_landlord():
 
     # ✅ Hash & save user
     hashed_pw = bcrypt.generate_password_hash(password).decode('utf-8')
-    legacy_phone = phone_e164.replace('+', '')
-
     new_user = User(
         FullName=full_name,
         Email=email,
         Password=hashed_pw,
-        Phone=legacy_phone,      # 2547xxxxxxx (legacy format)
+        Phone=legacy_phone(phone_e164),      # 2547xxxxxxx (legacy format)
         PhoneE164=phone_e164,    # +2547xxxxxxx (Twilio)
         IsAdmin=True,
         IsPhoneVerified=False,
@@ -620,7 +603,8 @@ def login():
 
     # No 2FA required → normal login
     token = create_access_token(
-        identity=user.UserID, expires_delta=timedelta(days=1))
+        identity=user.UserID, expires_delta=timedelta(days=1),
+        additional_claims=landlord_claims(user))
     return jsonify({
         'message': 'Login successful!',
         'token': token,
@@ -665,7 +649,8 @@ def login_verify():
         db.session.commit()
 
     token = create_access_token(
-        identity=user.UserID, expires_delta=timedelta(days=1))
+        identity=user.UserID, expires_delta=timedelta(days=1),
+        additional_claims=landlord_claims(user))
     return jsonify({
         'message': 'Login successful!',
         'token': token,
@@ -742,10 +727,10 @@ def auth_forgot_start():
         # resolve by email (case-insensitive)
         user = User.query.filter(func.lower(
             User.Email) == identifier.lower()).first()
-        # or by phone (normalize legacy 07… / 7… / 2547… to DB Phone format 2547…)
+        # or by phone (07… / 7… / 2547… / +2547… → canonical key)
         if not user and re.fullmatch(r"(\+?2547\d{8}|2547\d{8}|07\d{8}|7\d{8})", identifier):
-            p = normalize_phone(identifier)  # returns 2547XXXXXXXX
-            user = User.query.filter_by(Phone=p).first()
+            user = User.query.filter_by(
+                PhoneE164=canonical_phone(identifier)).first()
 
     if user and user.PhoneE164:
         try:
@@ -777,8 +762,8 @@ def auth_forgot_verify():
     user = User.query.filter(func.lower(User.Email) ==
                              identifier.lower()).first()
     if not user and re.fullmatch(r"(\+?2547\d{8}|2547\d{8}|07\d{8}|7\d{8})", identifier):
-        p = normalize_phone(identifier)
-        user = User.query.filter_by(Phone=p).first()
+        user = User.query.filter_by(
+            PhoneE164=canonical_phone(identifier)).first()
 
     if not user or not user.PhoneE164:
         return jsonify({"message": "Invalid code or identifier."}), 400
@@ -935,11 +920,11 @@ PayNest Security Team
 @routes.route('/apartments/create', methods=['POST'])
 @jwt_required()
 def create_apartment():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"message": "Unauthorized. Only landlords can create apartments."}), 403
+    user = landlord.user
 
     data = request.get_json() or {}
     name = data.get('ApartmentName')
@@ -957,6 +942,7 @@ def create_apartment():
     )
     db.session.add(new_apartment)
     db.session.commit()
+    invalidate_landlord_scope(user.UserID)
 
     # ── NEW: landlord SMS confirmation (queued) ────────────────────────────────
     try:
@@ -997,13 +983,21 @@ def create_apartment():
     }), 201
 
 
+def _status_count(name: str):
+    """SUM of units in a status, by registry ID (no join to RentalUnitStatuses)."""
+    sid = status_id(name)
+    if sid is None:
+        return literal(0)
+    return func.sum(case((RentalUnit.StatusID == sid, 1), else_=0))
+
+
 @routes.route('/myapartments', methods=['GET'])
 @jwt_required()
 def get_my_apartments():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"message": "Unauthorized. Only landlords can view their apartments."}), 403
+    user = landlord.user
 
     q = (
         db.session.query(
@@ -1013,15 +1007,11 @@ def get_my_apartments():
             Apartment.Description,
             Apartment.CreatedAt,
             func.count(RentalUnit.UnitID).label('total_units'),
-            func.sum(case((RentalUnitStatus.StatusName == 'Occupied', 1), else_=0)).label(
-                'occupied_units'),
-            func.sum(case((RentalUnitStatus.StatusName == 'Vacant', 1), else_=0)).label(
-                'vacant_units'),
-            func.sum(case((RentalUnitStatus.StatusName == 'Reserved', 1), else_=0)).label(
-                'reserved_units'),
+            _status_count(OCCUPIED).label('occupied_units'),
+            _status_count(VACANT).label('vacant_units'),
+            _status_count(RESERVED).label('reserved_units'),
         )
         .outerjoin(RentalUnit, RentalUnit.ApartmentID == Apartment.ApartmentID)
-        .outerjoin(RentalUnitStatus, RentalUnitStatus.StatusID == RentalUnit.StatusID)
         .filter(Apartment.UserID == user.UserID)
         .group_by(
             Apartment.ApartmentID, Apartment.ApartmentName,
@@ -1058,16 +1048,15 @@ def get_my_apartments():
 @routes.route('/apartments/update/<int:apartment_id>', methods=['PUT'])
 @jwt_required()
 def update_apartment(apartment_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"message": "Unauthorized. Only landlords can update apartments."}), 403
 
     apartment = Apartment.query.get(apartment_id)
     if not apartment:
         return jsonify({"message": "Apartment not found."}), 404
-    if apartment.UserID != user.UserID:
+    if apartment.UserID != landlord.UserID:
         return jsonify({"message": "You can only update your own apartments."}), 403
 
     data = request.get_json() or {}
@@ -1083,6 +1072,7 @@ def update_apartment(apartment_id):
         apartment.Description = description
 
     db.session.commit()
+    invalidate_landlord_scope(landlord.UserID)
 
     return jsonify({
         "message": "✅ Apartment updated successfully.",
@@ -1095,50 +1085,51 @@ def update_apartment(apartment_id):
     }), 200
 
 
+def _apartment_includes():
+    """
+    ?include=occupancy,tenant,bill (or all) and ?month=YYYY-MM for the bill
+    month. Returns (include, period, error_response).
+    """
+    include = parse_includes(request.args.get('include'))
+    month = request.args.get('month')
+    period = month_period(month) if month else None
+    if month and period is None:
+        return include, None, (jsonify({"message": "Invalid month. Use YYYY-MM."}), 400)
+    return include, period, None
+
+
 @routes.route('/apartments/<int:apartment_id>', methods=['GET'])
 @jwt_required()
 def view_apartment(apartment_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    """
+    Apartment with its units (status, category) from one query.
+      ?include=occupancy,tenant,bill | all   embed Stats, CurrentTenant, CurrentBill
+      ?month=YYYY-MM                         bill month (default: current)
+    """
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"message": "Unauthorized. Only landlords can view apartment details."}), 403
 
-    apartment = Apartment.query.get(apartment_id)
-    if not apartment:
+    include, period, err = _apartment_includes()
+    if err:
+        return err
+
+    owner_id, detail = apartment_detail(apartment_id, include, period)
+    if detail is None:
         return jsonify({"message": "Apartment not found."}), 404
-    if apartment.UserID != user.UserID:
+    if owner_id != landlord.UserID:
         return jsonify({"message": "Access denied. You can only view your own apartments."}), 403
 
-    unit_list = []
-    for unit in apartment.rental_units:
-        unit_list.append({
-            "UnitID": unit.UnitID,
-            "Label": unit.Label,
-            "Description": unit.Description,
-            "MonthlyRent": unit.MonthlyRent,
-            "Status": unit.status.StatusName if unit.status else None,
-            "Category": unit.category.CategoryName if unit.category else None,
-            "CreatedAt": unit.CreatedAt.strftime('%Y-%m-%d %H:%M:%S')
-        })
-
-    return jsonify({
-        "ApartmentID": apartment.ApartmentID,
-        "ApartmentName": apartment.ApartmentName,
-        "Location": apartment.Location,
-        "Description": apartment.Description,
-        "CreatedAt": apartment.CreatedAt.strftime('%Y-%m-%d %H:%M:%S'),
-        "RentalUnits": unit_list
-    }), 200
+    return jsonify(detail), 200
 
 
 @routes.route('/unit-categories/create', methods=['POST'])
 @jwt_required()
 def create_unit_category():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"message": "Unauthorized. Only admins can create unit categories."}), 403
 
     data = request.get_json() or {}
@@ -1186,10 +1177,9 @@ def get_unit_categories():
 @routes.route('/rental-unit-statuses/create', methods=['POST'])
 @jwt_required()
 def create_rental_unit_status():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"message": "Unauthorized. Only admins can create rental unit statuses."}), 403
 
     data = request.get_json() or {}
@@ -1219,10 +1209,9 @@ def create_rental_unit_status():
 @routes.route('/rental-units/create', methods=['POST'])
 @jwt_required()
 def create_rental_unit():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"message": "Unauthorized. Only landlords can create rental units."}), 403
 
     data = request.get_json() or {}
@@ -1237,7 +1226,7 @@ def create_rental_unit():
         return jsonify({"message": "Missing required fields (ApartmentID, Label, MonthlyRent, CategoryID, StatusID)."}), 400
 
     apartment = Apartment.query.get(apartment_id)
-    if not apartment or apartment.UserID != user.UserID:
+    if not apartment or apartment.UserID != landlord.UserID:
         return jsonify({"message": "You can only add units to your own apartments."}), 403
 
     rental_unit = RentalUnit(
@@ -1250,6 +1239,7 @@ def create_rental_unit():
     )
     db.session.add(rental_unit)
     db.session.commit()
+    invalidate_landlord_scope(landlord.UserID)
 
     return jsonify({
         "message": "✅ Rental unit created successfully.",
@@ -1268,10 +1258,9 @@ def create_rental_unit():
 @routes.route('/rental-units/update/<int:unit_id>', methods=['PUT'])
 @jwt_required()
 def update_rental_unit(unit_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"message": "Unauthorized. Only landlords can update rental units."}), 403
 
     unit = RentalUnit.query.get(unit_id)
@@ -1279,7 +1268,7 @@ def update_rental_unit(unit_id):
         return jsonify({"message": "Rental unit not found."}), 404
 
     apartment = Apartment.query.get(unit.ApartmentID)
-    if not apartment or apartment.UserID != user.UserID:
+    if not apartment or apartment.UserID != landlord.UserID:
         return jsonify({"message": "You can only update units in your own apartments."}), 403
 
     data = request.get_json() or {}
@@ -1290,6 +1279,7 @@ def update_rental_unit(unit_id):
     unit.CategoryID = data.get('CategoryID', unit.CategoryID)
 
     db.session.commit()
+    invalidate_landlord_scope(landlord.UserID)
 
     return jsonify({
         "message": "✅ Rental unit updated successfully.",
@@ -1309,23 +1299,32 @@ def update_rental_unit(unit_id):
 @routes.route('/apartments/<int:apartment_id>/units', methods=['GET'])
 @jwt_required()
 def get_units_by_apartment(apartment_id):
+    """Units of one apartment; same ?include=tenant,bill and ?month as the detail view."""
     user_id = get_jwt_identity()
-    apartment = Apartment.query.filter_by(
-        ApartmentID=apartment_id, UserID=user_id).first()
-    if not apartment:
+    if apartment_id not in landlord_scope(user_id).apartment_ids:
         return jsonify({"message": "Apartment not found or not owned by you."}), 404
 
-    units = RentalUnit.query.filter_by(ApartmentID=apartment_id).all()
+    include, period, err = _apartment_includes()
+    if err:
+        return err
+
+    _, detail = apartment_detail(apartment_id, include - {"occupancy"}, period)
     result = []
-    for unit in units:
-        result.append({
-            "UnitID": unit.UnitID,
-            "Label": unit.Label,
-            "Description": unit.Description,
-            "RentAmount": unit.MonthlyRent,
-            "StatusID": unit.StatusID,
-            "CategoryID": unit.CategoryID
-        })
+    for unit in (detail or {}).get("RentalUnits", []):
+        item = {
+            "UnitID": unit["UnitID"],
+            "Label": unit["Label"],
+            "Description": unit["Description"],
+            "RentAmount": unit["MonthlyRent"],
+            "StatusID": unit["StatusID"],
+            "CategoryID": unit["CategoryID"],
+            "Status": unit["Status"],
+            "Category": unit["Category"],
+        }
+        for key in ("CurrentTenant", "CurrentBill"):
+            if key in unit:
+                item[key] = unit[key]
+        result.append(item)
     return jsonify(result), 200
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -1361,7 +1360,7 @@ def add_tenant():
     phone_e164 = normalize_phone_e164(raw_phone)
     if not phone_e164 or not E164_RE.match(phone_e164):
         return jsonify({"message": "Invalid phone. Use 07XXXXXXXX, 7XXXXXXXXX, 2547XXXXXXXX or +2547XXXXXXXX."}), 400
-    phone_legacy = phone_e164.replace('+', '')  # 2547XXXXXXXX
+    phone_legacy = legacy_phone(phone_e164)  # 2547XXXXXXXX
 
     try:
         move_in = datetime.strptime(move_in_date, '%Y-%m-%d').date()
@@ -1374,12 +1373,12 @@ def add_tenant():
     apartment = Apartment.query.get(unit.ApartmentID)
     if not apartment or apartment.UserID != user_id:
         return jsonify({"message": "Unauthorized: You do not own the apartment for this unit."}), 403
-    if unit.StatusID != 1:  # Vacant
+    if unit.StatusID != status_id(VACANT):
         return jsonify({"message": "This unit is not available. Only vacant units can be assigned."}), 400
 
-    # ✅ de-dup by either column
+    # ✅ de-dup on the canonical key (single indexed equality)
     existing_tenant = Tenant.query.filter(
-        (Tenant.PhoneE164 == phone_e164) | (Tenant.Phone == phone_legacy),
+        Tenant.PhoneE164 == phone_e164,
         Tenant.IDNumber == id_number
     ).first()
 
@@ -1395,7 +1394,7 @@ def add_tenant():
             existing_tenant.PhoneE164 = existing_tenant.PhoneE164 or phone_e164
             existing_tenant.Phone = existing_tenant.Phone or phone_legacy
 
-            unit.StatusID = 2  # Occupied
+            unit.StatusID = status_id(OCCUPIED)
             unit.CurrentTenantID = existing_tenant.TenantID
 
             log = TransferLog(
@@ -1406,17 +1405,15 @@ def add_tenant():
                 Reason="Returning tenant"
             )
             db.session.add(log)
+            record_transfer(log, user_id, existing_tenant.FullName, None, unit)
             db.session.commit()
 
             # NEW: welcome SMS (queued) for returning tenant
             try:
                 if existing_tenant.PhoneE164 and not getattr(existing_tenant, "SmsOptOut", False):
-                    rent = getattr(unit, "MonthlyRent", None)
-                    body = (
-                        f"Welcome {existing_tenant.FullName.split(' ')[0]}! You're set for "
-                        f"{apartment.ApartmentName} {unit.Label}. Monthly rent: KES {rent}. "
-                        f"Move-in: {existing_tenant.MoveInDate.strftime('%Y-%m-%d')}."
-                    )
+                    body = welcome_body(existing_tenant.FullName, apartment.ApartmentName,
+                                        unit.Label, getattr(unit, "MonthlyRent", None),
+                                        existing_tenant.MoveInDate)
                     enqueue_sms(
                         to=existing_tenant.PhoneE164, body=body, user_id=user_id,
                         apartment_id=apartment.ApartmentID,
@@ -1456,19 +1453,15 @@ def add_tenant():
     db.session.add(tenant)
     db.session.flush()
 
-    unit.StatusID = 2  # Occupied
+    unit.StatusID = status_id(OCCUPIED)
     unit.CurrentTenantID = tenant.TenantID
     db.session.commit()
 
     # NEW: welcome SMS (queued) for new tenant
     try:
         if tenant.PhoneE164 and not getattr(tenant, "SmsOptOut", False):
-            rent = getattr(unit, "MonthlyRent", None)
-            body = (
-                f"Welcome {tenant.FullName.split(' ')[0]}! You're set for "
-                f"{apartment.ApartmentName} {unit.Label}. Monthly rent: KES {rent}. "
-                f"Move-in: {tenant.MoveInDate.strftime('%Y-%m-%d')}."
-            )
+            body = welcome_body(tenant.FullName, apartment.ApartmentName, unit.Label,
+                                getattr(unit, "MonthlyRent", None), tenant.MoveInDate)
             enqueue_sms(
                 to=tenant.PhoneE164, body=body, user_id=user_id,
                 apartment_id=apartment.ApartmentID,
@@ -1494,6 +1487,158 @@ def add_tenant():
     }), 201
 
 
+def _bulk_onboard_response(user_id: int, rows: list, apartment_id, send_welcome, all_or_nothing):
+    if not rows:
+        return jsonify({"message": "No tenants provided."}), 400
+    if len(rows) > BULK_TENANTS_MAX:
+        return jsonify({"message": f"At most {BULK_TENANTS_MAX} tenants per request."}), 400
+    if apartment_id and not Apartment.query.filter_by(ApartmentID=apartment_id, UserID=user_id).first():
+        return jsonify({"message": "Apartment not found."}), 404
+
+    try:
+        result = onboard_tenants(user_id, rows, apartment_id=apartment_id,
+                                 send_welcome=send_welcome, all_or_nothing=all_or_nothing)
+    except BulkConflict as e:
+        return jsonify({"message": str(e)}), 409
+
+    created, errors = result["created"], result["errors"]
+    if not result["applied"]:
+        return jsonify({"message": "No tenants were added.", "created": [],
+                        "failed": len(errors), "errors": errors}), 400
+    return jsonify({
+        "message": f"✅ {len(created)} tenant(s) added" + (f", {len(errors)} row(s) skipped." if errors else "."),
+        "created": created,
+        "failed": len(errors),
+        "errors": errors,
+    }), 201
+
+
+@routes.route('/tenants/bulk', methods=['POST'])
+@jwt_required()
+def add_tenants_bulk():
+    """
+    {"tenants": [{FullName, Phone, Email, IDNumber, RentalUnitID | Unit, MoveInDate}, ...],
+     "apartment_id": (needed for Unit labels), "send_welcome": true, "all_or_nothing": false}
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    rows = data.get("tenants") or []
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        return jsonify({"message": "tenants must be a list of objects."}), 400
+    return _bulk_onboard_response(
+        user_id, rows, data.get("apartment_id"),
+        send_welcome=data.get("send_welcome", True) is not False,
+        all_or_nothing=bool(data.get("all_or_nothing")))
+
+
+@routes.route('/tenants/import', methods=['POST'])
+@jwt_required()
+def import_tenants_csv():
+    """
+    multipart: file=<csv with FullName, Phone, Email, IDNumber, RentalUnitID or Unit,
+    MoveInDate>, apartment_id, send_welcome, all_or_nothing. Errors cite CSV lines.
+    """
+    user_id = get_jwt_identity()
+    upload = request.files.get("file")
+    if not upload:
+        return jsonify({"message": "No file provided"}), 400
+
+    try:
+        reader = csv.DictReader(io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline=""))
+        rows = []
+        for row in reader:
+            if len(rows) >= BULK_TENANTS_MAX:
+                return jsonify({"message": f"At most {BULK_TENANTS_MAX} tenants per file."}), 400
+            clean = {k.strip(): v for k, v in row.items() if k and k.strip() in BULK_TENANT_FIELDS}
+            clean["_row"] = reader.line_num
+            rows.append(clean)
+    except (UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"message": f"Could not read CSV: {e}"}), 400
+
+    flag = lambda name, default: (request.form.get(name) or default).lower() in ("1", "true", "yes")
+    return _bulk_onboard_response(
+        user_id, rows, request.form.get("apartment_id", type=int),
+        send_welcome=flag("send_welcome", "true"),
+        all_or_nothing=flag("all_or_nothing", "false"))
+
+
+def _bulk_items(data: dict, key: str):
+    items = data.get(key) or []
+    if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+        return None, (jsonify({"message": f"{key} must be a list of objects."}), 400)
+    if not items:
+        return None, (jsonify({"message": f"No {key} provided."}), 400)
+    if len(items) > BULK_TENANTS_MAX:
+        return None, (jsonify({"message": f"At most {BULK_TENANTS_MAX} {key} per request."}), 400)
+    return items, None
+
+
+@routes.route('/tenants/vacate/bulk', methods=['POST'])
+@jwt_required()
+def vacate_tenants_bulk():
+    """
+    {"tenants": [{"TenantID", "Reason"?, "Notes"?}, ...], "Reason", "Notes",
+     "notify": false, "all_or_nothing": false}
+    Immediate vacate for many tenants; scheduled notices stay per tenant.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    items, err = _bulk_items(data, "tenants")
+    if err:
+        return err
+
+    try:
+        result = vacate_tenants(user_id, items, reason=data.get("Reason"), notes=data.get("Notes"),
+                                notify=bool(data.get("notify")),
+                                all_or_nothing=bool(data.get("all_or_nothing")))
+    except BulkConflict as e:
+        return jsonify({"message": str(e)}), 409
+
+    vacated, errors = result["vacated"], result["errors"]
+    if not result["applied"]:
+        return jsonify({"message": "No tenants were vacated.", "vacated": [],
+                        "failed": len(errors), "errors": errors}), 400
+    return jsonify({
+        "message": f"✅ {len(vacated)} tenant(s) vacated" + (f", {len(errors)} skipped." if errors else "."),
+        "vacated": vacated,
+        "failed": len(errors),
+        "errors": errors,
+    }), 200
+
+
+@routes.route('/tenants/transfer/bulk', methods=['POST'])
+@jwt_required()
+def transfer_tenants_bulk():
+    """
+    {"transfers": [{"TenantID", "NewRentalUnitID", "MoveInDate", "Reason"?}, ...],
+     "Reason", "notify": true, "all_or_nothing": false}
+    Targets may be units vacated by other moves in the same batch.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    items, err = _bulk_items(data, "transfers")
+    if err:
+        return err
+
+    try:
+        result = transfer_tenants(user_id, items, reason=data.get("Reason", "Unit-to-unit transfer"),
+                                  notify=data.get("notify", True) is not False,
+                                  all_or_nothing=bool(data.get("all_or_nothing")))
+    except BulkConflict as e:
+        return jsonify({"message": str(e)}), 409
+
+    transferred, errors = result["transferred"], result["errors"]
+    if not result["applied"]:
+        return jsonify({"message": "No tenants were transferred.", "transferred": [],
+                        "failed": len(errors), "errors": errors}), 400
+    return jsonify({
+        "message": f"✅ {len(transferred)} tenant(s) transferred" + (f", {len(errors)} skipped." if errors else "."),
+        "transferred": transferred,
+        "failed": len(errors),
+        "errors": errors,
+    }), 200
+
+
 @routes.route('/tenants/vacate/<int:tenant_id>', methods=['PUT'])
 @jwt_required()
 def vacate_unit(tenant_id):
@@ -1586,12 +1731,12 @@ def vacate_unit(tenant_id):
     # ─────────────────────────────────────────────────────────────────────────
     if tenant.Status != "Active":
         return jsonify({"message": "This tenant is already inactive."}), 400
-    if unit.StatusID == 1:
+    if unit.StatusID == status_id(VACANT):
         return jsonify({"message": "This unit is already vacant."}), 400
 
     tenant.Status = "Inactive"
     tenant.MoveOutDate = datetime.utcnow()
-    unit.StatusID = 1  # Vacant
+    unit.StatusID = status_id(VACANT)
     unit.CurrentTenantID = None
 
     vacate_log = VacateLog(
@@ -1604,6 +1749,7 @@ def vacate_unit(tenant_id):
         Notes=notes
     )
     db.session.add(vacate_log)
+    record_vacate(vacate_log, user_id, tenant.FullName, unit)
     db.session.commit()
 
     return jsonify({
@@ -1659,11 +1805,11 @@ def transfer_tenant(tenant_id):
             old_apartment.UserID != user_id or new_apartment.UserID != user_id):
         return jsonify({"message": "Unauthorized: You can only transfer between your own units."}), 403
 
-    if new_unit.StatusID != 1:
+    if new_unit.StatusID != status_id(VACANT):
         return jsonify({"message": "New unit is not available. Only vacant units can be assigned."}), 400
 
     # Vacate old unit
-    old_unit.StatusID = 1
+    old_unit.StatusID = status_id(VACANT)
     old_unit.CurrentTenantID = None
 
     # Assign new unit
@@ -1672,7 +1818,7 @@ def transfer_tenant(tenant_id):
     tenant.MoveOutDate = None
     tenant.Status = "Active"
 
-    new_unit.StatusID = 2
+    new_unit.StatusID = status_id(OCCUPIED)
     new_unit.CurrentTenantID = tenant.TenantID
 
     transfer_log = TransferLog(
@@ -1683,21 +1829,15 @@ def transfer_tenant(tenant_id):
         Reason=reason
     )
     db.session.add(transfer_log)
+    record_transfer(transfer_log, user_id, tenant.FullName, old_unit, new_unit)
     db.session.commit()
 
     # ── NEW: SMS to tenant (queued) ──────────────────────────────────────────
     try:
         if tenant.PhoneE164 and not getattr(tenant, "SmsOptOut", False):
-            rent = getattr(new_unit, "MonthlyRent", None)
-            first = tenant.FullName.split(
-                ' ')[0] if tenant.FullName else "Tenant"
-            body = (
-                f"Hi {first}, your unit has been changed from "
-                f"{old_apartment.ApartmentName} {old_unit.Label} to "
-                f"{new_apartment.ApartmentName} {new_unit.Label}. "
-                f"Move-in: {tenant.MoveInDate.strftime('%Y-%m-%d')}"
-                f"{f'. Monthly rent: KES {rent}.' if rent is not None else '.'}"
-            )
+            body = transfer_body(tenant.FullName, old_apartment.ApartmentName, old_unit.Label,
+                                 new_apartment.ApartmentName, new_unit.Label,
+                                 tenant.MoveInDate, getattr(new_unit, "MonthlyRent", None))
             enqueue_sms(
                 to=tenant.PhoneE164, body=body, user_id=user_id,
                 apartment_id=new_apartment.ApartmentID,
@@ -1755,11 +1895,11 @@ def transfer_tenant_same_apartment(tenant_id):
             old_apartment.UserID != user_id or new_apartment.UserID != user_id):
         return jsonify({"message": "Unauthorized: You can only transfer between your own apartments."}), 403
 
-    if new_unit.StatusID != 1:
+    if new_unit.StatusID != status_id(VACANT):
         return jsonify({"message": "New unit is not vacant."}), 400
 
     # Vacate old unit
-    old_unit.StatusID = 1
+    old_unit.StatusID = status_id(VACANT)
     old_unit.CurrentTenantID = None
 
     # Assign the new unit
@@ -1768,7 +1908,7 @@ def transfer_tenant_same_apartment(tenant_id):
     tenant.MoveOutDate = None
     tenant.Status = 'Active'
 
-    new_unit.StatusID = 2
+    new_unit.StatusID = status_id(OCCUPIED)
     new_unit.CurrentTenantID = tenant.TenantID
 
     log = TransferLog(
@@ -1780,20 +1920,15 @@ def transfer_tenant_same_apartment(tenant_id):
     )
     db.session.add(log)
     db.session.flush()
+    record_transfer(log, user_id, tenant.FullName, old_unit, new_unit)
     db.session.commit()
 
     # ── NEW: SMS to tenant (queued) ──────────────────────────────────────────
     try:
         if tenant.PhoneE164 and not getattr(tenant, "SmsOptOut", False):
-            rent = getattr(new_unit, "MonthlyRent", None)
-            first = tenant.FullName.split(
-                ' ')[0] if tenant.FullName else "Tenant"
-            body = (
-                f"Hi {first}, your unit in {new_apartment.ApartmentName} has been changed "
-                f"from {old_unit.Label} to {new_unit.Label}. "
-                f"Move-in: {tenant.MoveInDate.strftime('%Y-%m-%d')}"
-                f"{f'. Monthly rent: KES {rent}.' if rent is not None else '.'}"
-            )
+            body = transfer_body(tenant.FullName, old_apartment.ApartmentName, old_unit.Label,
+                                 new_apartment.ApartmentName, new_unit.Label,
+                                 tenant.MoveInDate, getattr(new_unit, "MonthlyRent", None))
             enqueue_sms(
                 to=tenant.PhoneE164, body=body, user_id=user_id,
                 apartment_id=new_apartment.ApartmentID,
@@ -1823,53 +1958,52 @@ def get_all_tenants():
     user_id = get_jwt_identity()
     page = max(int(request.args.get('page', 1)), 1)
     limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+    # ?cursor= (empty for the first page) switches to keyset paging; the
+    # legacy ?page= mode is kept for existing clients.
+    cursor = request.args.get('cursor')
+    with_total = _want_total(cursor)
     qstr = (request.args.get('query') or '').strip()
     apartment_filter = request.args.get('apartment_id', type=int)
     status_filter = (request.args.get('status') or '').strip()
 
-    apartment_ids = [
-        a.ApartmentID for a in Apartment.query.filter_by(UserID=user_id).all()]
-    units_q = RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids))
-    if apartment_filter:
-        units_q = units_q.filter_by(ApartmentID=apartment_filter)
-    units = units_q.all()
-    unit_ids = [u.UnitID for u in units]
-    unit_by_id = {u.UnitID: u for u in units}
-
-    tq = Tenant.query.filter(Tenant.RentalUnitID.in_(unit_ids))
+    scope = landlord_scope(user_id, apartment_filter)
+
+    tq = Tenant.query.filter(
+        unit_owned(Tenant.RentalUnitID, user_id, apartment_filter))
     if status_filter:
         tq = tq.filter(Tenant.Status == status_filter)
-    if qstr:
-        like = f"%{qstr}%"
-        tq = tq.filter(
-            (Tenant.FullName.ilike(like)) |
-            (Tenant.Phone.ilike(like)) |
-            (Tenant.Email.ilike(like)) |
-            (Tenant.IDNumber.ilike(like))
-        )
-
-    total = tq.count()
-    items = (tq.order_by(Tenant.CreatedAt.desc())
-               .offset((page-1)*limit)
-               .limit(limit)
-               .all())
+    phone_key = phone_search_key(qstr)
+    if phone_key:
+        # 07… / +254… / 2547… all hit the same indexed key
+        tq = tq.filter(Tenant.PhoneE164 == phone_key)
+    elif qstr:
+        criterion = search_criterion("tenants", qstr, user_id)
+        if criterion is not None:
+            tq = tq.filter(criterion)
+
+    total = tq.count() if with_total else None
+    try:
+        items, next_cursor = keyset_page(
+            tq, Tenant.CreatedAt, Tenant.TenantID, limit,
+            cursor=cursor, offset=(page - 1) * limit)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
 
     out = []
     for t in items:
-        u = unit_by_id.get(t.RentalUnitID)
-        a = Apartment.query.get(u.ApartmentID) if u else None
+        apt_id = scope.unit_apartment.get(t.RentalUnitID)
         out.append({
             "TenantID": t.TenantID, "FullName": t.FullName, "Phone": t.Phone,
             "Email": t.Email, "IDNumber": t.IDNumber, "Status": t.Status,
-            "Apartment": a.ApartmentName if a else "N/A",
-            "Unit": u.Label if u else "N/A",
+            "Apartment": scope.apartment_name.get(apt_id, "N/A"),
+            "Unit": scope.unit_label.get(t.RentalUnitID, "N/A"),
             "MoveInDate": t.MoveInDate.strftime("%Y-%m-%d") if t.MoveInDate else None,
             "MoveOutDate": t.MoveOutDate.strftime("%Y-%m-%d") if t.MoveOutDate else None,
         })
 
     return jsonify({
-        "page": page, "limit": limit, "total": total, "items": out
+        "page": None if cursor is not None else page, "limit": limit,
+        "total": total, "items": out, "next_cursor": next_cursor
     }), 200
 
 # Vacate notice
@@ -2004,6 +2138,31 @@ def messages_dispatch():
 # ──────────────────────────────────────────────────────────────────────────────
 
 
+def _activity_item(e, tenant_name, scope) -> dict:
+    """Timeline item for an ActivityEvent (same shape as the old per-log items)."""
+    if e.EventType == "transfer":
+        return {
+            "id": f"T-{e.SourceLogID}",
+            "type": "transfer",
+            "TenantID": e.TenantID,
+            "TenantName": tenant_name or "Unknown",
+            "FromUnit": scope.unit_label.get(e.FromUnitID) or "N/A",
+            "ToUnit": scope.unit_label.get(e.UnitID) or "N/A",
+            "Reason": e.Reason or "",
+            "Timestamp": _fmt_dt(e.OccurredAt)
+        }
+    return {
+        "id": f"V-{e.SourceLogID}",
+        "type": "vacate",
+        "TenantID": e.TenantID,
+        "TenantName": tenant_name or "Unknown",
+        "Unit": scope.unit_label.get(e.UnitID) or "N/A",
+        "Reason": e.Reason or "",
+        "Notes": e.Notes or "",
+        "Timestamp": _fmt_dt(e.OccurredAt)
+    }
+
+
 @routes.route('/logs/timeline', methods=['GET'])
 @jwt_required()
 def logs_timeline():
@@ -2015,83 +2174,99 @@ def logs_timeline():
     apartment_filter = request.args.get("apartment_id", type=int)
     page = max(int(request.args.get("page", 1)), 1)
     limit = min(max(int(request.args.get("limit", 100)), 1), 500)
+    cursor = request.args.get("cursor")
+    with_total = _want_total(cursor)
 
     y, m = _parse_month_any(month_in)
-    apt_ids, unit_ids, unit_by_id = _landlord_scope_ids(
-        user_id, apartment_filter)
+    scope = landlord_scope(user_id, apartment_filter)
 
-    tq = TransferLog.query.filter(
-        (TransferLog.OldUnitID.in_(unit_ids)) | (
-            TransferLog.NewUnitID.in_(unit_ids))
-    )
-    if y and m:
-        tq = tq.filter(func.extract('year', TransferLog.TransferDate) == y,
-                       func.extract('month', TransferLog.TransferDate) == m)
+    q = activity_query(user_id, apartment_filter, log_type, y, m, search)
+    total = q.count() if with_total else None
+    try:
+        rows, next_cursor = keyset_page(
+            q.outerjoin(Tenant, Tenant.TenantID == ActivityEvent.TenantID)
+             .with_entities(ActivityEvent, Tenant.FullName),
+            ActivityEvent.OccurredAt, ActivityEvent.EventID, limit,
+            cursor=cursor, offset=(page - 1) * limit,
+            key=lambda row: (row[0].OccurredAt, row[0].EventID))
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
 
-    vq = VacateLog.query.filter(VacateLog.ApartmentID.in_(apt_ids))
-    if y and m:
-        vq = vq.filter(func.extract('year', VacateLog.VacateDate) == y,
-                       func.extract('month', VacateLog.VacateDate) == m)
+    items = [_activity_item(e, name, scope) for e, name in rows]
 
-    items = []
+    return jsonify({
+        "page": None if cursor is not None else page,
+        "limit": limit,
+        "total": total,
+        "items": items,
+        "next_cursor": next_cursor
+    }), 200
 
-    if log_type in ("all", "transfer"):
-        for t in tq.all():
-            tenant = Tenant.query.get(t.TenantID)
-            old_u = unit_by_id.get(t.OldUnitID)
-            new_u = unit_by_id.get(t.NewUnitID)
-            hay = " ".join([
-                (t.Reason or ""),
-                (tenant.FullName if tenant else ""),
-                (old_u.Label if old_u else ""),
-                (new_u.Label if new_u else "")
-            ]).lower()
-            if search and search not in hay:
-                continue
-            items.append({
-                "id": f"T-{t.LogID}",
-                "type": "transfer",
-                "TenantID": t.TenantID,
-                "TenantName": tenant.FullName if tenant else "Unknown",
-                "FromUnit": old_u.Label if old_u else "N/A",
-                "ToUnit": new_u.Label if new_u else "N/A",
-                "Reason": t.Reason or "",
-                "Timestamp": _fmt_dt(t.TransferDate)
-            })
 
-    if log_type in ("all", "vacate"):
-        for v in vq.all():
-            tenant = Tenant.query.get(v.TenantID)
-            unit = unit_by_id.get(v.UnitID)
-            hay = " ".join([
-                (v.Reason or ""), (v.Notes or ""),
-                (tenant.FullName if tenant else ""),
-                (unit.Label if unit else "")
-            ]).lower()
-            if search and search not in hay:
+@routes.route('/search', methods=['GET'])
+@jwt_required()
+def search_all():
+    """
+    Ranked prefix/fuzzy search across the landlord's tenants and activity logs.
+      ?q=kam          (required)
+      &type=all|tenants|logs
+      &limit=20       (per type, max 100)
+      &fuzzy=true     (typo-tolerant fallback when prefix search finds nothing)
+    """
+    user_id = get_jwt_identity()
+    q = (request.args.get("q") or "").strip()
+    kind = (request.args.get("type") or "all").lower()
+    limit = min(max(request.args.get("limit", default=20, type=int), 1), 100)
+    fuzzy = (request.args.get("fuzzy", "true").lower() != "false")
+
+    if not q:
+        return jsonify({"status": "error", "message": "q is required."}), 400
+    if kind not in ("all", "tenants", "logs"):
+        return jsonify({"status": "error", "message": "type must be all, tenants or logs."}), 400
+
+    scope = landlord_scope(user_id)
+    out = {"query": q}
+
+    if kind in ("all", "tenants"):
+        phone_key = phone_search_key(q)
+        if phone_key:
+            hits = [(tid, 1.0) for (tid,) in
+                     db.session.query(Tenant.TenantID)
+                     .filter(Tenant.PhoneE164 == phone_key,
+                             unit_owned(Tenant.RentalUnitID, user_id))
+                     .limit(limit).all()]
+        else:
+            hits = search_ranked("tenants", q, user_id, limit, fuzzy)
+        by_id = {t.TenantID: t for t in
+                 Tenant.query.filter(Tenant.TenantID.in_([i for i, _ in hits])).all()} if hits else {}
+        out["tenants"] = []
+        for tid, score in hits:
+            t = by_id.get(tid)
+            if not t:
                 continue
-            items.append({
-                "id": f"V-{v.LogID}",
-                "type": "vacate",
-                "TenantID": v.TenantID,
-                "TenantName": tenant.FullName if tenant else "Unknown",
-                "Unit": unit.Label if unit else "N/A",
-                "Reason": v.Reason or "",
-                "Notes": v.Notes or "",
-                "Timestamp": _fmt_dt(v.VacateDate)
+            apt_id = scope.unit_apartment.get(t.RentalUnitID)
+            out["tenants"].append({
+                "TenantID": t.TenantID, "FullName": t.FullName, "Phone": t.Phone,
+                "Email": t.Email, "IDNumber": t.IDNumber, "Status": t.Status,
+                "Apartment": scope.apartment_name.get(apt_id, "N/A"),
+                "Unit": scope.unit_label.get(t.RentalUnitID, "N/A"),
+                "Score": round(score, 4)
             })
 
-    items.sort(key=lambda e: e["Timestamp"] or "", reverse=True)
-    start = (page - 1) * limit
-    end = start + limit
-    sliced = items[start:end]
+    if kind in ("all", "logs"):
+        hits = search_ranked("activity", q, user_id, limit, fuzzy)
+        rows = (db.session.query(ActivityEvent, Tenant.FullName)
+                .outerjoin(Tenant, Tenant.TenantID == ActivityEvent.TenantID)
+                .filter(ActivityEvent.EventID.in_([i for i, _ in hits]))
+                .all()) if hits else []
+        by_id = {e.EventID: (e, name) for e, name in rows}
+        out["logs"] = []
+        for eid, score in hits:
+            if eid in by_id:
+                e, name = by_id[eid]
+                out["logs"].append({**_activity_item(e, name, scope), "Score": round(score, 4)})
 
-    return jsonify({
-        "page": page,
-        "limit": limit,
-        "total": len(items),
-        "items": sliced
-    }), 200
+    return jsonify(out), 200
 
 
 @routes.route('/logs/stats', methods=['GET'])
@@ -2102,41 +2277,25 @@ def logs_stats():
     apartment_filter = request.args.get("apartment_id", type=int)
 
     y, m = _parse_month_any(month_in)
-    apt_ids, unit_ids, _ = _landlord_scope_ids(user_id, apartment_filter)
+    q = activity_query(user_id, apartment_filter, year=y, month=m)
 
-    tq = TransferLog.query.filter(
-        (TransferLog.OldUnitID.in_(unit_ids)) | (
-            TransferLog.NewUnitID.in_(unit_ids))
-    )
-    vq = VacateLog.query.filter(VacateLog.ApartmentID.in_(apt_ids))
+    by_type = dict(q.with_entities(ActivityEvent.EventType, func.count())
+                   .group_by(ActivityEvent.EventType).all())
+    units_impacted = q.with_entities(
+        func.count(func.distinct(ActivityEvent.UnitID))).scalar() or 0
 
-    if y and m:
-        tq = tq.filter(func.extract('year', TransferLog.TransferDate) == y,
-                       func.extract('month', TransferLog.TransferDate) == m)
-        vq = vq.filter(func.extract('year', VacateLog.VacateDate) == y,
-                       func.extract('month', VacateLog.VacateDate) == m)
-
-    transfers = tq.all()
-    vacates = vq.all()
-
-    units_impacted = len({t.NewUnitID for t in transfers}
-                         | {v.UnitID for v in vacates})
-
-    reasons = [t.Reason for t in transfers if t.Reason] + \
-        [v.Reason for v in vacates if v.Reason]
-    top_reason = "—"
-    if reasons:
-        counts = {}
-        for r in reasons:
-            counts[r] = counts.get(r, 0) + 1
-        top_reason = max(counts, key=counts.get)
+    top = (q.filter(ActivityEvent.Reason.isnot(None), ActivityEvent.Reason != "")
+           .with_entities(ActivityEvent.Reason, func.count().label("n"))
+           .group_by(ActivityEvent.Reason)
+           .order_by(func.count().desc())
+           .first())
 
     return jsonify({
         "month": month_in or "All",
-        "transfers": len(transfers),
-        "vacates": len(vacates),
+        "transfers": by_type.get("transfer", 0),
+        "vacates": by_type.get("vacate", 0),
         "unitsImpacted": units_impacted,
-        "topReason": top_reason
+        "topReason": top[0] if top else "—"
     }), 200
 
 
@@ -2147,40 +2306,35 @@ def logs_recent():
     lim = min(max(request.args.get("limit", default=5, type=int), 1), 50)
     apartment_filter = request.args.get("apartment_id", type=int)
 
-    apt_ids, unit_ids, unit_by_id = _landlord_scope_ids(
-        user_id, apartment_filter)
+    scope = landlord_scope(user_id, apartment_filter)
 
-    transfers = (TransferLog.query
-                 .filter((TransferLog.OldUnitID.in_(unit_ids)) | (TransferLog.NewUnitID.in_(unit_ids)))
-                 .order_by(TransferLog.TransferDate.desc())
-                 .limit(lim).all())
-    vacates = (VacateLog.query
-               .filter(VacateLog.ApartmentID.in_(apt_ids))
-               .order_by(VacateLog.VacateDate.desc())
-               .limit(lim).all())
+    def latest(event_type):
+        return (activity_query(user_id, apartment_filter, event_type)
+                .outerjoin(Tenant, Tenant.TenantID == ActivityEvent.TenantID)
+                .with_entities(ActivityEvent, Tenant.FullName)
+                .order_by(ActivityEvent.OccurredAt.desc())
+                .limit(lim).all())
 
     recent_transfers = []
-    for t in transfers:
-        tenant = Tenant.query.get(t.TenantID)
+    for e, name in latest("transfer"):
         recent_transfers.append({
-            "Date": _fmt_dt(t.TransferDate),
-            "TenantID": t.TenantID,
-            "TenantName": tenant.FullName if tenant else "Unknown",
-            "From": unit_by_id.get(t.OldUnitID).Label if unit_by_id.get(t.OldUnitID) else "N/A",
-            "To": unit_by_id.get(t.NewUnitID).Label if unit_by_id.get(t.NewUnitID) else "N/A",
-            "Reason": t.Reason or "—"
+            "Date": _fmt_dt(e.OccurredAt),
+            "TenantID": e.TenantID,
+            "TenantName": name or "Unknown",
+            "From": scope.unit_label.get(e.FromUnitID, "N/A"),
+            "To": scope.unit_label.get(e.UnitID, "N/A"),
+            "Reason": e.Reason or "—"
         })
 
     recent_vacates = []
-    for v in vacates:
-        tenant = Tenant.query.get(v.TenantID)
+    for e, name in latest("vacate"):
         recent_vacates.append({
-            "Date": _fmt_dt(v.VacateDate),
-            "TenantID": v.TenantID,
-            "TenantName": tenant.FullName if tenant else "Unknown",
-            "Unit": unit_by_id.get(v.UnitID).Label if unit_by_id.get(v.UnitID) else "N/A",
-            "Reason": v.Reason or "—",
-            "Notes": v.Notes or "—"
+            "Date": _fmt_dt(e.OccurredAt),
+            "TenantID": e.TenantID,
+            "TenantName": name or "Unknown",
+            "Unit": scope.unit_label.get(e.UnitID, "N/A"),
+            "Reason": e.Reason or "—",
+            "Notes": e.Notes or "—"
         })
 
     return jsonify({
@@ -2193,36 +2347,18 @@ def logs_recent():
 @jwt_required()
 def logs_alerts_repeat_transfers():
     user_id = get_jwt_identity()
-    months = request.args.get("months", type=int) or 6
-    threshold = request.args.get("threshold", type=int) or 2
+    months = request.args.get("months", type=int) or DEFAULT_MONTHS
+    threshold = request.args.get("threshold", type=int) or DEFAULT_THRESHOLD
     apartment_filter = request.args.get("apartment_id", type=int)
-    cutoff = datetime.utcnow() - timedelta(days=30 * months)
-
-    _, unit_ids, _ = _landlord_scope_ids(user_id, apartment_filter)
-
-    q = (TransferLog.query
-         .filter(((TransferLog.OldUnitID.in_(unit_ids)) | (TransferLog.NewUnitID.in_(unit_ids))),
-                 TransferLog.TransferDate >= cutoff))
-
-    counts = {}
-    last_dates = {}
-    for t in q.all():
-        counts[t.TenantID] = counts.get(t.TenantID, 0) + 1
-        last_dates[t.TenantID] = max(last_dates.get(
-            t.TenantID, datetime.min), t.TransferDate or datetime.min)
-
-    flagged_ids = [tid for tid, c in counts.items() if c > threshold]
-    flagged = []
-    for tid in flagged_ids:
-        tenant = Tenant.query.get(tid)
-        flagged.append({
-            "TenantID": tid,
-            "TenantName": tenant.FullName if tenant else "Unknown",
-            "TransfersInPeriod": counts[tid],
-            "LastTransfer": _fmt_dt(last_dates.get(tid))
-        })
 
-    flagged.sort(key=lambda x: x["LastTransfer"] or "", reverse=True)
+    flagged = [{
+        "TenantID": tid,
+        "TenantName": name or "Unknown",
+        "TransfersInPeriod": count,
+        "LastTransfer": _fmt_dt(last)
+    } for _, tid, name, count, last
+        in repeat_transfers(months, threshold, user_id, apartment_filter)]
+
     return jsonify({
         "months": months,
         "threshold": threshold,
@@ -2230,6 +2366,32 @@ def logs_alerts_repeat_transfers():
     }), 200
 
 
+@routes.route('/logs/alerts', methods=['GET'])
+@jwt_required()
+def logs_alerts_toolbar():
+    """Precomputed flags for the dashboard toolbar (see refresh-alerts)."""
+    user_id = get_jwt_identity()
+    alerts = (TransferAlert.query
+              .filter(TransferAlert.LandlordID == user_id)
+              .order_by(TransferAlert.LastTransfer.desc())
+              .all())
+    # this landlord's rows only: other landlords' refresh times are not theirs to see
+    computed_at = max((a.ComputedAt for a in alerts if a.ComputedAt), default=None)
+
+    return jsonify({
+        "computed_at": _fmt_dt(computed_at),
+        "months": alerts[0].WindowMonths if alerts else DEFAULT_MONTHS,
+        "threshold": alerts[0].Threshold if alerts else DEFAULT_THRESHOLD,
+        "count": len(alerts),
+        "flagged": [{
+            "TenantID": a.TenantID,
+            "TenantName": a.TenantName or "Unknown",
+            "TransfersInPeriod": a.TransfersInPeriod,
+            "LastTransfer": _fmt_dt(a.LastTransfer)
+        } for a in alerts]
+    }), 200
+
+
 @routes.route('/logs/upcoming-vacates', methods=['GET'])
 @jwt_required()
 def logs_upcoming_vacates():
@@ -2238,11 +2400,10 @@ def logs_upcoming_vacates():
     apartment_filter = request.args.get("apartment_id", type=int)
     today = date.today()
 
-    apt_ids, unit_ids, unit_by_id = _landlord_scope_ids(
-        user_id, apartment_filter)
+    scope = landlord_scope(user_id, apartment_filter)
 
     q = (VacateNotice.query
-         .filter(VacateNotice.RentalUnitID.in_(unit_ids),
+         .filter(unit_owned(VacateNotice.RentalUnitID, user_id, apartment_filter),
                  VacateNotice.Status == 'Pending',
                  VacateNotice.ExpectedVacateDate >= today))
     if days:
@@ -2254,12 +2415,11 @@ def logs_upcoming_vacates():
     out = []
     for n in notices:
         tenant = Tenant.query.get(n.TenantID)
-        unit = unit_by_id.get(n.RentalUnitID)
         days_left = (n.ExpectedVacateDate - today).days
         out.append({
             "TenantID": n.TenantID,
             "TenantName": tenant.FullName if tenant else "Unknown",
-            "Unit": unit.Label if unit else "N/A",
+            "Unit": scope.unit_label.get(n.RentalUnitID, "N/A"),
             "ExpectedVacateDate": n.ExpectedVacateDate.strftime("%Y-%m-%d"),
             "InspectionDate": n.InspectionDate.strftime("%Y-%m-%d") if n.InspectionDate else None,
             "Reason": n.Reason or "—",
@@ -2273,10 +2433,6 @@ def logs_upcoming_vacates():
 @routes.route('/logs/export', methods=['GET'])
 @jwt_required()
 def logs_export_csv():
-    from io import StringIO
-    import csv
-    from flask import Response
-
     user_id = get_jwt_identity()
     month_in = (request.args.get("month") or "").strip()
     log_type = (request.args.get("type") or "all").lower()
@@ -2285,118 +2441,35 @@ def logs_export_csv():
     apartment_filter = request.args.get("apartment_id", type=int)
 
     y, m = _parse_month_any(month_in)
-    apt_ids, unit_ids, unit_by_id = _landlord_scope_ids(
-        user_id, apartment_filter)
-
-    tq = TransferLog.query.filter(
-        (TransferLog.OldUnitID.in_(unit_ids)) | (
-            TransferLog.NewUnitID.in_(unit_ids))
-    )
-    vq = VacateLog.query.filter(VacateLog.ApartmentID.in_(apt_ids))
-
-    if y and m:
-        tq = tq.filter(func.extract('year', TransferLog.TransferDate) == y,
-                       func.extract('month', TransferLog.TransferDate) == m)
-        vq = vq.filter(func.extract('year', VacateLog.VacateDate) == y,
-                       func.extract('month', VacateLog.VacateDate) == m)
-
-    rows = []
-
-    if log_type in ("all", "transfer"):
-        for t in tq.all():
-            tenant = Tenant.query.get(t.TenantID)
-            old_u = unit_by_id.get(t.OldUnitID)
-            new_u = unit_by_id.get(t.NewUnitID)
-            hay = " ".join([
-                (t.Reason or ""),
-                (tenant.FullName if tenant else ""),
-                (old_u.Label if old_u else ""),
-                (new_u.Label if new_u else "")
-            ]).lower()
-            if search and search not in hay:
-                continue
-            rows.append([
-                "Transfer",
-                tenant.FullName if tenant else "Unknown",
-                f"{(old_u.Label if old_u else 'N/A')} -> {(new_u.Label if new_u else 'N/A')}",
-                _fmt_dt(t.TransferDate),
-                t.Reason or "",
-                ""
-            ])
-
-    if log_type in ("all", "vacate"):
-        for v in vq.all():
-            tenant = Tenant.query.get(v.TenantID)
-            unit = unit_by_id.get(v.UnitID)
-            hay = " ".join([
-                (v.Reason or ""), (v.Notes or ""),
-                (tenant.FullName if tenant else ""),
-                (unit.Label if unit else "")
-            ]).lower()
-            if search and search not in hay:
-                continue
-            rows.append([
-                "Vacate",
-                tenant.FullName if tenant else "Unknown",
-                (unit.Label if unit else "N/A"),
-                _fmt_dt(v.VacateDate),
-                v.Reason or "",
-                v.Notes or ""
-            ])
-
-    rows.sort(key=lambda r: r[3] or "", reverse=True)
-
-    sio = StringIO()
-    writer = csv.writer(sio)
-    writer.writerow(["Type", "Tenant", "Unit / From → To",
-                    "Date", "Reason", "Notes"])
-    writer.writerows(rows)
-    sio.seek(0)
+    rows = activity_rows(user_id, apartment_filter, log_type, y, m, search)
 
     filename = f"logs_{(month_in or 'all').replace(' ', '_')}.csv"
-    return Response(
-        sio.getvalue(),
-        mimetype="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return csv_response(filename, ACTIVITY_HEADER, rows)
 
 
 @routes.route('/transfer-logs', methods=['GET'])
 @jwt_required()
 def view_transfer_logs():
     user_id = get_jwt_identity()
-
-    apartments = Apartment.query.filter_by(UserID=user_id).all()
-    apartment_ids = [apt.ApartmentID for apt in apartments]
-
-    units = RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids)).all()
-    unit_ids = [unit.UnitID for unit in units]
-    unit_dict = {unit.UnitID: unit for unit in units}
+    scope = landlord_scope(user_id)
 
     transfer_logs = TransferLog.query.filter(
-        (TransferLog.OldUnitID.in_(unit_ids)) | (
-            TransferLog.NewUnitID.in_(unit_ids))
+        transfer_owned(user_id)
     ).order_by(TransferLog.TransferDate.desc()).all()
 
     result = []
     for log in transfer_logs:
         tenant = Tenant.query.get(log.TenantID)
-        old_unit = unit_dict.get(log.OldUnitID)
-        new_unit = unit_dict.get(log.NewUnitID)
-
-        old_apartment = Apartment.query.get(
-            old_unit.ApartmentID) if old_unit else None
-        new_apartment = Apartment.query.get(
-            new_unit.ApartmentID) if new_unit else None
+        old_apt_id = scope.unit_apartment.get(log.OldUnitID)
+        new_apt_id = scope.unit_apartment.get(log.NewUnitID)
 
         result.append({
             "TenantID": tenant.TenantID if tenant else None,
             "TenantName": tenant.FullName if tenant else "Unknown",
-            "FromUnit": old_unit.Label if old_unit else "N/A",
-            "FromApartment": old_apartment.ApartmentName if old_apartment else "N/A",
-            "ToUnit": new_unit.Label if new_unit else "N/A",
-            "ToApartment": new_apartment.ApartmentName if new_apartment else "N/A",
+            "FromUnit": scope.unit_label.get(log.OldUnitID, "N/A"),
+            "FromApartment": scope.apartment_name.get(old_apt_id, "N/A"),
+            "ToUnit": scope.unit_label.get(log.NewUnitID, "N/A"),
+            "ToApartment": scope.apartment_name.get(new_apt_id, "N/A"),
             "TransferredByUserID": log.TransferredBy,
             "TransferDate": log.TransferDate.strftime('%Y-%m-%d %H:%M:%S'),
             "Reason": log.Reason
@@ -2412,28 +2485,20 @@ def view_transfer_logs():
 @jwt_required()
 def view_vacate_logs():
     user_id = get_jwt_identity()
+    scope = landlord_scope(user_id)
 
-    apartments = Apartment.query.filter_by(UserID=user_id).all()
-    apartment_ids = [a.ApartmentID for a in apartments]
-
-    units = RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids)).all()
-    unit_dict = {unit.UnitID: unit for unit in units}
-
-    vacate_logs = VacateLog.query.filter(VacateLog.ApartmentID.in_(
-        apartment_ids)).order_by(VacateLog.VacateDate.desc()).all()
+    vacate_logs = VacateLog.query.filter(
+        apartment_owned(VacateLog.ApartmentID, user_id)).order_by(VacateLog.VacateDate.desc()).all()
 
     result = []
     for log in vacate_logs:
         tenant = Tenant.query.get(log.TenantID)
-        unit = unit_dict.get(log.UnitID)
-        apartment = Apartment.query.get(log.ApartmentID)
 
         result.append({
             "TenantID": tenant.TenantID if tenant else None,
             "TenantName": tenant.FullName if tenant else "Unknown",
-            "Apartment": apartment.ApartmentName if apartment else "N/A",
-            "Unit": unit.Label if unit else "N/A",
+            "Apartment": scope.apartment_name.get(log.ApartmentID, "N/A"),
+            "Unit": scope.unit_label.get(log.UnitID, "N/A"),
             "VacateDate": log.VacateDate.strftime('%Y-%m-%d %H:%M:%S') if log.VacateDate else "N/A",
             "Reason": log.Reason or "Not Provided",
             "Notes": log.Notes or "None",
@@ -2453,10 +2518,9 @@ def view_vacate_logs():
 @routes.route('/bills/generate-or-update', methods=['POST'])
 @jwt_required()
 def generate_or_update_bills():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({
             "status": "error",
             "message": "Unauthorized. Only landlords can manage bills."
@@ -2472,13 +2536,10 @@ def generate_or_update_bills():
         today = datetime.today()
         billing_month = today.strftime("%B %Y")
 
-    def _parse_period(label: str):
-        try:
-            dt = datetime.strptime(label, "%B %Y")
-            return datetime(dt.year, dt.month, 1).date()
-        except Exception:
-            return None
-    billing_period = _parse_period(billing_month)
+    billing_period = month_period(billing_month)
+    if not billing_period:
+        return jsonify({"status": "error", "message": "Invalid month. Use 'July 2025' or '2025-07'."}), 400
+    billing_month = billing_period.strftime("%B %Y")  # canonical label
 
     try:
         # keep your existing due date logic (5th of current month)
@@ -2505,7 +2566,7 @@ def generate_or_update_bills():
 
             bill = TenantBill.query.filter_by(
                 TenantID=tenant.TenantID,
-                BillingMonth=billing_month
+                BillingPeriod=billing_period
             ).first()
 
             if not bill:
@@ -2561,8 +2622,6 @@ def generate_or_update_bills():
 
                 if getattr(bill, "LandlordID", None) is None and resolved_landlord_id:
                     bill.LandlordID = resolved_landlord_id
-                if getattr(bill, "BillingPeriod", None) is None and billing_period:
-                    bill.BillingPeriod = billing_period
 
                 total_due, carried_balance = calculate_bill_amount(
                     tenant.TenantID,
@@ -2602,9 +2661,9 @@ def generate_or_update_bills():
 @jwt_required()
 def get_filtered_bills():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
     apartment_id = request.args.get("apartment_id", type=int)
@@ -2618,22 +2677,19 @@ def get_filtered_bills():
             "message": f"Invalid status. Choose from {valid_statuses}"
         }), 400
 
-    apartments = Apartment.query.filter_by(UserID=user_id).all()
-    apartment_ids = [a.ApartmentID for a in apartments]
-
-    if apartment_id and apartment_id not in apartment_ids:
+    scope = landlord_scope(user_id)
+    if apartment_id and apartment_id not in scope.apartment_ids:
         return jsonify({"status": "error", "message": "You do not own this apartment."}), 403
-
-    units_query = RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids))
     if apartment_id:
-        units_query = units_query.filter_by(ApartmentID=apartment_id)
-    units = units_query.all()
-    unit_ids = [u.UnitID for u in units]
+        scope = landlord_scope(user_id, apartment_id)
 
-    query = TenantBill.query.filter(TenantBill.RentalUnitID.in_(unit_ids))
+    query = TenantBill.query.filter(
+        landlord_owned(TenantBill, user_id, apartment_id))
     if month_filter:
-        query = query.filter(TenantBill.BillingMonth.ilike(month_filter))
+        period = month_period(month_filter)
+        if not period:
+            return jsonify({"status": "error", "message": "Invalid month. Use 'July 2025' or '2025-07'."}), 400
+        query = query.filter(TenantBill.BillingPeriod == period)
     if status_filter:
         query = query.filter(TenantBill.BillStatus == status_filter)
 
@@ -2650,8 +2706,7 @@ def get_filtered_bills():
     result = []
     for bill in bills:
         tenant = Tenant.query.get(bill.TenantID)
-        unit = RentalUnit.query.get(bill.RentalUnitID)
-        apartment = Apartment.query.get(unit.ApartmentID) if unit else None
+        apt_id = scope.unit_apartment.get(bill.RentalUnitID)
 
         paid_to_date = compute_paid_to_date_for_bill(bill.BillID)
         balance, _recomp_status = compute_balance_and_status(
@@ -2661,8 +2716,8 @@ def get_filtered_bills():
         result.append({
             "BillID": bill.BillID,
             "TenantName": tenant.FullName if tenant else "Unknown",
-            "ApartmentName": apartment.ApartmentName if apartment else "Unknown",
-            "UnitLabel": unit.Label if unit else "Unknown",
+            "ApartmentName": scope.apartment_name.get(apt_id, "Unknown"),
+            "UnitLabel": scope.unit_label.get(bill.RentalUnitID, "Unknown"),
             "BillingMonth": bill.BillingMonth,
             "TotalAmountDue": bill.TotalAmountDue,
             "BillStatus": bill.BillStatus,
@@ -2688,8 +2743,8 @@ def get_filtered_bills():
 @jwt_required()
 def get_bills_by_apartment(apartment_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
     apartment = Apartment.query.get(apartment_id)
@@ -2698,10 +2753,10 @@ def get_bills_by_apartment(apartment_id):
     if apartment.UserID != user_id:
         return jsonify({"status": "error", "message": "You do not own this apartment."}), 403
 
-    units = RentalUnit.query.filter_by(ApartmentID=apartment_id).all()
-    unit_ids = [u.UnitID for u in units]
+    has_units = (db.session.query(RentalUnit.UnitID)
+                 .filter_by(ApartmentID=apartment_id).first())
 
-    if not unit_ids:
+    if not has_units:
         return jsonify({
             "status": "success",
             "message": "No rental units found for this apartment.",
@@ -2711,7 +2766,8 @@ def get_bills_by_apartment(apartment_id):
         }), 200
 
     bills = (TenantBill.query
-             .filter(TenantBill.RentalUnitID.in_(unit_ids))
+             .join(RentalUnit, RentalUnit.UnitID == TenantBill.RentalUnitID)
+             .filter(RentalUnit.ApartmentID == apartment_id)
              .order_by(TenantBill.BillID.asc())
              .all())
 
@@ -2756,9 +2812,9 @@ def get_bills_by_apartment(apartment_id):
 @jwt_required()
 def get_bills_for_unit(unit_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
     unit = RentalUnit.query.get(unit_id)
@@ -2822,20 +2878,17 @@ def get_bills_for_unit(unit_id):
 @jwt_required()
 def get_bills_by_month(month):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
-    apartments = Apartment.query.filter_by(UserID=user_id).all()
-    apartment_ids = [a.ApartmentID for a in apartments]
-
-    units = RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids)).all()
-    unit_ids = [u.UnitID for u in units]
+    period = month_period(month)
+    if not period:
+        return jsonify({"status": "error", "message": "Invalid month. Use 'July 2025' or '2025-07'."}), 400
 
     bills = (TenantBill.query
-             .filter(TenantBill.RentalUnitID.in_(unit_ids),
-                     TenantBill.BillingMonth.ilike(month))
+             .filter(landlord_owned(TenantBill, user_id),
+                     TenantBill.BillingPeriod == period)
              .order_by(TenantBill.BillID.asc())
              .all())
 
@@ -2875,8 +2928,8 @@ def get_bills_by_month(month):
 @jwt_required()
 def get_bills_by_status(status):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
     valid_statuses = ["Unpaid", "Paid", "Partially Paid", "Overpaid"]
@@ -2886,15 +2939,8 @@ def get_bills_by_status(status):
             "message": f"Invalid status. Choose from {valid_statuses}"
         }), 400
 
-    apartments = Apartment.query.filter_by(UserID=user_id).all()
-    apartment_ids = [a.ApartmentID for a in apartments]
-
-    units = RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids)).all()
-    unit_ids = [u.UnitID for u in units]
-
     bills = (TenantBill.query
-             .filter(TenantBill.RentalUnitID.in_(unit_ids),
+             .filter(landlord_owned(TenantBill, user_id),
                      TenantBill.BillStatus == status)
              .order_by(TenantBill.BillID.asc())
              .all())
@@ -2950,22 +2996,23 @@ def get_bills_by_apartment_month(month):
     from decimal import Decimal
 
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    landlord = current_landlord()
 
-    if not user or not user.IsAdmin:
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
+    period = month_period(month)
+    if not period:
+        return jsonify({"status": "error", "message": "Invalid month. Use 'July 2025' or '2025-07'."}), 400
+
     apartments = Apartment.query.filter_by(UserID=user_id).all()
 
     response = []
     for apartment in apartments:
-        units = RentalUnit.query.filter_by(
-            ApartmentID=apartment.ApartmentID).all()
-        unit_ids = [u.UnitID for u in units]
-
         bills = (TenantBill.query
-                 .filter(TenantBill.RentalUnitID.in_(unit_ids),
-                         TenantBill.BillingMonth.ilike(month))
+                 .join(RentalUnit, RentalUnit.UnitID == TenantBill.RentalUnitID)
+                 .filter(RentalUnit.ApartmentID == apartment.ApartmentID,
+                         TenantBill.BillingPeriod == period)
                  .order_by(TenantBill.BillID.asc())
                  .all())
 
@@ -3015,7 +3062,7 @@ def billing_kpis():
     KPI summary for landlord bills.
     - Non-breaking: NEW endpoint.
     - Filters:
-        ?month=July 2025                (matches BillingMonth label)
+        ?month=July 2025 | 2025-07      (matches BillingPeriod)
         &apartment_id=123               (optional, must belong to landlord)
         &include_apartments=true|false  (optional; default false)
     - Output:
@@ -3032,8 +3079,8 @@ def billing_kpis():
     from decimal import Decimal
 
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
     month = request.args.get("month")  # e.g., "July 2025"
@@ -3042,18 +3089,14 @@ def billing_kpis():
         "include_apartments", "false").lower() == "true")
 
     # landlord scope
-    apartments = Apartment.query.filter_by(UserID=user_id).all()
-    apartment_ids = [a.ApartmentID for a in apartments]
+    scope = landlord_scope(user_id)
     if apartment_id:
-        if apartment_id not in apartment_ids:
+        if apartment_id not in scope.apartment_ids:
             return jsonify({"status": "error", "message": "You do not own this apartment."}), 403
-        apartment_ids = [apartment_id]  # narrow scope
+        scope = landlord_scope(user_id, apartment_id)  # narrow scope
 
     # units in-scope
-    units = RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids)).all()
-    unit_ids = [u.UnitID for u in units]
-    if not unit_ids:
+    if not scope.unit_ids:
         return jsonify({
             "status": "success",
             "filters": {"month": month or "All", "apartment_id": apartment_id or "All"},
@@ -3065,9 +3108,12 @@ def billing_kpis():
         }), 200
 
     # base bills query
-    q = TenantBill.query.filter(TenantBill.RentalUnitID.in_(unit_ids))
+    q = TenantBill.query.filter(landlord_owned(TenantBill, user_id, apartment_id))
     if month:
-        q = q.filter(TenantBill.BillingMonth.ilike(month))
+        period = month_period(month)
+        if not period:
+            return jsonify({"status": "error", "message": "Invalid month. Use 'July 2025' or '2025-07'."}), 400
+        q = q.filter(TenantBill.BillingPeriod == period)
     bills = q.all()
 
     counts = {"Paid": 0, "Partially Paid": 0, "Unpaid": 0, "Overpaid": 0}
@@ -3076,8 +3122,6 @@ def billing_kpis():
 
     # For optional apartment grouping
     by_apartment = {}  # apt_id -> accumulator
-    unit_by_id = {u.UnitID: u for u in units}
-    apt_by_id = {a.ApartmentID: a for a in apartments}
 
     for b in bills:
         # derive paid_to_date using allocations if present; else fallback to summed payments
@@ -3092,12 +3136,11 @@ def billing_kpis():
 
         # per-apartment aggregates (optional)
         if include_apts:
-            unit = unit_by_id.get(b.RentalUnitID)
-            apt_id = unit.ApartmentID if unit else None
+            apt_id = scope.unit_apartment.get(b.RentalUnitID)
             if apt_id:
                 acc = by_apartment.setdefault(apt_id, {
                     "ApartmentID": apt_id,
-                    "ApartmentName": apt_by_id.get(apt_id).ApartmentName if apt_by_id.get(apt_id) else "Unknown",
+                    "ApartmentName": scope.apartment_name.get(apt_id, "Unknown"),
                     "counts_by_status": {"Paid": 0, "Partially Paid": 0, "Unpaid": 0, "Overpaid": 0},
                     "sum_due": Decimal('0.00'),
                     "sum_paid": Decimal('0.00'),
@@ -3153,7 +3196,7 @@ def compute_paid_to_date_for_bill(bill_id: int) -> Decimal:
     total = (db.session.query(func.coalesce(func.sum(RentPayment.AmountPaid), 0))
              .filter(RentPayment.TenantID == bill.TenantID,
                      RentPayment.RentalUnitID == bill.RentalUnitID,
-                     RentPayment.BillingMonth == bill.BillingMonth)
+                     RentPayment.IntendedBillingPeriod == bill.BillingPeriod)
              .scalar())
     return Decimal(total).quantize(Decimal('0.01'))
 
@@ -3174,9 +3217,8 @@ def compute_balance_and_status(total_due: Decimal, paid_to_date: Decimal):
 @routes.route("/tenant-payments", methods=["POST"])
 @jwt_required()
 def record_rent_payment():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized."}), 403
 
     data = request.get_json() or {}
@@ -3202,9 +3244,13 @@ def record_rent_payment():
     if amount_paid <= 0:
         return jsonify({"status": "error", "message": "AmountPaid must be greater than zero."}), 400
 
+    period = month_period(billing_month)
+    if not period:
+        return jsonify({"status": "error", "message": "Invalid month. Use 'July 2025' or '2025-07'."}), 400
+
     # Find the bill
     tenant_bill = (TenantBill.query
-                   .filter_by(TenantID=tenant_id, RentalUnitID=rental_unit_id, BillingMonth=billing_month)
+                   .filter_by(TenantID=tenant_id, RentalUnitID=rental_unit_id, BillingPeriod=period)
                    .first())
     if not tenant_bill:
         return jsonify({"status": "error", "message": "Tenant bill not found for this month."}), 404
@@ -3220,8 +3266,8 @@ def record_rent_payment():
         LandlordID=getattr(tenant_bill, "LandlordID", None) or
         Apartment.query.get(RentalUnit.query.get(
             rental_unit_id).ApartmentID).UserID,
-        BillingMonth=billing_month,
-        IntendedBillingPeriod=None,  # you can parse from label later if desired
+        BillingMonth=tenant_bill.BillingMonth,
+        IntendedBillingPeriod=tenant_bill.BillingPeriod,
         BilledAmount=billed_amount,
         AmountPaid=amount_paid,
         Balance=billed_amount - amount_paid,   # will be recomputed below for response
@@ -3278,9 +3324,8 @@ def record_rent_payment():
 @routes.route("/landlord-expenses/add", methods=["POST"])
 @jwt_required()
 def add_landlord_expense():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized"}), 403
 
     data = request.get_json() or {}
@@ -3331,9 +3376,8 @@ def add_landlord_expense():
         return jsonify({"status": "error", "message": "ExpensePaymentDate must be YYYY-MM-DD."}), 400
 
     # Optional: validate payment method (if provided)
-    valid_methods = {"Cash", "Bank Transfer", "M-Pesa", "Cheque", "Other"}
-    if payment_method and payment_method not in valid_methods:
-        return jsonify({"status": "error", "message": f"PaymentMethod must be one of {sorted(valid_methods)}"}), 400
+    if payment_method and payment_method not in EXPENSE_PAYMENT_METHODS:
+        return jsonify({"status": "error", "message": f"PaymentMethod must be one of {sorted(EXPENSE_PAYMENT_METHODS)}"}), 400
 
     # Save
     new_expense = LandlordExpense(
@@ -3369,108 +3413,341 @@ def add_landlord_expense():
 
 
 # -------------------------------
-# View expenses grouped by Apartment
+# Bulk import (CSV / bank statement)
+#   multipart: file=<csv>, optional apartment_id (default for rows without
+#   one), type (default ExpenseType), dry_run=true
 # -------------------------------
-@routes.route("/landlord-expenses/by-apartment", methods=["GET"])
+@routes.route("/landlord-expenses/import", methods=["POST"])
 @jwt_required()
-def view_expenses_by_apartment():
+def import_landlord_expenses():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized"}), 403
 
-    expenses = LandlordExpense.query.join(Apartment).all()
-    result = {}
-
-    for exp in expenses:
-        apt_name = exp.apartment.ApartmentName
-        result.setdefault(apt_name, []).append({
-            "ExpenseID": exp.ExpenseID,
-            "ExpenseType": exp.ExpenseType,
-            "Amount": exp.Amount,
-            "Description": exp.Description,
-            "ExpenseDate": _fmt_date(exp.ExpenseDate),
-            "ExpensePaymentDate": _fmt_date(exp.ExpensePaymentDate),
-            "Payee": exp.Payee,
-            "PaymentMethod": exp.PaymentMethod,
-            "PaymentRef": exp.PaymentRef,
-        })
+    upload = request.files.get("file")
+    if not upload:
+        return jsonify({"status": "error", "message": "No file provided"}), 400
 
-    return jsonify({"status": "success", "expenses": result}), 200
+    apartment_id = request.form.get("apartment_id", type=int)
+    if apartment_id and not Apartment.query.filter(
+            Apartment.ApartmentID == apartment_id, Apartment.UserID == user_id).first():
+        return jsonify({"status": "error", "message": "Apartment not found."}), 404
+    dry_run = (request.form.get("dry_run") or "").lower() in ("1", "true", "yes")
+
+    try:
+        result = import_expenses(user_id, upload.stream, default_apartment_id=apartment_id,
+                                 default_type=(request.form.get("type") or "").strip() or None,
+                                 dry_run=dry_run)
+    except ImportFormatError as e:
+        db.session.rollback()
+        return jsonify({"status": "error", "message": f"Could not read CSV: {e}"}), 400
+    except ImportAborted as e:
+        # earlier rows are already committed: say how far the import got
+        db.session.rollback()
+        verb = "would have been imported" if dry_run else "were imported"
+        return jsonify({
+            "status": "error",
+            "message": f"Could not read CSV at line {e.line}: {e}. Rows before it {verb} "
+                       f"({e.result['inserted']} expense(s)); fix the file and re-upload, "
+                       f"rows with a PaymentRef will be skipped as duplicates.",
+            "dry_run": dry_run,
+            "stopped_at_line": e.line,
+            **e.result,
+        }), 400
+
+    verb = "would be imported" if dry_run else "imported"
+    return jsonify({
+        "status": "success",
+        "message": f"📥 {result['inserted']} expense(s) {verb}, {result['duplicates']} duplicate(s) skipped, "
+                   f"{result['failed']} row(s) with errors.",
+        "dry_run": dry_run,
+        **result,
+    }), 200
 
 
 # -------------------------------
-# View expenses grouped by Month (period month)
+# Recurring expenses (monthly definitions; generated by
+# `flask --app app generate-recurring-expenses` or POST .../recurring/run)
+#   {"ApartmentID", "ExpenseType", "Amount", "Description", "Payee",
+#    "PaymentMethod", "DayOfMonth": 1-31, "StartPeriod": "2025-07",
+#    "EndPeriod": "2026-06" | null, "IsActive"}
 # -------------------------------
-@routes.route("/landlord-expenses/by-month", methods=["GET"])
+def _recurring_fields(data: dict, user_id: int, partial: bool = False):
+    """(validated column values, error_response)."""
+    def bad(msg, code=400):
+        return None, (jsonify({"status": "error", "message": msg}), code)
+
+    out = {}
+    if not partial or "ApartmentID" in data:
+        apt = Apartment.query.filter(Apartment.ApartmentID == data.get("ApartmentID"),
+                                     Apartment.UserID == user_id).first()
+        if not apt:
+            return bad("Apartment not found.", 404)
+        out["ApartmentID"] = apt.ApartmentID
+    if not partial or "ExpenseType" in data:
+        if not (data.get("ExpenseType") or "").strip():
+            return bad("ExpenseType is required.")
+        out["ExpenseType"] = data["ExpenseType"].strip()
+    if not partial or "Amount" in data:
+        try:
+            out["Amount"] = float(data.get("Amount"))
+        except (TypeError, ValueError):
+            return bad("Amount must be a valid number.")
+        if out["Amount"] <= 0:
+            return bad("Amount must be greater than zero.")
+    if "PaymentMethod" in data:
+        if data["PaymentMethod"] and data["PaymentMethod"] not in EXPENSE_PAYMENT_METHODS:
+            return bad(f"PaymentMethod must be one of {sorted(EXPENSE_PAYMENT_METHODS)}")
+        out["PaymentMethod"] = data["PaymentMethod"] or None
+    if "DayOfMonth" in data or not partial:
+        try:
+            day = int(data.get("DayOfMonth") or 1)
+        except (TypeError, ValueError):
+            day = 0
+        if not 1 <= day <= 31:
+            return bad("DayOfMonth must be between 1 and 31.")
+        out["DayOfMonth"] = day
+    if "StartPeriod" in data or not partial:
+        start = month_period(data.get("StartPeriod") or "") if data.get("StartPeriod") \
+            else date.today().replace(day=1)
+        if not start:
+            return bad("StartPeriod must be 'July 2025' or '2025-07'.")
+        out["StartPeriod"] = start
+    if "EndPeriod" in data:
+        end = month_period(data["EndPeriod"]) if data["EndPeriod"] else None
+        if data["EndPeriod"] and not end:
+            return bad("EndPeriod must be 'July 2025' or '2025-07'.")
+        out["EndPeriod"] = end
+    for key in ("Description", "Payee"):
+        if key in data:
+            out[key] = data[key] or None
+    if "IsActive" in data:
+        out["IsActive"] = bool(data["IsActive"])
+    return out, None
+
+
+@routes.route("/landlord-expenses/recurring", methods=["GET"])
 @jwt_required()
-def view_expenses_by_month():
+def list_recurring_expenses():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized"}), 403
 
-    expenses = LandlordExpense.query.join(Apartment).all()
-    result = {}
-
-    for exp in expenses:
-        month_key = exp.ExpenseDate.strftime("%B %Y")
-        result.setdefault(month_key, []).append({
-            "ExpenseID": exp.ExpenseID,
-            "Apartment": exp.apartment.ApartmentName,
-            "ExpenseType": exp.ExpenseType,
-            "Amount": exp.Amount,
-            "Description": exp.Description,
-            "ExpenseDate": _fmt_date(exp.ExpenseDate),
-            "ExpensePaymentDate": _fmt_date(exp.ExpensePaymentDate),
-            "Payee": exp.Payee,
-            "PaymentMethod": exp.PaymentMethod,
-            "PaymentRef": exp.PaymentRef,
-        })
+    recs = (RecurringExpense.query
+            .options(joinedload(RecurringExpense.apartment))
+            .filter(RecurringExpense.LandlordID == user_id)
+            .order_by(RecurringExpense.RecurringExpenseID)
+            .all())
+    return jsonify({"status": "success", "recurring": [recurring_dict(r) for r in recs]}), 200
+
+
+@routes.route("/landlord-expenses/recurring", methods=["POST"])
+@jwt_required()
+def create_recurring_expense():
+    user_id = get_jwt_identity()
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
+        return jsonify({"status": "error", "message": "Unauthorized"}), 403
+
+    fields, err = _recurring_fields(request.get_json() or {}, user_id)
+    if err:
+        return err
+    if fields.get("EndPeriod") and fields["EndPeriod"] < fields["StartPeriod"]:
+        return jsonify({"status": "error", "message": "EndPeriod is before StartPeriod."}), 400
+
+    rec = RecurringExpense(LandlordID=user_id, **fields)
+    db.session.add(rec)
+    db.session.commit()
+
+    # materialize the months already due (this month, or a backdated start)
+    result = generate_recurring_expenses(definition_id=rec.RecurringExpenseID)
+    db.session.refresh(rec)
+    return jsonify({
+        "status": "success",
+        "message": f"🔁 Recurring expense saved; {result['generated']} expense(s) generated.",
+        "recurring": recurring_dict(rec),
+    }), 201
+
 
-    return jsonify({"status": "success", "expenses": result}), 200
+@routes.route("/landlord-expenses/recurring/<int:rec_id>", methods=["PATCH", "PUT"])
+@jwt_required()
+def update_recurring_expense(rec_id):
+    user_id = get_jwt_identity()
+    rec = RecurringExpense.query.filter_by(RecurringExpenseID=rec_id, LandlordID=user_id).first()
+    if not rec:
+        return jsonify({"status": "error", "message": "Recurring expense not found."}), 404
+
+    fields, err = _recurring_fields(request.get_json() or {}, user_id, partial=True)
+    if err:
+        return err
+    for key, value in fields.items():
+        setattr(rec, key, value)
+    if rec.EndPeriod and rec.EndPeriod < rec.StartPeriod:
+        db.session.rollback()
+        return jsonify({"status": "error", "message": "EndPeriod is before StartPeriod."}), 400
+    db.session.commit()
+    # Amount/type changes apply to months generated from now on
+    return jsonify({"status": "success", "message": "✅ Recurring expense updated.",
+                    "recurring": recurring_dict(rec)}), 200
+
+
+@routes.route("/landlord-expenses/recurring/<int:rec_id>", methods=["DELETE"])
+@jwt_required()
+def stop_recurring_expense(rec_id):
+    """Deactivates the definition; expenses already generated are kept."""
+    user_id = get_jwt_identity()
+    rec = RecurringExpense.query.filter_by(RecurringExpenseID=rec_id, LandlordID=user_id).first()
+    if not rec:
+        return jsonify({"status": "error", "message": "Recurring expense not found."}), 404
+    rec.IsActive = False
+    db.session.commit()
+    return jsonify({"status": "success", "message": "🛑 Recurring expense stopped."}), 200
+
+
+@routes.route("/landlord-expenses/recurring/run", methods=["POST"])
+@jwt_required()
+def run_recurring_expenses():
+    """Generate the caller's due months now (same as the cron job, scoped)."""
+    user_id = get_jwt_identity()
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
+        return jsonify({"status": "error", "message": "Unauthorized"}), 403
+
+    result = generate_recurring_expenses(user_id=user_id)
+    return jsonify({
+        "status": "success",
+        "message": f"🔁 {result['generated']} recurring expense(s) generated.",
+        **result,
+    }), 200
 
 
 # -------------------------------
-# Monthly expense totals (by period)
+# Expense listing (scoped to the landlord, apartment names joined in)
+#   ?apartment_id=&type=&start=YYYY-MM-DD&end=YYYY-MM-DD&field=period|paid
+#   &unpaid=true&limit=50&cursor=   (newest ExpenseDate first)
 # -------------------------------
-@routes.route("/landlord-expenses/monthly-summary", methods=["GET"])
-@jwt_required()
-def monthly_expense_summary():
+def _expense_filters():
+    """(filters for utils.expense_helper, error_response)."""
+    try:
+        start = request.args.get("start")
+        end = request.args.get("end")
+        start_d = datetime.strptime(start, "%Y-%m-%d").date() if start else None
+        end_d = datetime.strptime(end, "%Y-%m-%d").date() if end else None
+    except ValueError:
+        return None, (jsonify({"status": "error", "message": "Dates must be YYYY-MM-DD."}), 400)
+    field = (request.args.get("field") or "period").lower()
+    return {
+        "apartment_id": request.args.get("apartment_id", type=int),
+        "expense_type": (request.args.get("type") or "").strip() or None,
+        "d_from": start_d,
+        "d_to": end_d,
+        "field": "paid" if field == "paid" else "period",
+        "unpaid": (request.args.get("unpaid") or "").lower() in ("1", "true", "yes"),
+    }, None
+
+
+def _expense_page(user_id, filters, default_limit=50, paged=True):
+    """
+    (items, next_cursor, error_response). With paged=False every matching
+    row is returned (legacy views called without ?limit / ?cursor).
+    """
+    q = expense_query(user_id, **filters)
+    if not paged:
+        rows = q.order_by(LandlordExpense.ExpenseDate.desc(), LandlordExpense.ExpenseID.desc()).all()
+        return [expense_item(r) for r in rows], None, None
+
+    limit = min(max(request.args.get("limit", default=default_limit, type=int), 1), 500)
+    try:
+        rows, next_cursor = keyset_page(q, LandlordExpense.ExpenseDate, LandlordExpense.ExpenseID,
+                                        limit, cursor=request.args.get("cursor") or None)
+    except ValueError as e:
+        return None, None, (jsonify({"status": "error", "message": str(e)}), 400)
+    return [expense_item(r) for r in rows], next_cursor, None
+
+
+def _expense_view(key: str, group_by: str | None = None, **forced):
+    """Shared body of the listing and its legacy projections."""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized"}), 403
 
-    expenses = LandlordExpense.query.all()
-    summary = {}
+    filters, err = _expense_filters()
+    if err:
+        return err
+    filters.update(forced)
 
-    for exp in expenses:
-        month_key = exp.ExpenseDate.strftime("%B %Y")
-        summary[month_key] = summary.get(month_key, 0) + float(exp.Amount or 0)
+    paged = key == "items" or "limit" in request.args or "cursor" in request.args
+    items, next_cursor, err = _expense_page(user_id, filters, paged=paged)
+    if err:
+        return err
 
-    return jsonify({"status": "success", "summary": summary}), 200
+    body = {"status": "success", key: group_items(items, group_by) if group_by else items}
+    if paged:
+        body["next_cursor"] = next_cursor
+    return jsonify(body), 200
+
+
+@routes.route("/landlord-expenses", methods=["GET"])
+@jwt_required()
+def list_landlord_expenses():
+    return _expense_view("items")
 
 
 # -------------------------------
-# Annual expense totals (by period)
+# View expenses grouped by Apartment
 # -------------------------------
-@routes.route("/landlord-expenses/annual-summary", methods=["GET"])
+@routes.route("/landlord-expenses/by-apartment", methods=["GET"])
 @jwt_required()
-def annual_expense_summary():
+def view_expenses_by_apartment():
+    return _expense_view("expenses", group_by="apartment")
+
+
+# -------------------------------
+# View expenses grouped by Month (period month)
+# -------------------------------
+@routes.route("/landlord-expenses/by-month", methods=["GET"])
+@jwt_required()
+def view_expenses_by_month():
+    return _expense_view("expenses", group_by="month")
+
+
+# -------------------------------
+# Expense summaries (aggregated in SQL; same filters as the listing,
+# date window on ExpenseDate)
+# -------------------------------
+def _expense_summary_response(by: str):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized"}), 403
 
-    expenses = LandlordExpense.query.all()
-    summary = {}
+    filters, err = _expense_filters()
+    if err:
+        return err
+    filters["field"] = "period"
+    summary = expense_summary(user_id, by, **filters)
+    return jsonify({"status": "success", "summary": summary}), 200
 
-    for exp in expenses:
-        year = exp.ExpenseDate.strftime("%Y")
-        summary[year] = summary.get(year, 0) + float(exp.Amount or 0)
 
-    return jsonify({"status": "success", "summary": summary}), 200
+# -------------------------------
+# Monthly expense totals (by period)
+# -------------------------------
+@routes.route("/landlord-expenses/monthly-summary", methods=["GET"])
+@jwt_required()
+def monthly_expense_summary():
+    return _expense_summary_response("month")
+
+
+# -------------------------------
+# Annual expense totals (by period)
+# -------------------------------
+@routes.route("/landlord-expenses/annual-summary", methods=["GET"])
+@jwt_required()
+def annual_expense_summary():
+    return _expense_summary_response("year")
 
 
 # -------------------------------
@@ -3479,19 +3756,7 @@ def annual_expense_summary():
 @routes.route("/landlord-expenses/apartment-summary", methods=["GET"])
 @jwt_required()
 def apartment_expense_summary():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
-        return jsonify({"status": "error", "message": "Unauthorized"}), 403
-
-    expenses = LandlordExpense.query.join(Apartment).all()
-    summary = {}
-
-    for exp in expenses:
-        apt_name = exp.apartment.ApartmentName
-        summary[apt_name] = summary.get(apt_name, 0) + float(exp.Amount or 0)
-
-    return jsonify({"status": "success", "summary": summary}), 200
+    return _expense_summary_response("apartment")
 
 
 # -------------------------------
@@ -3500,19 +3765,41 @@ def apartment_expense_summary():
 @routes.route("/landlord-expenses/by-type", methods=["GET"])
 @jwt_required()
 def expenses_by_type():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
-        return jsonify({"status": "error", "message": "Unauthorized"}), 403
+    return _expense_summary_response("type")
 
-    expenses = LandlordExpense.query.all()
-    summary = {}
 
-    for exp in expenses:
-        summary[exp.ExpenseType] = summary.get(
-            exp.ExpenseType, 0) + float(exp.Amount or 0)
+# -------------------------------
+# All four summaries at once (one grouped query)
+#   ?group=month|year|apartment|type narrows it to a single summary
+# -------------------------------
+@routes.route("/landlord-expenses/summary", methods=["GET"])
+@jwt_required()
+def expense_summaries():
+    group = (request.args.get("group") or "all").lower()
+    if group != "all":
+        if group not in EXPENSE_DIMENSIONS:
+            return jsonify({"status": "error",
+                            "message": f"group must be one of: all, {', '.join(EXPENSE_DIMENSIONS)}."}), 400
+        return _expense_summary_response(group)
 
-    return jsonify({"status": "success", "summary": summary}), 200
+    user_id = get_jwt_identity()
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
+        return jsonify({"status": "error", "message": "Unauthorized"}), 403
+
+    filters, err = _expense_filters()
+    if err:
+        return err
+    filters["field"] = "period"
+    pivot = expense_pivot(user_id, **filters)
+    return jsonify({
+        "status": "success",
+        "total": pivot["total"],
+        "monthly": pivot["month"],
+        "annual": pivot["year"],
+        "by_apartment": pivot["apartment"],
+        "by_type": pivot["type"],
+    }), 200
 
 
 # -------------------------------
@@ -3521,44 +3808,84 @@ def expenses_by_type():
 @routes.route("/landlord-expenses/export", methods=["GET"])
 @jwt_required()
 def export_expenses():
-    import csv
-    from io import StringIO
-    from flask import Response
+    user_id = get_jwt_identity()
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
+        return jsonify({"status": "error", "message": "Unauthorized"}), 403
+
+    apartment_id = request.args.get("apartment_id", type=int)
+    return csv_response("landlord_expenses.csv", EXPENSE_HEADER,
+                        expense_rows(user_id, apartment_id))
+
 
+# -------------------------------
+# Background exports
+#   POST /exports {"kind": "logs"|"expenses", "format": "csv"|"xlsx"|"parquet",
+#                  "apartment_id", and for logs "month", "type", "q"}
+#   GET  /exports/<id>            → status
+#   GET  /exports/<id>/download   → file once Status == "done"
+# -------------------------------
+@routes.route("/exports", methods=["POST"])
+@jwt_required()
+def create_export_job():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized"}), 403
 
-    expenses = LandlordExpense.query.join(Apartment).all()
-
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "ExpenseID", "Apartment", "ExpenseType", "Amount", "Description",
-        "ExpenseDate", "ExpensePaymentDate", "Payee", "PaymentMethod", "PaymentRef"
-    ])
-
-    for exp in expenses:
-        writer.writerow([
-            exp.ExpenseID,
-            exp.apartment.ApartmentName,
-            exp.ExpenseType,
-            float(exp.Amount or 0),
-            exp.Description or "",
-            _fmt_date(exp.ExpenseDate) or "",
-            _fmt_date(exp.ExpensePaymentDate) or "",
-            exp.Payee or "",
-            exp.PaymentMethod or "",
-            exp.PaymentRef or "",
-        ])
-
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=landlord_expenses.csv"}
-    )
+    data = request.get_json() or {}
+    kind = (data.get("kind") or "").strip().lower()
+    fmt = (data.get("format") or "csv").strip().lower()
+
+    params = {"apartment_id": data.get("apartment_id") or None}
+    if kind == "logs":
+        month_in = (data.get("month") or "").strip()
+        y, m = _parse_month_any(month_in)
+        log_type = (data.get("type") or "all").lower()
+        params.update({
+            "log_type": log_type if log_type in ("transfer", "vacate") else None,
+            "year": y, "month": m,
+            "search": (data.get("q") or data.get("search") or "").strip().lower() or None,
+        })
+
+    try:
+        job, created = submit_export(user_id, kind, fmt, params)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    return jsonify({
+        "status": "success",
+        "message": "📦 Export queued." if created else "📦 Reusing an identical export.",
+        "deduplicated": not created,
+        "job": job_dict(job),
+    }), 202 if created else 200
+
+
+def _own_export_job(job_id: int, user_id: int):
+    job = db.session.get(ExportJob, job_id)
+    return job if job and job.LandlordID == user_id else None
+
+
+@routes.route("/exports/<int:job_id>", methods=["GET"])
+@jwt_required()
+def get_export_job(job_id):
+    job = _own_export_job(job_id, get_jwt_identity())
+    if not job:
+        return jsonify({"status": "error", "message": "Export not found."}), 404
+    return jsonify({"status": "success", "job": job_dict(job)}), 200
+
+
+@routes.route("/exports/<int:job_id>/download", methods=["GET"])
+@jwt_required()
+def download_export_job(job_id):
+    job = _own_export_job(job_id, get_jwt_identity())
+    if not job:
+        return jsonify({"status": "error", "message": "Export not found."}), 404
+    if job.Status != "done" or not job.FilePath or not os.path.exists(job.FilePath):
+        return jsonify({"status": "error", "message": f"Export is {job.Status}.",
+                        "job": job_dict(job)}), 409
+    return send_file(job.FilePath, mimetype=MIMETYPES[job.Format], as_attachment=True,
+                     download_name=f"{job.Kind}_export_{job.JobID}.{job.Format}")
 
 
 # -------------------------------
@@ -3570,47 +3897,7 @@ def export_expenses():
 @routes.route("/landlord-expenses/filter", methods=["GET"])
 @jwt_required()
 def filter_expenses():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
-        return jsonify({"status": "error", "message": "Unauthorized"}), 403
-
-    start_date = request.args.get("start")
-    end_date = request.args.get("end")
-    field = (request.args.get("field") or "period").lower()
-
-    # choose column
-    col = LandlordExpense.ExpenseDate if field == "period" else LandlordExpense.ExpensePaymentDate
-
-    # parse dates
-    try:
-        start_dt = datetime.strptime(
-            start_date, "%Y-%m-%d") if start_date else None
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
-    except ValueError:
-        return jsonify({"status": "error", "message": "Dates must be YYYY-MM-DD."}), 400
-
-    q = LandlordExpense.query.join(Apartment)
-    if start_dt:
-        q = q.filter(col >= start_dt)
-    if end_dt:
-        q = q.filter(col <= end_dt)
-
-    expenses = q.all()
-    result = [{
-        "ExpenseID": exp.ExpenseID,
-        "Apartment": exp.apartment.ApartmentName,
-        "ExpenseType": exp.ExpenseType,
-        "Amount": float(exp.Amount or 0),
-        "Description": exp.Description,
-        "ExpenseDate": _fmt_date(exp.ExpenseDate),
-        "ExpensePaymentDate": _fmt_date(exp.ExpensePaymentDate),
-        "Payee": exp.Payee,
-        "PaymentMethod": exp.PaymentMethod,
-        "PaymentRef": exp.PaymentRef,
-    } for exp in expenses]
-
-    return jsonify({"status": "success", "expenses": result}), 200
+    return _expense_view("expenses")
 
 
 # -------------------------------
@@ -3619,35 +3906,7 @@ def filter_expenses():
 @routes.route("/landlord-expenses/unpaid", methods=["GET"])
 @jwt_required()
 def unpaid_expenses():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
-        return jsonify({"status": "error", "message": "Unauthorized"}), 403
-
-    expenses = (
-        LandlordExpense.query
-        .filter(
-            (LandlordExpense.ExpensePaymentDate == None) |
-            (func.nullif(LandlordExpense.PaymentRef, '') == None)
-        )
-        .join(Apartment)
-        .all()
-    )
-
-    result = [{
-        "ExpenseID": exp.ExpenseID,
-        "Apartment": exp.apartment.ApartmentName,
-        "ExpenseType": exp.ExpenseType,
-        "Amount": float(exp.Amount or 0),
-        "Description": exp.Description,
-        "ExpenseDate": _fmt_date(exp.ExpenseDate),
-        "ExpensePaymentDate": _fmt_date(exp.ExpensePaymentDate),
-        "Payee": exp.Payee,
-        "PaymentMethod": exp.PaymentMethod,
-        "PaymentRef": exp.PaymentRef,
-    } for exp in expenses]
-
-    return jsonify({"status": "success", "unpaid_expenses": result}), 200
+    return _expense_view("unpaid_expenses", unpaid=True)
 
 
 @routes.route("/upload", methods=["POST"])
@@ -4089,6 +4348,11 @@ def update_tenant(tenant_id):
 @routes.route('/tenants/<int:tenant_id>/statement', methods=['GET'])
 @jwt_required()
 def tenant_statement(tenant_id):
+    """
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD   inclusive, filtered in SQL
+    &format=json|csv|pdf             csv/pdf download the full ledger
+    &page=1&limit=100                pages the JSON ledger (omit for all)
+    """
     user_id = get_jwt_identity()
     t = Tenant.query.get(tenant_id)
     if not t:
@@ -4098,43 +4362,46 @@ def tenant_statement(tenant_id):
     if not a or a.UserID != user_id:
         return jsonify({"message": "Unauthorized"}), 403
 
-    # optional date filters
-    start = request.args.get("from")
-    end = request.args.get("to")
-
-    def in_range(dt):
-        if start and dt.date() < datetime.strptime(start, "%Y-%m-%d").date():
-            return False
-        if end and dt.date() > datetime.strptime(end, "%Y-%m-%d").date():
-            return False
-        return True
-
-    bills = []
-    for b in TenantBill.query.filter_by(TenantID=tenant_id).order_by(TenantBill.IssuedDate.asc()).all():
-        if in_range(b.IssuedDate):
-            bills.append({
-                "Issued": b.IssuedDate.strftime("%Y-%m-%d"),
-                "BillingMonth": b.BillingMonth,
-                "TotalAmountDue": b.TotalAmountDue,
-                "Status": b.BillStatus
-            })
-
-    pays = []
-    for p in RentPayment.query.filter_by(TenantID=tenant_id).order_by(RentPayment.PaymentDate.asc()).all():
-        if in_range(p.PaymentDate):
-            pays.append({
-                "Date": p.PaymentDate.strftime("%Y-%m-%d %H:%M:%S"),
-                "BillingMonth": p.BillingMonth,
-                "AmountPaid": p.AmountPaid,
-                "Method": p.PaidViaMobile,
-                "BalanceAfter": p.Balance
-            })
+    try:
+        d_from = datetime.strptime(request.args["from"], "%Y-%m-%d").date() if request.args.get("from") else None
+        d_to = datetime.strptime(request.args["to"], "%Y-%m-%d").date() if request.args.get("to") else None
+    except ValueError:
+        return jsonify({"message": "Dates must be YYYY-MM-DD."}), 400
+    fmt = (request.args.get("format") or "json").lower()
+
+    statement = build_tenant_statement(tenant_id, d_from, d_to)
+    period = f"{d_from or 'start'}_to_{d_to or date.today()}"
+
+    if fmt == "csv":
+        return csv_response(f"statement_{tenant_id}_{period}.csv",
+                            LEDGER_HEADER, ledger_rows(statement))
+    if fmt == "pdf":
+        if not pdf_available():
+            return jsonify({"message": "PDF statements are not available on this server."}), 501
+        pdf = render_statement_pdf(
+            statement, f"Statement — {t.FullName}",
+            f"{a.ApartmentName} · {u.Label} · {d_from or 'start'} to {d_to or date.today()}")
+        return Response(pdf, mimetype="application/pdf", headers={
+            "Content-Disposition": f"attachment; filename=statement_{tenant_id}_{period}.pdf"})
+
+    ledger = statement["Ledger"]
+    page = limit = None
+    if request.args.get("page") or request.args.get("limit"):
+        page = max(request.args.get("page", default=1, type=int), 1)
+        limit = min(max(request.args.get("limit", default=100, type=int), 1), 500)
+        ledger = ledger[(page - 1) * limit: page * limit]
 
     return jsonify({
         "Tenant": {"TenantID": t.TenantID, "FullName": t.FullName},
         "Apartment": a.ApartmentName if a else None,
         "Unit": u.Label if u else None,
-        "Bills": bills, "Payments": pays
+        "Bills": statement["Bills"], "Payments": statement["Payments"],
+        "OpeningBalance": statement["OpeningBalance"],
+        "TotalBilled": statement["TotalBilled"],
+        "TotalPaid": statement["TotalPaid"],
+        "ClosingBalance": statement["ClosingBalance"],
+        "Ledger": ledger,
+        "page": page, "limit": limit, "total": len(statement["Ledger"])
     }), 200
 
 # Reminders (SMS/Email logging)
@@ -4177,29 +4444,56 @@ def remind_tenant(tenant_id):
 
     return jsonify({"message": "✅ Reminder sent"}), 200
 
-# # Vacant units helper for onboarding
+# Vacant units helper for onboarding
 
 
-# @routes.route('/units/vacant', methods=['GET'])
-# @jwt_required()
-# def list_vacant_units():
-#     user_id = get_jwt_identity()
-#     apt_id = request.args.get('apartment_id', type=int)
-#     q = (RentalUnit.query
-#          .join(Apartment, RentalUnit.ApartmentID == Apartment.ApartmentID)
-#          .filter(Apartment.UserID == user_id))
-#     if apt_id:
-#         q = q.filter(RentalUnit.ApartmentID == apt_id)
-
-#     # use status name if you adopt name-based check
-#     vacant_id = get_status_id("Vacant")
-#     units = q.filter(RentalUnit.StatusID == vacant_id).order_by(
-#         RentalUnit.ApartmentID.asc()).all()
-
-#     return jsonify([{
-#         "UnitID": u.UnitID, "Label": u.Label, "ApartmentID": u.ApartmentID,
-#         "Rent": u.MonthlyRent
-#     } for u in units]), 200
+@routes.route('/units/vacant', methods=['GET'])
+@jwt_required()
+def list_vacant_units():
+    """
+    The landlord's vacant units grouped per apartment, with counts.
+      ?apartment_id=  one apartment
+      ?counts_only=1  per-apartment counts without the unit lists
+    Seeks ix_units_apartment_status with the cached apartment IDs; no joins.
+    """
+    user_id = get_jwt_identity()
+    apt_id = request.args.get('apartment_id', type=int)
+    counts_only = request.args.get('counts_only', '').lower() in ('1', 'true', 'yes')
+
+    scope = landlord_scope(user_id, apt_id)
+    if apt_id and not scope.apartment_ids:
+        return jsonify({"message": "Apartment not found."}), 404
+
+    vacant = status_id(VACANT)
+    filters = (RentalUnit.ApartmentID.in_(list(scope.apartment_ids)),
+               RentalUnit.StatusID == vacant)
+    units, counts = {a: [] for a in scope.apartment_ids}, dict.fromkeys(scope.apartment_ids, 0)
+    if scope.apartment_ids and counts_only:
+        counts.update(db.session.query(RentalUnit.ApartmentID, func.count())
+                      .filter(*filters).group_by(RentalUnit.ApartmentID).all())
+    elif scope.apartment_ids:
+        rows = (db.session.query(RentalUnit.UnitID, RentalUnit.ApartmentID, RentalUnit.Label,
+                                 RentalUnit.MonthlyRent, RentalUnit.CategoryID)
+                .filter(*filters)
+                .order_by(RentalUnit.ApartmentID, RentalUnit.Label).all())
+        for r in rows:
+            units[r.ApartmentID].append({"UnitID": r.UnitID, "Label": r.Label,
+                                         "ApartmentID": r.ApartmentID, "Rent": r.MonthlyRent,
+                                         "CategoryID": r.CategoryID})
+            counts[r.ApartmentID] += 1
+
+    apartments = []
+    for a in sorted(scope.apartment_ids, key=lambda a: (scope.apartment_name.get(a) or "", a)):
+        item = {"ApartmentID": a, "ApartmentName": scope.apartment_name.get(a),
+                "VacantUnits": int(counts[a])}
+        if not counts_only:
+            item["Units"] = units[a]
+        apartments.append(item)
+
+    return jsonify({
+        "total_vacant": sum(int(c) for c in counts.values()),
+        "apartments": apartments
+    }), 200
 
 # Alerts for the dashboard toolbar
 
@@ -4208,25 +4502,19 @@ def remind_tenant(tenant_id):
 @jwt_required()
 def tenant_alerts():
     user_id = get_jwt_identity()
-    # landlord units
-    apartment_ids = [
-        a.ApartmentID for a in Apartment.query.filter_by(UserID=user_id).all()]
-    unit_ids = [u.UnitID for u in RentalUnit.query.filter(
-        RentalUnit.ApartmentID.in_(apartment_ids)).all()]
-
     # due within next 7 days
     now = datetime.utcnow()
     # simplistic: end of month or use +7d
     future = datetime(now.year, now.month, 28)
     due_soon = TenantBill.query.filter(
-        TenantBill.RentalUnitID.in_(unit_ids),
+        landlord_owned(TenantBill, user_id),
         TenantBill.DueDate <= future,
         TenantBill.BillStatus.in_(["Unpaid", "Partially Paid"])
     ).count()
 
     # vacating soon
     vacating_soon = VacateNotice.query.filter(
-        VacateNotice.RentalUnitID.in_(unit_ids),
+        unit_owned(VacateNotice.RentalUnitID, user_id),
         VacateNotice.Status == 'Pending',
         VacateNotice.ExpectedVacateDate >= now.date()
     ).count()
@@ -4353,8 +4641,8 @@ def billing_cashflow():
             return fallback
 
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
     today = date.today()
@@ -4363,19 +4651,12 @@ def billing_cashflow():
     if d_to < d_from:
         d_from, d_to = d_to, d_from
 
-    # landlord scope -> apartments -> units
-    apartments = Apartment.query.filter_by(UserID=user_id).all()
-    apt_ids = [a.ApartmentID for a in apartments]
-    units = RentalUnit.query.filter(RentalUnit.ApartmentID.in_(apt_ids)).all()
-    unit_ids = [u.UnitID for u in units]
-
     # time boundaries (inclusive end)
-    start_dt = datetime.combine(d_from, datetime.min.time())
-    end_dt = datetime.combine(d_to + timedelta(days=1), datetime.min.time())
+    start_dt, end_dt = day_bounds(d_from, d_to)
 
     # Collected: payments in date window
     payments = (RentPayment.query
-                .filter(RentPayment.RentalUnitID.in_(unit_ids),
+                .filter(landlord_owned(RentPayment, user_id),
                         RentPayment.PaymentDate >= start_dt,
                         RentPayment.PaymentDate < end_dt)
                 .all())
@@ -4387,7 +4668,7 @@ def billing_cashflow():
 
     # Billed: bills issued in window (use IssuedDate for generation day)
     bills = (TenantBill.query
-             .filter(TenantBill.RentalUnitID.in_(unit_ids),
+             .filter(landlord_owned(TenantBill, user_id),
                      TenantBill.IssuedDate >= start_dt,
                      TenantBill.IssuedDate < end_dt)
              .all())
@@ -4418,6 +4699,49 @@ def billing_cashflow():
         "totals": {"billed": float(tot_billed), "collected": float(tot_collected)}
     }), 200
 
+# ---- /reports/noi -----------------------------------------------------------
+@routes.route("/reports/noi", methods=["GET"])
+@jwt_required()
+def noi_report_view():
+    """
+    Net operating income per apartment per month.
+      ?from=2025-01&to=2025-12   (months; 'January 2025' also accepted;
+                                  default: the last 12 months)
+      &apartment_id=
+    Collected is by payment date, Billed by billing month, Expenses by
+    expense date; NOI = Collected - Expenses.
+    """
+    user_id = get_jwt_identity()
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
+        return jsonify({"status": "error", "message": "Unauthorized access."}), 403
+
+    current = date.today().replace(day=1)
+    from_in, to_in = request.args.get("from"), request.args.get("to")
+    last = month_period(to_in) if to_in else current
+    first = month_period(from_in) if from_in else (
+        date(last.year - (last.month < 12), last.month % 12 + 1, 1) if last else None)
+    if not first or not last:
+        return jsonify({"status": "error", "message": "Invalid month. Use 'July 2025' or '2025-07'."}), 400
+    if last < first:
+        first, last = last, first
+    if (last.year - first.year) * 12 + last.month - first.month + 1 > NOI_MAX_MONTHS:
+        return jsonify({"status": "error",
+                        "message": f"Range is limited to {NOI_MAX_MONTHS} months."}), 400
+
+    apartment_id = request.args.get("apartment_id", type=int)
+    scope = landlord_scope(user_id)
+    if apartment_id:
+        if apartment_id not in scope.apartment_ids:
+            return jsonify({"status": "error", "message": "Apartment not found."}), 404
+        apartments = {apartment_id: scope.apartment_name.get(apartment_id)}
+    else:
+        apartments = {a: scope.apartment_name.get(a) for a in sorted(scope.apartment_ids)}
+
+    report = noi_report(user_id, first, last, apartments)
+    return jsonify({"status": "success", "from": first.strftime("%Y-%m"),
+                    "to": last.strftime("%Y-%m"), **report}), 200
+
 # ---- /billing/arrears -------------------------------------------------------
 
 
@@ -4433,18 +4757,15 @@ def billing_arrears():
     from decimal import Decimal
 
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or not user.IsAdmin:
+    landlord = current_landlord()
+    if not landlord or not landlord.is_landlord:
         return jsonify({"status": "error", "message": "Unauthorized access."}), 403
 
     # landlord scope
-    apartments = Apartment.query.filter_by(UserID=user_id).all()
-    apt_ids = [a.ApartmentID for a in apartments]
-    units = RentalUnit.query.filter(RentalUnit.ApartmentID.in_(apt_ids)).all()
-    unit_ids = [u.UnitID for u in units]
+    scope = landlord_scope(user_id)
 
     bills = (TenantBill.query
-             .filter(TenantBill.RentalUnitID.in_(unit_ids))
+             .filter(landlord_owned(TenantBill, user_id))
              .order_by(TenantBill.BillID.asc())
              .all())
 
@@ -4455,13 +4776,12 @@ def billing_arrears():
             Decimal(b.TotalAmountDue or 0), paid)
         if balance > 0:
             tenant = Tenant.query.get(b.TenantID)
-            unit = RentalUnit.query.get(b.RentalUnitID)
-            apt = Apartment.query.get(unit.ApartmentID) if unit else None
+            apt_id = scope.unit_apartment.get(b.RentalUnitID)
             items.append({
                 "BillID": b.BillID,
                 "TenantName": tenant.FullName if tenant else "Unknown",
-                "ApartmentName": apt.ApartmentName if apt else "Unknown",
-                "UnitLabel": unit.Label if unit else "Unknown",
+                "ApartmentName": scope.apartment_name.get(apt_id, "Unknown"),
+                "UnitLabel": scope.unit_label.get(b.RentalUnitID, "Unknown"),
                 "BillingMonth": b.BillingMonth,
                 "TotalAmountDue": float(b.TotalAmountDue or 0),
                 "PaidToDate": float(paid),
@@ -0,0 +1,167 @@
+# backend/utils/activity_helper.py
+
+from datetime import datetime
+
+from sqlalchemy import and_, exists, insert, or_
+from sqlalchemy.orm import aliased
+
+from models.models import (
+    db, Apartment, RentalUnit, Tenant, TransferLog, VacateLog, ActivityEvent
+)
+from utils.search_helper import search_criterion, invalidate_trigram_index
+from utils.date_helper import month_range
+
+EVENT_TRANSFER = "transfer"
+EVENT_VACATE = "vacate"
+
+BACKFILL_BATCH = 1000
+
+
+def search_text(*parts) -> str:
+    return " ".join(p for p in parts if p).lower()[:1000]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Writers (call right after adding the log; caller commits)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def record_transfer(log: TransferLog, landlord_id: int, tenant_name: str | None,
+                    old_unit: RentalUnit | None, new_unit: RentalUnit) -> ActivityEvent:
+    if log.LogID is None:
+        db.session.flush()
+    event = ActivityEvent(
+        LandlordID=landlord_id,
+        EventType=EVENT_TRANSFER,
+        SourceLogID=log.LogID,
+        ApartmentID=new_unit.ApartmentID,
+        FromApartmentID=old_unit.ApartmentID if old_unit else None,
+        UnitID=new_unit.UnitID,
+        FromUnitID=old_unit.UnitID if old_unit else None,
+        TenantID=log.TenantID,
+        Reason=log.Reason,
+        OccurredAt=log.TransferDate or datetime.utcnow(),
+        SearchText=search_text(log.Reason, tenant_name,
+                                old_unit.Label if old_unit else None, new_unit.Label),
+    )
+    db.session.add(event)
+    return event
+
+
+def record_vacate(log: VacateLog, landlord_id: int, tenant_name: str | None,
+                  unit: RentalUnit) -> ActivityEvent:
+    if log.LogID is None:
+        db.session.flush()
+    event = ActivityEvent(
+        LandlordID=landlord_id,
+        EventType=EVENT_VACATE,
+        SourceLogID=log.LogID,
+        ApartmentID=log.ApartmentID,
+        UnitID=log.UnitID,
+        TenantID=log.TenantID,
+        Reason=log.Reason,
+        Notes=log.Notes,
+        OccurredAt=log.VacateDate or datetime.utcnow(),
+        SearchText=search_text(log.Reason, log.Notes, tenant_name,
+                                unit.Label if unit else None),
+    )
+    db.session.add(event)
+    return event
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────────────────────────────────────
+
+def activity_query(user_id: int, apartment_id: int | None = None,
+                   event_type: str | None = None, year: int | None = None,
+                   month: int | None = None, search: str | None = None):
+    """
+    Landlord-scoped ActivityEvent query. A transfer matches an apartment
+    filter if either side of it is in that apartment.
+    """
+    q = ActivityEvent.query.filter(ActivityEvent.LandlordID == user_id)
+    if apartment_id:
+        q = q.filter(or_(ActivityEvent.ApartmentID == apartment_id,
+                         ActivityEvent.FromApartmentID == apartment_id))
+    if event_type in (EVENT_TRANSFER, EVENT_VACATE):
+        q = q.filter(ActivityEvent.EventType == event_type)
+    window = month_range(ActivityEvent.OccurredAt, year, month)
+    if window is not None:
+        q = q.filter(window)
+    if search:
+        criterion = search_criterion("activity", search, user_id)
+        if criterion is not None:
+            q = q.filter(criterion)
+    return q
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Backfill
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _flush_rows(rows: list) -> int:
+    if rows:
+        db.session.execute(insert(ActivityEvent), rows)
+    n = len(rows)
+    rows.clear()
+    return n
+
+
+def backfill_activity_events() -> int:
+    """
+    Create ActivityEvent rows for TransferLog / VacateLog rows that have none.
+    Idempotent; inserts in batches of BACKFILL_BATCH. Returns rows inserted.
+    """
+    inserted, rows = 0, []
+    old_u, new_u = aliased(RentalUnit), aliased(RentalUnit)
+
+    transfers = (db.session.query(TransferLog, Tenant.FullName,
+                                  old_u.Label, old_u.ApartmentID,
+                                  new_u.Label, new_u.ApartmentID, Apartment.UserID)
+                 .join(new_u, new_u.UnitID == TransferLog.NewUnitID)
+                 .join(Apartment, Apartment.ApartmentID == new_u.ApartmentID)
+                 .outerjoin(old_u, old_u.UnitID == TransferLog.OldUnitID)
+                 .outerjoin(Tenant, Tenant.TenantID == TransferLog.TenantID)
+                 .filter(Apartment.UserID.isnot(None))
+                 .filter(~exists().where(and_(
+                     ActivityEvent.EventType == EVENT_TRANSFER,
+                     ActivityEvent.SourceLogID == TransferLog.LogID)))
+                 .all())
+    for t, name, old_label, old_apt, new_label, new_apt, owner in transfers:
+        rows.append({
+            "LandlordID": owner, "EventType": EVENT_TRANSFER, "SourceLogID": t.LogID,
+            "ApartmentID": new_apt, "FromApartmentID": old_apt,
+            "UnitID": t.NewUnitID, "FromUnitID": t.OldUnitID,
+            "TenantID": t.TenantID, "Reason": t.Reason, "Notes": None,
+            "OccurredAt": t.TransferDate or datetime.utcnow(),
+            "SearchText": search_text(t.Reason, name, old_label, new_label),
+        })
+        if len(rows) >= BACKFILL_BATCH:
+            inserted += _flush_rows(rows)
+
+    vacates = (db.session.query(VacateLog, Tenant.FullName, RentalUnit.Label, Apartment.UserID)
+               .join(Apartment, Apartment.ApartmentID == VacateLog.ApartmentID)
+               .outerjoin(RentalUnit, RentalUnit.UnitID == VacateLog.UnitID)
+               .outerjoin(Tenant, Tenant.TenantID == VacateLog.TenantID)
+               .filter(Apartment.UserID.isnot(None))
+               .filter(~exists().where(and_(
+                   ActivityEvent.EventType == EVENT_VACATE,
+                   ActivityEvent.SourceLogID == VacateLog.LogID)))
+               .all())
+    for v, name, label, owner in vacates:
+        rows.append({
+            "LandlordID": owner, "EventType": EVENT_VACATE, "SourceLogID": v.LogID,
+            "ApartmentID": v.ApartmentID, "FromApartmentID": None,
+            "UnitID": v.UnitID, "FromUnitID": None,
+            "TenantID": v.TenantID, "Reason": v.Reason, "Notes": v.Notes,
+            "OccurredAt": v.VacateDate or datetime.utcnow(),
+            "SearchText": search_text(v.Reason, v.Notes, name, label),
+        })
+        if len(rows) >= BACKFILL_BATCH:
+            inserted += _flush_rows(rows)
+
+    inserted += _flush_rows(rows)
+    db.session.commit()
+    if inserted:
+        invalidate_trigram_index("activity")  # Core inserts skip ORM events
+    return inserted
@@ -0,0 +1,69 @@
+# backend/utils/alerts_helper.py
+#
+# Repeat-transfer alerts: tenants moved more than `threshold` times within
+# the last `months` months. One GROUP BY ... HAVING over ActivityEvents
+# (ix_activity_landlord_type_time), joined to tenant names after grouping.
+# refresh_transfer_alerts() materializes the default window into
+# TransferAlerts for every landlord; run it nightly:
+#
+#   flask --app app refresh-alerts
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, or_
+
+from models.models import db, Tenant, ActivityEvent, TransferAlert
+from utils.activity_helper import EVENT_TRANSFER
+
+DEFAULT_MONTHS = 6
+DEFAULT_THRESHOLD = 2
+
+
+def window_start(months: int) -> datetime:
+    return datetime.utcnow() - timedelta(days=30 * months)
+
+
+def repeat_transfers(months: int = DEFAULT_MONTHS, threshold: int = DEFAULT_THRESHOLD,
+                     user_id: int | None = None, apartment_id: int | None = None):
+    """
+    Rows of (LandlordID, TenantID, TenantName, TransfersInPeriod, LastTransfer),
+    newest LastTransfer first. user_id=None covers every landlord.
+    """
+    n = func.count(ActivityEvent.EventID)
+    grouped = (db.session.query(ActivityEvent.LandlordID.label("LandlordID"),
+                                ActivityEvent.TenantID.label("TenantID"),
+                                n.label("TransfersInPeriod"),
+                                func.max(ActivityEvent.OccurredAt).label("LastTransfer"))
+               .filter(ActivityEvent.EventType == EVENT_TRANSFER,
+                       ActivityEvent.OccurredAt >= window_start(months)))
+    if user_id is not None:
+        grouped = grouped.filter(ActivityEvent.LandlordID == user_id)
+    if apartment_id:
+        grouped = grouped.filter(or_(ActivityEvent.ApartmentID == apartment_id,
+                                     ActivityEvent.FromApartmentID == apartment_id))
+    grouped = (grouped.group_by(ActivityEvent.LandlordID, ActivityEvent.TenantID)
+               .having(n > threshold)
+               .subquery())
+
+    return (db.session.query(grouped.c.LandlordID, grouped.c.TenantID,
+                             Tenant.FullName, grouped.c.TransfersInPeriod,
+                             grouped.c.LastTransfer)
+            .outerjoin(Tenant, Tenant.TenantID == grouped.c.TenantID)
+            .order_by(grouped.c.LastTransfer.desc())
+            .all())
+
+
+def refresh_transfer_alerts(months: int = DEFAULT_MONTHS,
+                            threshold: int = DEFAULT_THRESHOLD) -> int:
+    """Replace TransferAlerts with the current flags in one transaction."""
+    now = datetime.utcnow()
+    rows = [{"LandlordID": landlord_id, "TenantID": tenant_id, "TenantName": name,
+             "TransfersInPeriod": count, "LastTransfer": last,
+             "WindowMonths": months, "Threshold": threshold, "ComputedAt": now}
+            for landlord_id, tenant_id, name, count, last
+            in repeat_transfers(months, threshold)]
+    db.session.execute(delete(TransferAlert))
+    if rows:
+        db.session.execute(insert(TransferAlert), rows)
+    db.session.commit()
+    return len(rows)
@@ -0,0 +1,142 @@
+# backend/utils/apartment_helper.py
+#
+# Apartment detail and unit listing from one flat, column-only query:
+#
+#   Apartments LEFT JOIN RentalUnits LEFT JOIN UnitCategories
+#     [LEFT JOIN Tenants      ON TenantID = RentalUnits.CurrentTenantID]    include=tenant
+#     [LEFT JOIN TenantBills  ON (TenantID, BillingPeriod = this month)]    include=bill
+#
+# Status names come from the unit status registry, so RentalUnitStatuses is
+# never joined, and nothing is lazy-loaded per unit. Occupancy counts
+# (include=occupancy) are tallied from the same rows.
+
+from datetime import date
+
+from sqlalchemy import and_, select
+
+from models.models import db, Apartment, RentalUnit, UnitCategory, Tenant, TenantBill
+from utils.unit_status_helper import status_name, VACANT, OCCUPIED, RESERVED
+
+INCLUDES = ("occupancy", "tenant", "bill")
+
+
+def parse_includes(raw: str | None) -> frozenset:
+    """'tenant,bill' / 'all' -> frozenset of INCLUDES; unknown names are ignored."""
+    parts = {p.strip().lower() for p in (raw or "").split(",") if p.strip()}
+    if "all" in parts:
+        return frozenset(INCLUDES)
+    return frozenset(parts & set(INCLUDES))
+
+
+def _fmt(d, with_time=False):
+    if not d:
+        return None
+    return d.strftime('%Y-%m-%d %H:%M:%S' if with_time else '%Y-%m-%d')
+
+
+def _rows(apartment_id: int, include: frozenset, period: date):
+    cols = [Apartment.ApartmentID, Apartment.ApartmentName, Apartment.Location,
+            Apartment.Description.label("ApartmentDescription"),
+            Apartment.CreatedAt.label("ApartmentCreatedAt"), Apartment.UserID,
+            RentalUnit.UnitID, RentalUnit.Label, RentalUnit.Description, RentalUnit.MonthlyRent,
+            RentalUnit.StatusID, RentalUnit.CategoryID, RentalUnit.CurrentTenantID,
+            RentalUnit.CreatedAt, UnitCategory.CategoryName]
+    if "tenant" in include:
+        cols += [Tenant.FullName, Tenant.PhoneE164, Tenant.MoveInDate]
+    if "bill" in include:
+        cols += [TenantBill.BillID, TenantBill.BillingMonth, TenantBill.TotalAmountDue,
+                 TenantBill.DueDate, TenantBill.BillStatus]
+
+    q = (select(*cols)
+         .outerjoin(RentalUnit, RentalUnit.ApartmentID == Apartment.ApartmentID)
+         .outerjoin(UnitCategory, UnitCategory.CategoryID == RentalUnit.CategoryID))
+    if "tenant" in include:
+        q = q.outerjoin(Tenant, Tenant.TenantID == RentalUnit.CurrentTenantID)
+    if "bill" in include:
+        # seeks ix_tenantbills_tenant_period
+        q = q.outerjoin(TenantBill, and_(TenantBill.TenantID == RentalUnit.CurrentTenantID,
+                                         TenantBill.BillingPeriod == period))
+    q = q.where(Apartment.ApartmentID == apartment_id).order_by(RentalUnit.UnitID)
+    if "bill" in include:
+        q = q.order_by(TenantBill.BillID.desc())
+    return db.session.execute(q).all()
+
+
+def _unit(r, include: frozenset) -> dict:
+    unit = {
+        "UnitID": r.UnitID,
+        "Label": r.Label,
+        "Description": r.Description,
+        "MonthlyRent": r.MonthlyRent,
+        "StatusID": r.StatusID,
+        "Status": status_name(r.StatusID),
+        "CategoryID": r.CategoryID,
+        "Category": r.CategoryName,
+        "CreatedAt": _fmt(r.CreatedAt, with_time=True),
+    }
+    if "tenant" in include:
+        unit["CurrentTenant"] = {
+            "TenantID": r.CurrentTenantID,
+            "FullName": r.FullName,
+            "Phone": r.PhoneE164,
+            "MoveInDate": _fmt(r.MoveInDate),
+        } if r.CurrentTenantID else None
+    if "bill" in include:
+        unit["CurrentBill"] = {
+            "BillID": r.BillID,
+            "BillingMonth": r.BillingMonth,
+            "TotalAmountDue": r.TotalAmountDue,
+            "DueDate": _fmt(r.DueDate),
+            "BillStatus": r.BillStatus,
+        } if r.BillID else None
+    return unit
+
+
+def occupancy(units: list[dict]) -> dict:
+    """Same shape as the Stats block of /myapartments."""
+    total = len(units)
+    by_status = {}
+    for u in units:
+        by_status[u["Status"]] = by_status.get(u["Status"], 0) + 1
+    vacant = by_status.get(VACANT, 0)
+    return {
+        "TotalUnits": total,
+        "OccupiedUnits": by_status.get(OCCUPIED, 0),
+        "VacantUnits": vacant,
+        "ReservedUnits": by_status.get(RESERVED, 0),
+        "VacancyRate": round((vacant / total) * 100, 1) if total else 0.0,
+    }
+
+
+def apartment_detail(apartment_id: int, include: frozenset = frozenset(),
+                     period: date | None = None):
+    """
+    (owner UserID, detail dict) for the apartment, or (None, None) if it does
+    not exist. include: subset of INCLUDES. period: bill month (default: this
+    month).
+    """
+    period = period or date.today().replace(day=1)
+    rows = _rows(apartment_id, include, period)
+    if not rows:
+        return None, None
+
+    first, units, seen = rows[0], [], set()
+    for r in rows:
+        if r.UnitID is None or r.UnitID in seen:   # no units / extra bills for the month
+            continue
+        seen.add(r.UnitID)
+        units.append(_unit(r, include))
+
+    detail = {
+        "ApartmentID": first.ApartmentID,
+        "ApartmentName": first.ApartmentName,
+        "Location": first.Location,
+        "Description": first.ApartmentDescription,
+        "CreatedAt": _fmt(first.ApartmentCreatedAt, with_time=True),
+        "RentalUnits": units,
+    }
+    if "occupancy" in include:
+        detail["Stats"] = occupancy(units)
+    if "bill" in include:
+        detail["BillingPeriod"] = period.strftime("%Y-%m")
+    return first.UserID, detail
@@ -0,0 +1,70 @@
+# backend/utils/auth_helper.py
+
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+from models.models import User
+
+
+def landlord_claims(user: User) -> dict:
+    """
+    Role flags embedded in the access token at login so that
+    routes can authorize without re-reading the Users row.
+    """
+    return {
+        "is_admin": bool(user.IsAdmin),
+        "is_active": bool(user.IsActive),
+    }
+
+
+class Landlord:
+    """
+    Lightweight authenticated principal built from JWT claims.
+    The full User row is only loaded when `.user` is accessed.
+    """
+    __slots__ = ("UserID", "IsAdmin", "IsActive", "_user")
+
+    def __init__(self, user_id: int, is_admin: bool, is_active: bool, user: User | None = None):
+        self.UserID = user_id
+        self.IsAdmin = bool(is_admin)
+        self.IsActive = bool(is_active)
+        self._user = user
+
+    @property
+    def is_landlord(self) -> bool:
+        return self.IsAdmin and self.IsActive
+
+    @property
+    def user(self) -> User | None:
+        if self._user is None:
+            self._user = User.query.get(self.UserID)
+        return self._user
+
+    def __repr__(self):
+        return f"<Landlord UserID={self.UserID} IsAdmin={self.IsAdmin} IsActive={self.IsActive}>"
+
+
+def current_landlord() -> Landlord | None:
+    """
+    Resolve the caller once per request (memoized on flask.g).
+    Tokens issued before claims were embedded fall back to a single DB lookup.
+    Must be called inside a @jwt_required() route.
+    """
+    claims = get_jwt()
+    cached = g.get("current_landlord")
+    if cached and cached[0] == claims.get("jti"):
+        return cached[1]
+
+    user_id = get_jwt_identity()
+    landlord = None
+
+    if "is_admin" in claims and "is_active" in claims:
+        landlord = Landlord(user_id, claims["is_admin"], claims["is_active"])
+    else:
+        user = User.query.get(user_id)
+        if user:
+            landlord = Landlord(user.UserID, user.IsAdmin,
+                                user.IsActive, user=user)
+
+    g.current_landlord = (claims.get("jti"), landlord)
+    return landlord
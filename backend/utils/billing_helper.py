@@ -1,6 +1,11 @@
-from models.models import db, Tenant, RentalUnit, TenantBill, RentPayment
+from models.models import db, Tenant, RentalUnit, TenantBill, RentPayment, billing_period_for
 from datetime import date
 
+from sqlalchemy import bindparam, event, func, inspect, select, text, update
+
+# model -> its canonical first-of-month column
+PERIOD_COLUMNS = {TenantBill: "BillingPeriod", RentPayment: "IntendedBillingPeriod"}
+
 
 def calculate_bill_amount(tenant_id: int, base_rent: float,
                           water=0.0, electricity=0.0, garbage=0.0, internet=0.0):
@@ -24,3 +29,89 @@ def calculate_bill_amount(tenant_id: int, base_rent: float,
     )
 
     return max(total_due, 0.0), carried_balance
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Canonical billing period: mandatory on every ORM write
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _require_period(mapper, connection, target):
+    """
+    Derive the period from BillingMonth (again whenever the label changes)
+    and refuse to write a row without one. Routes reject unparseable months
+    with a 400 before they get here.
+    """
+    col = PERIOD_COLUMNS[type(target)]
+    if getattr(target, col) is None or inspect(target).attrs.BillingMonth.history.has_changes():
+        setattr(target, col, billing_period_for(target.BillingMonth))
+    if getattr(target, col) is None:
+        raise ValueError(
+            f"BillingMonth '{target.BillingMonth}' is not a month (use 'July 2025' or '2025-07').")
+
+
+for _model in PERIOD_COLUMNS:
+    event.listen(_model, "before_insert", _require_period)
+    event.listen(_model, "before_update", _require_period)
+
+
+def backfill_billing_periods() -> int:
+    """
+    Fill BillingPeriod / IntendedBillingPeriod from the BillingMonth labels.
+    Labels repeat (one per month), so each distinct label is parsed once and
+    applied with a single executemany UPDATE per table. Idempotent.
+    """
+    updated = 0
+    for model, col_name in PERIOD_COLUMNS.items():
+        table = model.__table__
+        col = table.c[col_name]
+        labels = db.session.execute(
+            select(table.c.BillingMonth).where(col.is_(None)).distinct()
+        ).scalars().all()
+        params = [{"_label": label, "_period": billing_period_for(label)}
+                  for label in labels if billing_period_for(label)]
+        if not params:
+            continue
+        stmt = (update(table)
+                .where(col.is_(None), table.c.BillingMonth == bindparam("_label"))
+                .values({col_name: bindparam("_period")}))
+        updated += max(db.session.execute(stmt, params).rowcount or 0, 0)
+    db.session.commit()
+    return updated
+
+
+def require_billing_periods(engine) -> tuple[list[str], dict]:
+    """
+    Make BillingPeriod / IntendedBillingPeriod NOT NULL on a live database,
+    once backfill_billing_periods() has filled them. Returns (columns
+    altered, {column: rows still NULL}); a column with NULL rows (labels
+    that are not months) is left alone until those rows are fixed.
+    SQLite cannot alter columns; create_all builds them NOT NULL there.
+    """
+    dialect = engine.dialect.name
+    altered, blocked = [], {}
+    if dialect not in ("postgresql", "mssql"):
+        return altered, blocked
+    for model, col_name in PERIOD_COLUMNS.items():
+        table = model.__table__
+        name = f"{table.name}.{col_name}"
+        nullable = {c["name"]: c["nullable"] for c in inspect(engine).get_columns(table.name)}
+        if not nullable.get(col_name):
+            continue
+        with engine.begin() as conn:
+            missing = conn.execute(
+                select(func.count()).select_from(table).where(table.c[col_name].is_(None))).scalar()
+            if missing:
+                blocked[name] = missing
+                continue
+            if dialect == "postgresql":
+                conn.execute(text(f'ALTER TABLE "{table.name}" ALTER COLUMN "{col_name}" SET NOT NULL'))
+            else:
+                # SQL Server will not alter a column that an index covers
+                covering = [ix for ix in table.indexes if col_name in ix.columns]
+                for ix in covering:
+                    ix.drop(bind=conn, checkfirst=True)
+                conn.execute(text(f"ALTER TABLE [{table.name}] ALTER COLUMN [{col_name}] DATE NOT NULL"))
+                for ix in covering:
+                    ix.create(bind=conn, checkfirst=True)
+        altered.append(name)
+    return altered, blocked
@@ -0,0 +1,76 @@
+# backend/utils/date_helper.py
+#
+# Sargable date filters. Month and day windows are expressed as half-open
+# ranges on the raw column, [start, next_start), so an index on the column
+# can be seeked. Never wrap the column (extract / YEAR() / MONTH() /
+# CAST AS DATE) in a WHERE clause; see migrations/month_filter_bench.py.
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_
+
+# month_bounds() needs the following January to exist, so 9999 is out
+MIN_YEAR, MAX_YEAR = 1900, 9998
+
+
+def parse_month_any(month_str: str):
+    """
+    Accepts either 'YYYY-MM' or 'MMMM YYYY' (e.g., '2025-08' or 'August 2025').
+    Returns (year:int, month:int) or (None, None) if invalid/empty or the
+    year is outside MIN_YEAR..MAX_YEAR.
+    """
+    if not month_str:
+        return None, None
+    month_str = month_str.strip()
+    y = m = None
+    # try YYYY-MM
+    try:
+        y, m = (int(p) for p in month_str.split("-"))
+    except Exception:
+        # try 'MMMM YYYY'
+        try:
+            dt = datetime.strptime(month_str, "%B %Y")
+            y, m = dt.year, dt.month
+        except Exception:
+            return None, None
+    if not (MIN_YEAR <= y <= MAX_YEAR and 1 <= m <= 12):
+        return None, None
+    return y, m
+
+
+def month_period(month_str: str) -> date | None:
+    """First day of the month named by month_str (BillingPeriod equality)."""
+    y, m = parse_month_any(month_str)
+    return date(y, m, 1) if y else None
+
+
+def month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    """(first instant of the month, first instant of the next month)."""
+    start = datetime(year, month, 1)
+    return start, datetime(year + month // 12, month % 12 + 1, 1)
+
+
+def month_range(col, year: int | None, month: int | None):
+    """col within the month, or None when no month was given."""
+    if not (year and month):
+        return None
+    start, end = month_bounds(year, month)
+    return and_(col >= start, col < end)
+
+
+def day_bounds(d_from: date | None, d_to: date | None):
+    """Inclusive calendar days → half-open datetimes (either side may be None)."""
+    start = datetime.combine(d_from, datetime.min.time()) if d_from else None
+    end = datetime.combine(d_to + timedelta(days=1), datetime.min.time()) if d_to else None
+    return start, end
+
+
+def day_range(col, d_from: date | None, d_to: date | None):
+    """col within [d_from 00:00, d_to + 1 day), or None when both are open."""
+    start, end = day_bounds(d_from, d_to)
+    cond = []
+    if start:
+        cond.append(col >= start)
+    if end:
+        cond.append(col < end)
+    return and_(*cond) if cond else None
@@ -0,0 +1,166 @@
+# backend/utils/expense_helper.py
+#
+# Expense listing and summaries for one landlord. Every query joins
+# LandlordExpenses to Apartments and filters on Apartments.UserID, so a
+# landlord only ever sees their own expenses; summaries are summed with
+# GROUP BY instead of loading rows and adding them up in Python.
+#
+# expense_query() is the listing: the same scoped join, column-only, with the
+# apartment name selected alongside each expense (no per-row lazy loads).
+# /landlord-expenses pages it by (ExpenseDate, ExpenseID); the older grouped
+# and filtered views are projections of it.
+#
+# expense_summary(user_id, "month"|"year"|"apartment"|"type") runs one grouped
+# query for that dimension. expense_pivot() runs a single query grouped at the
+# finest grain (year, month, apartment, type) and rolls the four summaries up
+# from that result, for screens that show them together.
+
+from datetime import date
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import aliased
+
+from models.models import db, Apartment, LandlordExpense
+from utils.date_helper import day_range
+
+DIMENSIONS = ("month", "year", "apartment", "type")
+
+MONTH_NAMES = ("January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December")
+
+
+def _month_label(year, month) -> str:
+    return f"{MONTH_NAMES[int(month) - 1]} {int(year)}"
+
+
+def _filtered(q, apt, user_id: int, apartment_id: int | None = None,
+              expense_type: str | None = None, d_from: date | None = None,
+              d_to: date | None = None, field: str = "period", unpaid: bool = False):
+    q = (q.join(apt, apt.ApartmentID == LandlordExpense.ApartmentID)
+         .filter(apt.UserID == user_id))
+    if apartment_id:
+        q = q.filter(LandlordExpense.ApartmentID == apartment_id)
+    if expense_type:
+        q = q.filter(LandlordExpense.ExpenseType == expense_type)
+    col = LandlordExpense.ExpensePaymentDate if field == "paid" else LandlordExpense.ExpenseDate
+    window = day_range(col, d_from, d_to)
+    if window is not None:
+        q = q.filter(window)
+    if unpaid:
+        # no payment date OR empty ref
+        q = q.filter(or_(LandlordExpense.ExpensePaymentDate.is_(None),
+                         func.nullif(LandlordExpense.PaymentRef, "").is_(None)))
+    return q
+
+
+def _scoped(apt, columns, user_id: int, **filters):
+    q = (db.session.query(*columns, func.coalesce(func.sum(LandlordExpense.Amount), 0))
+         .select_from(LandlordExpense))
+    return _filtered(q, apt, user_id, **filters)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Listing
+# ──────────────────────────────────────────────────────────────────────────────
+
+def expense_query(user_id: int, **filters):
+    """
+    The landlord's expenses as column rows (apartment name joined in).
+    filters: apartment_id, expense_type, d_from, d_to (inclusive days),
+    field="period"|"paid" (which date the window applies to), unpaid.
+    Unordered; callers page it with keyset_page on (ExpenseDate, ExpenseID).
+    """
+    apt = aliased(Apartment)
+    q = db.session.query(
+        LandlordExpense.ExpenseID, LandlordExpense.ApartmentID,
+        apt.ApartmentName.label("ApartmentName"), LandlordExpense.ExpenseType,
+        LandlordExpense.Amount, LandlordExpense.Description,
+        LandlordExpense.ExpenseDate, LandlordExpense.ExpensePaymentDate,
+        LandlordExpense.Payee, LandlordExpense.PaymentMethod, LandlordExpense.PaymentRef)
+    return _filtered(q.select_from(LandlordExpense), apt, user_id, **filters)
+
+
+def _d(d):
+    return d.strftime("%Y-%m-%d") if d else None
+
+
+def expense_item(row) -> dict:
+    return {
+        "ExpenseID": row.ExpenseID,
+        "ApartmentID": row.ApartmentID,
+        "Apartment": row.ApartmentName,
+        "ExpenseType": row.ExpenseType,
+        "Amount": float(row.Amount or 0),
+        "Description": row.Description,
+        "ExpenseDate": _d(row.ExpenseDate),
+        "ExpensePaymentDate": _d(row.ExpensePaymentDate),
+        "Payee": row.Payee,
+        "PaymentMethod": row.PaymentMethod,
+        "PaymentRef": row.PaymentRef,
+    }
+
+
+def group_items(items, by: str) -> dict:
+    """{apartment name | 'Month YYYY': [item, ...]} from listing items."""
+    out = {}
+    for item in items:
+        if by == "apartment":
+            label = item["Apartment"]
+        else:
+            y, m = item["ExpenseDate"][:7].split("-")
+            label = _month_label(y, m)
+        out.setdefault(label, []).append(item)
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Summaries
+# ──────────────────────────────────────────────────────────────────────────────
+
+def expense_summary(user_id: int, by: str, **filters) -> dict:
+    """{label: total} for one dimension; labels match the legacy endpoints."""
+    apt = aliased(Apartment)
+    year = func.extract("year", LandlordExpense.ExpenseDate)
+    month = func.extract("month", LandlordExpense.ExpenseDate)
+    keys = {
+        "month": (year, month),
+        "year": (year,),
+        "apartment": (apt.ApartmentID, apt.ApartmentName),
+        "type": (LandlordExpense.ExpenseType,),
+    }[by]
+
+    rows = _scoped(apt, keys, user_id, **filters).group_by(*keys).all()
+
+    summary = {}
+    for *key, total in rows:
+        if by == "month":
+            label = _month_label(*key)
+        elif by == "year":
+            label = str(int(key[0]))
+        elif by == "apartment":
+            label = key[1]
+        else:
+            label = key[0]
+        summary[label] = summary.get(label, 0) + float(total or 0)
+    return summary
+
+
+def expense_pivot(user_id: int, **filters) -> dict:
+    """All four summaries plus the grand total, from one grouped query."""
+    apt = aliased(Apartment)
+    year = func.extract("year", LandlordExpense.ExpenseDate)
+    month = func.extract("month", LandlordExpense.ExpenseDate)
+    keys = (year, month, apt.ApartmentID, apt.ApartmentName, LandlordExpense.ExpenseType)
+
+    rows = _scoped(apt, keys, user_id, **filters).group_by(*keys).all()
+
+    out = {dim: {} for dim in DIMENSIONS}
+    grand = 0.0
+    for y, m, _apt_id, apt_name, etype, total in rows:
+        total = float(total or 0)
+        grand += total
+        for dim, label in (("month", _month_label(y, m)), ("year", str(int(y))),
+                           ("apartment", apt_name), ("type", etype)):
+            out[dim][label] = out[dim].get(label, 0) + total
+    out["total"] = grand
+    return out
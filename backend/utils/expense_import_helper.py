@@ -0,0 +1,250 @@
+# backend/utils/expense_import_helper.py
+#
+# Bulk expense import from CSV / bank-statement exports.
+#
+# The file is read row by row (csv.DictReader over the upload stream), so
+# memory stays flat however long it is. Each row is validated with the same
+# rules as POST /landlord-expenses/add; bad rows are reported with their line
+# number and skipped, the rest are inserted BATCH_SIZE at a time with
+# bulk_insert_mappings and committed per batch.
+#
+# Re-running an import is safe: rows whose PaymentRef already exists on one of
+# the landlord's apartments (or earlier in the same file) are skipped as
+# duplicates. Rows without a PaymentRef cannot be matched and are always
+# inserted. A line that cannot be decoded or parsed as CSV stops the import
+# there (ImportAborted); the rows before it stay imported and are reported.
+#
+#   POST /landlord-expenses/import        (multipart "file")
+#   flask --app app import-expenses statement.csv --landlord 7
+
+import csv
+import io
+from datetime import datetime
+
+from models.models import db, LandlordExpense
+from utils.noi_helper import invalidate_noi
+from utils.scope_helper import landlord_scope
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 500          # errors listed in the result (all are counted)
+
+VALID_METHODS = {"Cash", "Bank Transfer", "M-Pesa", "Cheque", "Other"}
+
+# Column names accepted for each field (compared case-insensitively), so
+# our own export and common bank-statement layouts import as-is.
+COLUMNS = {
+    "ApartmentID": ("apartmentid", "apartment_id"),
+    "Apartment": ("apartment", "apartmentname", "property"),
+    "ExpenseType": ("expensetype", "type", "category"),
+    "Amount": ("amount", "debit", "withdrawal", "withdrawn", "paid out"),
+    "Description": ("description", "details", "narration", "narrative", "particulars"),
+    "ExpenseDate": ("expensedate", "date", "transaction date", "value date"),
+    "ExpensePaymentDate": ("expensepaymentdate", "paymentdate", "paid date"),
+    "Payee": ("payee", "vendor", "beneficiary"),
+    "PaymentMethod": ("paymentmethod", "method", "channel"),
+    "PaymentRef": ("paymentref", "reference", "ref", "transaction id", "receipt no"),
+}
+
+
+class ImportFormatError(ValueError):
+    """The file as a whole cannot be imported (no header, no amount column...)."""
+
+
+class ImportAborted(ValueError):
+    """
+    The file stopped being readable part-way (bad encoding, broken quoting).
+    Rows before `line` were imported; `result` says how many.
+    """
+
+    def __init__(self, message: str, line: int, result: dict):
+        super().__init__(message)
+        self.line = line
+        self.result = result
+
+
+def _column_map(fieldnames) -> dict:
+    """{field: csv column name} for the columns present in the header."""
+    by_key = {(name or "").strip().lower(): name for name in fieldnames or []}
+    found = {}
+    for field, aliases in COLUMNS.items():
+        for alias in aliases:
+            if alias in by_key:
+                found[field] = by_key[alias]
+                break
+    return found
+
+
+def _date(value: str, field: str):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"{field} must be YYYY-MM-DD.")
+
+
+class _Importer:
+    def __init__(self, user_id: int, default_apartment_id: int | None,
+                 default_type: str | None, dry_run: bool, batch_size: int):
+        scope = landlord_scope(user_id)
+        self.user_id = user_id
+        self.apartment_ids = scope.apartment_ids
+        self.apartment_by_name = {name.strip().lower(): apt_id
+                                  for apt_id, name in scope.apartment_name.items() if name}
+        self.default_apartment_id = default_apartment_id
+        self.default_type = default_type
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+
+        self.seen_refs = set()
+        self.batch = []
+        self.result = {"rows": 0, "inserted": 0, "duplicates": 0,
+                       "failed": 0, "errors": []}
+
+    def error(self, line: int, message: str):
+        self.result["failed"] += 1
+        if len(self.result["errors"]) < MAX_ERRORS:
+            self.result["errors"].append({"line": line, "message": message})
+
+    def _apartment(self, raw_id, raw_name):
+        if raw_id:
+            try:
+                apt_id = int(raw_id)
+            except ValueError:
+                raise ValueError("ApartmentID must be a number.")
+        elif raw_name:
+            apt_id = self.apartment_by_name.get(raw_name.strip().lower())
+            if apt_id is None:
+                raise ValueError(f"Apartment '{raw_name}' not found.")
+        else:
+            apt_id = self.default_apartment_id
+        if not apt_id:
+            raise ValueError("ApartmentID is required.")
+        if apt_id not in self.apartment_ids:
+            raise ValueError("Apartment not found.")
+        return apt_id
+
+    def mapping(self, row: dict, cols: dict) -> dict:
+        def get(field):
+            col = cols.get(field)
+            return (row.get(col) or "").strip() if col else ""
+
+        apartment_id = self._apartment(get("ApartmentID"), get("Apartment"))
+        expense_type = get("ExpenseType") or self.default_type
+        amount_in = get("Amount")
+        if not expense_type or not amount_in:
+            raise ValueError("ApartmentID, ExpenseType, and Amount are required.")
+        try:
+            amount = float(amount_in.replace(",", ""))
+        except ValueError:
+            raise ValueError("Amount must be a valid number.")
+        if amount <= 0:
+            raise ValueError("Amount must be greater than zero.")
+
+        expense_date = _date(get("ExpenseDate"), "ExpenseDate") if get("ExpenseDate") else datetime.utcnow()
+        paid_in = get("ExpensePaymentDate")
+        payment_date = _date(paid_in, "ExpensePaymentDate") if paid_in else None
+
+        method = get("PaymentMethod") or None
+        if method and method not in VALID_METHODS:
+            raise ValueError(f"PaymentMethod must be one of {sorted(VALID_METHODS)}")
+
+        return {
+            "ApartmentID": apartment_id,
+            "ExpenseType": expense_type[:100],
+            "Amount": amount,
+            "Description": get("Description")[:300],
+            "ExpenseDate": expense_date,
+            "ExpensePaymentDate": payment_date,
+            "Payee": get("Payee")[:150] or None,
+            "PaymentMethod": method,
+            "PaymentRef": get("PaymentRef")[:100] or None,
+            "CreatedAt": datetime.utcnow(),
+        }
+
+    def add(self, mapping: dict):
+        ref = mapping["PaymentRef"]
+        if ref:
+            if ref in self.seen_refs:
+                self.result["duplicates"] += 1
+                return
+            self.seen_refs.add(ref)
+        self.batch.append(mapping)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def _existing_refs(self, refs) -> set:
+        if not refs or not self.apartment_ids:
+            return set()
+        # seek ix_expenses_paymentref; ownership is checked on the few matches
+        rows = (db.session.query(LandlordExpense.PaymentRef, LandlordExpense.ApartmentID)
+                .filter(LandlordExpense.PaymentRef.in_(refs))
+                .all())
+        return {ref for ref, apt_id in rows if apt_id in self.apartment_ids}
+
+    def flush(self):
+        if not self.batch:
+            return
+        existing = self._existing_refs([m["PaymentRef"] for m in self.batch if m["PaymentRef"]])
+        fresh = [m for m in self.batch if not (m["PaymentRef"] and m["PaymentRef"] in existing)]
+        self.result["duplicates"] += len(self.batch) - len(fresh)
+        self.batch = []
+        if fresh and not self.dry_run:
+            db.session.bulk_insert_mappings(LandlordExpense, fresh)
+            db.session.commit()
+            invalidate_noi(self.user_id)   # bulk inserts skip mapper events
+        self.result["inserted"] += len(fresh)
+
+
+def _decoded_lines(stream):
+    """
+    Decode a binary upload line by line (not in 8 KB chunks like
+    TextIOWrapper), so an undecodable byte fails at its own line, after
+    the rows before it.
+    """
+    for n, raw in enumerate(stream):
+        yield raw.decode("utf-8-sig" if n == 0 else "utf-8")
+
+
+def import_expenses(user_id: int, stream, default_apartment_id: int | None = None,
+                    default_type: str | None = None, dry_run: bool = False,
+                    batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Import expenses for `user_id` from a text or binary CSV stream.
+    Returns {"rows", "inserted", "duplicates", "failed", "errors": [{line, message}]}.
+    Raises ImportFormatError when the header is unusable (nothing imported),
+    ImportAborted when the file becomes unreadable after the header: the
+    rows before that point are imported and counted in its result.
+    """
+    if not isinstance(stream, io.TextIOBase):
+        stream = _decoded_lines(stream)
+    reader = csv.DictReader(stream)
+    try:
+        cols = _column_map(reader.fieldnames)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f"header: {e}")
+    if "Amount" not in cols:
+        raise ImportFormatError("CSV header must include an Amount column.")
+    if not (cols.keys() & {"ApartmentID", "Apartment"}) and not default_apartment_id:
+        raise ImportFormatError("CSV needs an ApartmentID/Apartment column or a default apartment_id.")
+
+    imp = _Importer(user_id, default_apartment_id, default_type, dry_run, batch_size)
+    rows = iter(reader)
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            break
+        except (UnicodeDecodeError, csv.Error) as e:
+            # keep everything before the unreadable spot, so the result is
+            # exactly "lines before N" rather than "whole batches before N"
+            imp.flush()
+            raise ImportAborted(str(e), reader.line_num + 1, imp.result)
+        line = reader.line_num
+        imp.result["rows"] += 1
+        try:
+            mapping = imp.mapping(row, cols)
+        except ValueError as e:
+            imp.error(line, str(e))
+            continue
+        imp.add(mapping)
+    imp.flush()
+    return imp.result
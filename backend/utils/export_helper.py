@@ -0,0 +1,130 @@
+# backend/utils/export_helper.py
+#
+# CSV exports that never hold the whole result in memory: column-only,
+# pre-joined queries read with yield_per (server-side cursor where the driver
+# supports it) and written out in small chunks, optionally gzip-compressed.
+
+import csv
+import io
+import zlib
+
+from flask import Response, request, stream_with_context
+from sqlalchemy.orm import aliased
+
+from models.models import db, Apartment, LandlordExpense, Tenant, ActivityEvent
+from utils.activity_helper import activity_query
+from utils.scope_helper import landlord_scope
+
+YIELD_PER = 1000          # rows fetched per round trip
+CHUNK_ROWS = 500          # CSV rows per chunk handed to the WSGI server
+
+ACTIVITY_HEADER = ["Type", "Tenant", "Unit / From → To", "Date", "Reason", "Notes"]
+EXPENSE_HEADER = ["ExpenseID", "Apartment", "ExpenseType", "Amount", "Description",
+                  "ExpenseDate", "ExpensePaymentDate", "Payee", "PaymentMethod", "PaymentRef"]
+
+
+def _dt(d):
+    return d.strftime("%Y-%m-%d %H:%M:%S") if d else None
+
+
+def _d(d):
+    return d.strftime("%Y-%m-%d") if d else None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Row sources (lazy; nothing runs until iterated)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def activity_rows(user_id: int, apartment_id: int | None = None,
+                  log_type: str | None = None, year: int | None = None,
+                  month: int | None = None, search: str | None = None):
+    """Transfer / vacate log rows for ACTIVITY_HEADER, newest first."""
+    labels = landlord_scope(user_id, apartment_id).unit_label
+    q = (activity_query(user_id, apartment_id, log_type, year, month, search)
+         .outerjoin(Tenant, Tenant.TenantID == ActivityEvent.TenantID)
+         .with_entities(ActivityEvent.EventType, Tenant.FullName,
+                        ActivityEvent.FromUnitID, ActivityEvent.UnitID,
+                        ActivityEvent.OccurredAt, ActivityEvent.Reason,
+                        ActivityEvent.Notes)
+         .order_by(ActivityEvent.OccurredAt.desc(), ActivityEvent.EventID.desc())
+         .yield_per(YIELD_PER))
+    for kind, name, from_unit, unit, at, reason, notes in q:
+        if kind == "transfer":
+            yield ["Transfer", name or "Unknown",
+                   f"{labels.get(from_unit) or 'N/A'} -> {labels.get(unit) or 'N/A'}",
+                   _dt(at), reason or "", ""]
+        else:
+            yield ["Vacate", name or "Unknown", labels.get(unit) or "N/A",
+                   _dt(at), reason or "", notes or ""]
+
+
+def expense_rows(user_id: int, apartment_id: int | None = None):
+    """The landlord's expenses for EXPENSE_HEADER, apartment name pre-joined."""
+    apt = aliased(Apartment)
+    q = (db.session.query(
+            LandlordExpense.ExpenseID, apt.ApartmentName, LandlordExpense.ExpenseType,
+            LandlordExpense.Amount, LandlordExpense.Description,
+            LandlordExpense.ExpenseDate, LandlordExpense.ExpensePaymentDate,
+            LandlordExpense.Payee, LandlordExpense.PaymentMethod,
+            LandlordExpense.PaymentRef)
+         .join(apt, apt.ApartmentID == LandlordExpense.ApartmentID)
+         .filter(apt.UserID == user_id))
+    if apartment_id:
+        q = q.filter(LandlordExpense.ApartmentID == apartment_id)
+    q = q.order_by(LandlordExpense.ExpenseID).yield_per(YIELD_PER)
+    for (eid, apt_name, etype, amount, desc, exp_date, paid_date,
+         payee, method, ref) in q:
+        yield [eid, apt_name, etype, float(amount or 0), desc or "",
+               _d(exp_date) or "", _d(paid_date) or "",
+               payee or "", method or "", ref or ""]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Encoding
+# ──────────────────────────────────────────────────────────────────────────────
+
+def iter_csv(header, rows, chunk_rows: int = CHUNK_ROWS):
+    """Yield CSV text in chunks of `chunk_rows` rows (header in the first)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    n = 0
+    for row in rows:
+        writer.writerow(row)
+        n += 1
+        if n >= chunk_rows:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            n = 0
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def gzip_chunks(chunks):
+    """gzip-frame an iterable of str chunks without buffering the whole body."""
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)   # wbits 31 → gzip container
+    for chunk in chunks:
+        out = z.compress(chunk.encode("utf-8"))
+        if out:
+            yield out
+    yield z.flush()
+
+
+def accepts_gzip() -> bool:
+    return "gzip" in (request.headers.get("Accept-Encoding") or "").lower()
+
+
+def csv_response(filename: str, header, rows) -> Response:
+    """Streaming CSV download; gzip-encoded when the client accepts it."""
+    chunks = iter_csv(header, rows)
+    headers = {"Content-Disposition": f"attachment; filename={filename}",
+               "Vary": "Accept-Encoding",
+               "X-Accel-Buffering": "no"}
+    if accepts_gzip():
+        body = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = (c.encode("utf-8") for c in chunks)
+    return Response(stream_with_context(body), mimetype="text/csv",
+                    headers=headers, direct_passthrough=True)
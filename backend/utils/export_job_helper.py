@@ -0,0 +1,280 @@
+# backend/utils/export_job_helper.py
+#
+# Background exports. POST /exports records an ExportJob and hands its ID to
+# a small in-process worker pool; the worker streams rows from the same
+# sources as the synchronous CSV endpoints (utils/export_helper.py) into a
+# file under EXPORT_DIR, in chunks, then marks the job done.
+#
+# Identical requests (same landlord, kind, format and filters) share a job:
+# a queued/running job, or a finished one younger than EXPORT_REUSE_SECONDS,
+# is returned instead of creating another. The filtered unique index
+# ux_exportjobs_active_key enforces one queued/running job per key across
+# processes; a request that loses the race gets the winner's job.
+#
+#   EXPORT_DIR              where files are written (default backend/exports)
+#   EXPORT_WORKERS          worker threads per process (default 2)
+#   EXPORT_REUSE_SECONDS    how long a finished file is reused (default 300)
+#   EXPORT_TTL_HOURS        files/jobs older than this are purged (default 24)
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from models.models import db, ExportJob
+from utils.export_helper import (
+    ACTIVITY_HEADER, EXPENSE_HEADER, CHUNK_ROWS, activity_rows, expense_rows, iter_csv
+)
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # optional: XLSX exports
+    Workbook = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: Parquet exports
+    pa = pq = None
+
+EXPORT_DIR = os.getenv("EXPORT_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exports")
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", 2))
+EXPORT_REUSE_SECONDS = int(os.getenv("EXPORT_REUSE_SECONDS", 300))
+EXPORT_TTL_HOURS = int(os.getenv("EXPORT_TTL_HOURS", 24))
+STALE_AFTER = timedelta(minutes=30)   # queued/running longer → worker died
+
+ACTIVE = ("queued", "running")
+
+# kind -> (header, row source taking (user_id, **params))
+SOURCES = {
+    "logs": (ACTIVITY_HEADER, activity_rows),
+    "expenses": (EXPENSE_HEADER, expense_rows),
+}
+
+MIMETYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_executor = None
+_submit_lock = threading.Lock()
+_last_purge = None
+
+
+def available_formats() -> list[str]:
+    out = ["csv"]
+    if Workbook is not None:
+        out.append("xlsx")
+    if pq is not None:
+        out.append("parquet")
+    return out
+
+
+def content_key(user_id: int, kind: str, fmt: str, params: dict) -> str:
+    raw = json.dumps([user_id, kind, fmt, params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS,
+                                       thread_name_prefix="export")
+    return _executor
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Writers (chunked; each returns the number of data rows written)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _counted(rows, counter: list):
+    for row in rows:
+        counter[0] += 1
+        yield row
+
+
+def _write_csv(path, header, rows) -> int:
+    n = [0]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for chunk in iter_csv(header, _counted(rows, n)):
+            f.write(chunk)
+    return n[0]
+
+
+def _write_xlsx(path, header, rows) -> int:
+    wb = Workbook(write_only=True)   # rows are flushed to disk as appended
+    ws = wb.create_sheet("Export")
+    ws.append(header)
+    n = 0
+    for row in rows:
+        ws.append(row)
+        n += 1
+    wb.save(path)
+    return n
+
+
+def _write_parquet(path, header, rows) -> int:
+    schema = pa.schema([(h, pa.string()) for h in header])
+    n, batch = 0, []
+    with pq.ParquetWriter(path, schema) as writer:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= CHUNK_ROWS:
+                n += _parquet_batch(writer, schema, batch)
+        n += _parquet_batch(writer, schema, batch)
+    return n
+
+
+def _parquet_batch(writer, schema, batch) -> int:
+    if not batch:
+        return 0
+    cols = [pa.array([None if v is None else str(v) for v in col], type=pa.string())
+            for col in zip(*batch)]
+    writer.write_table(pa.Table.from_arrays(cols, schema=schema))
+    n = len(batch)
+    batch.clear()
+    return n
+
+
+WRITERS = {"csv": _write_csv, "xlsx": _write_xlsx, "parquet": _write_parquet}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Jobs
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _reusable(key: str) -> ExportJob | None:
+    now = datetime.utcnow()
+    job = (ExportJob.query
+           .filter(ExportJob.ContentKey == key,
+                   ExportJob.CreatedAt >= now - STALE_AFTER - timedelta(seconds=EXPORT_REUSE_SECONDS))
+           .order_by(ExportJob.CreatedAt.desc())
+           .first())
+    if not job:
+        return None
+    if job.Status in ACTIVE and job.CreatedAt >= now - STALE_AFTER:
+        return job
+    if (job.Status == "done" and job.FinishedAt
+            and job.FinishedAt >= now - timedelta(seconds=EXPORT_REUSE_SECONDS)
+            and job.FilePath and os.path.exists(job.FilePath)):
+        return job
+    return None
+
+
+def _active(key: str) -> ExportJob | None:
+    return (ExportJob.query
+            .filter(ExportJob.ContentKey == key, ExportJob.Status.in_(ACTIVE))
+            .first())
+
+
+def _retire_stale(key: str):
+    """A queued/running job past STALE_AFTER lost its worker; free its key."""
+    now = datetime.utcnow()
+    (ExportJob.query
+     .filter(ExportJob.ContentKey == key, ExportJob.Status.in_(ACTIVE),
+             ExportJob.CreatedAt < now - STALE_AFTER)
+     .update({"Status": "failed", "Error": "Export worker stopped.", "FinishedAt": now},
+             synchronize_session=False))
+
+
+def submit_export(user_id: int, kind: str, fmt: str, params: dict) -> tuple[ExportJob, bool]:
+    """Returns (job, created). Raises ValueError for unknown kind/format."""
+    if kind not in SOURCES:
+        raise ValueError(f"kind must be one of: {', '.join(SOURCES)}.")
+    if fmt not in available_formats():
+        raise ValueError(f"format must be one of: {', '.join(available_formats())}.")
+
+    _maybe_purge()
+    key = content_key(user_id, kind, fmt, params)
+    with _submit_lock:
+        job = _reusable(key)
+        if job:
+            return job, False
+        _retire_stale(key)
+        job = ExportJob(LandlordID=user_id, Kind=kind, Format=fmt,
+                        Params=json.dumps(params, default=str), ContentKey=key,
+                        Status="queued")
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # another process queued the same export first
+            db.session.rollback()
+            job = _active(key)
+            if job is None:
+                raise
+            return job, False
+
+    _pool().submit(_run_job, current_app._get_current_object(), job.JobID)
+    return job, True
+
+
+def _run_job(app, job_id: int):
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        if not job or job.Status != "queued":
+            return
+        job.Status, job.StartedAt = "running", datetime.utcnow()
+        db.session.commit()
+
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        path = os.path.join(EXPORT_DIR, f"export_{job.JobID}_{job.ContentKey[:12]}.{job.Format}")
+        tmp = path + ".part"
+        try:
+            header, source = SOURCES[job.Kind]
+            rows = source(job.LandlordID, **json.loads(job.Params or "{}"))
+            job.RowCount = WRITERS[job.Format](tmp, header, rows)
+            os.replace(tmp, path)
+            job.FilePath, job.FileSize = path, os.path.getsize(path)
+            job.Status = "done"
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception(f"[exports] job {job_id} failed")
+            job.Status, job.Error = "failed", str(e)[:500]
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        job.FinishedAt = datetime.utcnow()
+        db.session.commit()
+        db.session.remove()
+
+
+def _maybe_purge():
+    """Drop expired files/jobs, at most once an hour per process."""
+    global _last_purge
+    now = datetime.utcnow()
+    if _last_purge and now - _last_purge < timedelta(hours=1):
+        return
+    _last_purge = now
+    purge_expired_exports()
+
+
+def purge_expired_exports(max_age_hours: int = EXPORT_TTL_HOURS) -> int:
+    cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+    old = ExportJob.query.filter(ExportJob.CreatedAt < cutoff).all()
+    for job in old:
+        if job.FilePath and os.path.exists(job.FilePath):
+            os.remove(job.FilePath)
+        db.session.delete(job)
+    db.session.commit()
+    return len(old)
+
+
+def job_dict(job: ExportJob) -> dict:
+    return {
+        "JobID": job.JobID,
+        "Kind": job.Kind,
+        "Format": job.Format,
+        "Status": job.Status,
+        "RowCount": job.RowCount,
+        "FileSize": job.FileSize,
+        "Error": job.Error,
+        "CreatedAt": job.CreatedAt.strftime("%Y-%m-%d %H:%M:%S") if job.CreatedAt else None,
+        "FinishedAt": job.FinishedAt.strftime("%Y-%m-%d %H:%M:%S") if job.FinishedAt else None,
+    }
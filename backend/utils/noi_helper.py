@@ -0,0 +1,226 @@
+# backend/utils/noi_helper.py
+#
+# Net operating income per apartment and month:
+#
+#   Billed     new charges on bills for the month
+#              (TotalAmountDue - CarriedForwardBalance, by BillingPeriod)
+#   Collected  rent received during the month (by PaymentDate)
+#   Expenses   landlord expenses for the month (by ExpenseDate)
+#   NOI        Collected - Expenses
+#
+# Two grouped queries per request, whatever the range: income (bills and
+# payments, each grouped by apartment and month, combined with UNION ALL) and
+# expenses (grouped the same way). Their rows are joined in memory on
+# (apartment, month); no row-level data is read into Python.
+#
+# Closed months (before the current one) are cached per landlord and month.
+# Writes to bills, payments or expenses bump the landlord's version (mapper
+# events; bulk inserts call invalidate_noi themselves); NOI_CACHE_TTL bounds
+# staleness from other workers.
+
+import os
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import event, func, literal, select, union_all
+from sqlalchemy.orm import aliased
+
+from models.models import db, Apartment, RentalUnit, TenantBill, RentPayment, LandlordExpense
+from utils.date_helper import month_bounds
+
+NOI_CACHE_TTL = float(os.getenv("NOI_CACHE_TTL", "3600"))
+NOI_CACHE_MAX_CELLS = int(os.getenv("NOI_CACHE_MAX_CELLS", "20000"))
+MAX_MONTHS = 120
+
+MEASURES = ("Collected", "Billed", "Expenses")
+
+_cells = {}     # (user_id, period) -> (version, expires_at, {apartment_id: {measure: amount}})
+_versions = {}  # user_id -> int
+_lock = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cache invalidation
+# ──────────────────────────────────────────────────────────────────────────────
+
+def invalidate_noi(user_id: int | None = None):
+    with _lock:
+        if user_id is None:
+            _cells.clear()
+        else:
+            _versions[user_id] = _versions.get(user_id, 0) + 1
+
+
+def _income_written(mapper, connection, target):
+    if target.LandlordID:
+        invalidate_noi(target.LandlordID)
+
+
+def _expense_written(mapper, connection, target):
+    owner = connection.scalar(select(Apartment.UserID)
+                              .where(Apartment.ApartmentID == target.ApartmentID))
+    invalidate_noi(owner)
+
+
+for _evt in ("after_insert", "after_update", "after_delete"):
+    event.listen(TenantBill, _evt, _income_written)
+    event.listen(RentPayment, _evt, _income_written)
+    event.listen(LandlordExpense, _evt, _expense_written)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Months
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _next(p: date) -> date:
+    return date(p.year + p.month // 12, p.month % 12 + 1, 1)
+
+
+def month_span(first: date, last: date) -> list[date]:
+    out, p = [], first
+    while p <= last:
+        out.append(p)
+        p = _next(p)
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Queries
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _income(user_id: int, first: date, last: date):
+    """(ApartmentID, year, month, billed, collected) rows, one per branch."""
+    start, _ = month_bounds(first.year, first.month)
+    _, end = month_bounds(last.year, last.month)
+
+    bu = aliased(RentalUnit)
+    billed = (select(bu.ApartmentID.label("apt"),
+                     func.extract("year", TenantBill.BillingPeriod).label("y"),
+                     func.extract("month", TenantBill.BillingPeriod).label("m"),
+                     func.sum(TenantBill.TotalAmountDue
+                              - func.coalesce(TenantBill.CarriedForwardBalance, 0)).label("billed"),
+                     literal(0).label("collected"))
+              .join(bu, bu.UnitID == TenantBill.RentalUnitID)
+              .where(TenantBill.LandlordID == user_id,
+                     TenantBill.BillingPeriod >= first, TenantBill.BillingPeriod <= last)
+              .group_by(bu.ApartmentID,
+                        func.extract("year", TenantBill.BillingPeriod),
+                        func.extract("month", TenantBill.BillingPeriod)))
+
+    pu = aliased(RentalUnit)
+    collected = (select(pu.ApartmentID.label("apt"),
+                        func.extract("year", RentPayment.PaymentDate).label("y"),
+                        func.extract("month", RentPayment.PaymentDate).label("m"),
+                        literal(0).label("billed"),
+                        func.sum(RentPayment.AmountPaid).label("collected"))
+                 .join(pu, pu.UnitID == RentPayment.RentalUnitID)
+                 .where(RentPayment.LandlordID == user_id,
+                        RentPayment.PaymentDate >= start, RentPayment.PaymentDate < end)
+                 .group_by(pu.ApartmentID,
+                           func.extract("year", RentPayment.PaymentDate),
+                           func.extract("month", RentPayment.PaymentDate)))
+
+    return db.session.execute(union_all(billed, collected)).all()
+
+
+def _expenses(user_id: int, first: date, last: date):
+    """(ApartmentID, year, month, total) rows."""
+    start, _ = month_bounds(first.year, first.month)
+    _, end = month_bounds(last.year, last.month)
+    apt = aliased(Apartment)
+    y = func.extract("year", LandlordExpense.ExpenseDate)
+    m = func.extract("month", LandlordExpense.ExpenseDate)
+    return (db.session.query(LandlordExpense.ApartmentID, y, m, func.sum(LandlordExpense.Amount))
+            .join(apt, apt.ApartmentID == LandlordExpense.ApartmentID)
+            .filter(apt.UserID == user_id,
+                    LandlordExpense.ExpenseDate >= start, LandlordExpense.ExpenseDate < end)
+            .group_by(LandlordExpense.ApartmentID, y, m)
+            .all())
+
+
+def _compute(user_id: int, first: date, last: date) -> dict:
+    """{period: {apartment_id: {measure: amount}}} for every month in range."""
+    out = {p: {} for p in month_span(first, last)}
+
+    def cell(apt_id, y, m):
+        return out[date(int(y), int(m), 1)].setdefault(
+            apt_id, {k: 0.0 for k in MEASURES})
+
+    for apt_id, y, m, billed, collected in _income(user_id, first, last):
+        c = cell(apt_id, y, m)
+        c["Billed"] += float(billed or 0)
+        c["Collected"] += float(collected or 0)
+    for apt_id, y, m, total in _expenses(user_id, first, last):
+        cell(apt_id, y, m)["Expenses"] += float(total or 0)
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Report
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _monthly(user_id: int, first: date, last: date) -> dict:
+    """Per-month cells, closed months from cache where possible."""
+    current = date.today().replace(day=1)
+    now = time.monotonic()
+    months = month_span(first, last)
+
+    with _lock:
+        version = _versions.get(user_id, 0)
+        cached = {}
+        for p in months:
+            hit = _cells.get((user_id, p))
+            if p < current and hit and hit[0] == version and hit[1] > now:
+                cached[p] = hit[2]
+
+    missing = [p for p in months if p not in cached]
+    if missing:
+        fresh = _compute(user_id, missing[0], missing[-1])
+        with _lock:
+            if len(_cells) > NOI_CACHE_MAX_CELLS:
+                _cells.clear()
+            if _versions.get(user_id, 0) == version:
+                for p, data in fresh.items():
+                    if p < current:
+                        _cells[(user_id, p)] = (version, now + NOI_CACHE_TTL, data)
+        cached.update(fresh)
+    return {p: cached[p] for p in months}
+
+
+def _row(values: dict) -> dict:
+    row = {k: round(values.get(k, 0.0), 2) for k in MEASURES}
+    row["NOI"] = round(row["Collected"] - row["Expenses"], 2)
+    return row
+
+
+def noi_report(user_id: int, first: date, last: date, apartments: dict) -> dict:
+    """
+    apartments: {ApartmentID: name} to report on (the landlord's, or one).
+    Returns per-apartment monthly rows, per-month totals and grand totals.
+    """
+    monthly = _monthly(user_id, first, last)
+
+    per_apt = {apt_id: [] for apt_id in apartments}
+    by_month, grand = [], {k: 0.0 for k in MEASURES}
+    for p, cells in monthly.items():
+        label = p.strftime("%Y-%m")
+        month_tot = {k: 0.0 for k in MEASURES}
+        for apt_id in apartments:
+            values = cells.get(apt_id, {})
+            per_apt[apt_id].append({"Month": label, **_row(values)})
+            for k in MEASURES:
+                month_tot[k] += values.get(k, 0.0)
+        by_month.append({"Month": label, **_row(month_tot)})
+        for k in MEASURES:
+            grand[k] += month_tot[k]
+
+    items = []
+    for apt_id, name in apartments.items():
+        rows = per_apt[apt_id]
+        totals = {k: sum(r[k] for r in rows) for k in MEASURES}
+        items.append({"ApartmentID": apt_id, "ApartmentName": name,
+                      "Months": rows, "Totals": _row(totals)})
+
+    return {"months": [p.strftime("%Y-%m") for p in monthly],
+            "apartments": items, "monthly_totals": by_month, "totals": _row(grand)}
@@ -0,0 +1,56 @@
+# backend/utils/pagination_helper.py
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    """Opaque, URL-safe token for the (timestamp, id) of the last row served."""
+    raw = json.dumps([ts.isoformat() if ts else None, row_id],
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, int]:
+    """Raises ValueError on anything that is not a token we issued."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        ts, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+def keyset_page(query, ts_col, id_col, limit: int, cursor: str | None = None,
+                offset: int | None = None, key=None):
+    """
+    Newest-first page ordered by (ts_col DESC, id_col DESC).
+
+    With `cursor`, seeks past the last row of the previous page, so deep pages
+    cost the same as the first. `offset` is only for legacy ?page= callers.
+    `key(row) -> (ts, id)` extracts the sort key (defaults to the columns'
+    attribute names on the row).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if key is None:
+        def key(row):
+            return getattr(row, ts_col.key), getattr(row, id_col.key)
+
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        query = query.filter(or_(ts_col < ts,
+                                 and_(ts_col == ts, id_col < row_id)))
+
+    query = query.order_by(ts_col.desc(), id_col.desc())
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = encode_cursor(*key(rows[-1])) if has_more and rows else None
+    return rows, next_cursor
@@ -0,0 +1,132 @@
+# backend/utils/phone_helper.py
+#
+# One canonical phone key: E.164 (+2547XXXXXXXX), stored in PhoneE164 on
+# Users and Tenants. Every lookup by phone is an equality on that indexed
+# column; the legacy Phone column (2547XXXXXXXX) is kept for display only.
+# Rows written before the key existed are filled by backfill_phone_keys()
+# (`flask --app app upgrade-db`), never by OR-ing Phone into lookups.
+
+import re
+
+from sqlalchemy import bindparam, event, inspect, select, update
+
+from models.models import db, User, Tenant
+
+DEFAULT_COUNTRY_CODE = "+254"
+BACKFILL_BATCH = 1000
+
+_NON_DIGITS = re.compile(r"\D")
+_E164_DIGITS = re.compile(r"^[1-9]\d{7,14}$")
+_KENYA_DIGITS = re.compile(r"^254[17]\d{8}$")
+_PHONE_QUERY = re.compile(r"^(\+|00|0|254)[\d\s()-]{8,}$")
+
+
+def canonical_phone(raw: str | None, country_code: str | None = None) -> str | None:
+    """
+    Accepts 07xxxxxxxx, 7xxxxxxxx, 2547xxxxxxxx, +2547xxxxxxxx (spaces,
+    dashes and brackets ignored). Local numbers get `country_code`
+    (default +254). Returns the E.164 string, or None if it cannot be one.
+    """
+    if not raw:
+        return None
+    raw = str(raw).strip()
+    p = _NON_DIGITS.sub("", raw)
+    if not p:
+        return None
+    cc = _NON_DIGITS.sub("", country_code or DEFAULT_COUNTRY_CODE) or "254"
+
+    if raw.startswith("+") or raw.startswith("00"):
+        p = p[2:] if raw.startswith("00") else p
+    elif p.startswith("0"):
+        p = cc + p[1:]                  # 07xx… → 2547xx…
+    elif not p.startswith(cc) and len(p) == 9:
+        p = cc + p                      # 7xx… → 2547xx…
+
+    if p.startswith("254") and not _KENYA_DIGITS.match(p):
+        return None                     # Kenyan numbers are exactly 12 digits
+    return f"+{p}" if _E164_DIGITS.match(p) else None
+
+
+def canonical_phones(values) -> list[str | None]:
+    """canonical_phone over a column of values (backfills, imports)."""
+    return [canonical_phone(v) for v in values]
+
+
+def phone_search_key(q: str) -> str | None:
+    """
+    Canonical key when a search box query is a complete phone number in any
+    accepted format. Bare 9-digit input is left to text search (it is as
+    likely to be an ID number).
+    """
+    q = (q or "").strip()
+    if not _PHONE_QUERY.match(q):
+        return None
+    return canonical_phone(q)
+
+
+def legacy_phone(key: str | None) -> str:
+    """The 2547XXXXXXXX form stored in the legacy Phone column."""
+    return key[1:] if key else ""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Keep the key filled on every ORM write
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _fill_key(mapper, connection, target):
+    """
+    Derive the key from Phone when it is missing or Phone changed, unless
+    the same write sets PhoneE164 explicitly; a stale key would make the
+    row unfindable.
+    """
+    attrs = inspect(target).attrs
+    if attrs.PhoneE164.history.has_changes() and target.PhoneE164:
+        return
+    if target.Phone and (not target.PhoneE164 or attrs.Phone.history.has_changes()):
+        target.PhoneE164 = canonical_phone(target.Phone)
+
+
+for _model in (User, Tenant):
+    event.listen(_model, "before_insert", _fill_key)
+    event.listen(_model, "before_update", _fill_key)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Backfill
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _backfill(model, pk) -> int:
+    """
+    Set PhoneE164 from Phone (or re-normalize a malformed PhoneE164) in
+    batches of BACKFILL_BATCH; one executemany UPDATE per batch.
+    """
+    stmt = (update(model.__table__)
+            .where(model.__table__.c[pk.key] == bindparam("_pk"))
+            .values(PhoneE164=bindparam("_key")))
+    rows = db.session.execute(
+        select(pk, model.Phone, model.PhoneE164)
+        .where(model.Phone.isnot(None) | model.PhoneE164.isnot(None))
+    ).all()
+
+    updated, batch = 0, []
+    from_key = canonical_phones(r.PhoneE164 for r in rows)
+    from_legacy = canonical_phones(r.Phone for r in rows)
+    for row, k1, k2 in zip(rows, from_key, from_legacy):
+        key = k1 or k2
+        if key and key != row.PhoneE164:
+            batch.append({"_pk": row[0], "_key": key})
+        if len(batch) >= BACKFILL_BATCH:
+            db.session.execute(stmt, batch)
+            updated += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(stmt, batch)
+        updated += len(batch)
+    return updated
+
+
+def backfill_phone_keys() -> int:
+    """Fill the canonical key on existing Users/Tenants. Idempotent."""
+    updated = _backfill(User, User.UserID) + _backfill(Tenant, Tenant.TenantID)
+    db.session.commit()
+    return updated
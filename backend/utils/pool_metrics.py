@@ -0,0 +1,123 @@
+# backend/utils/pool_metrics.py
+
+import os
+import threading
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options_from_env(database_uri: str | None) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS driven by env:
+      DB_POOL_SIZE (10), DB_MAX_OVERFLOW (20), DB_POOL_TIMEOUT (30s),
+      DB_POOL_RECYCLE (1800s, below SQL Server/Azure idle cut-offs),
+      DB_POOL_PRE_PING (true).
+    SQLite keeps its own pool class and only gets pre-ping.
+    """
+    options = {"pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True)}
+
+    if database_uri and make_url(database_uri).get_backend_name() == "sqlite":
+        return options
+
+    options.update({
+        "poolclass": TimedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    })
+    return options
+
+
+class WaitHistogram:
+    """Cumulative histogram of connection-acquisition wait times (ms)."""
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self.BUCKETS_MS) + 1)  # last = +Inf
+            self._count = 0
+            self._sum_ms = 0.0
+            self._max_ms = 0.0
+            self._timeouts = 0
+
+    def observe(self, wait_ms: float, timed_out: bool = False):
+        idx = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if wait_ms <= bound:
+                idx = i
+                break
+        with self._lock:
+            self._counts[idx] += 1
+            self._count += 1
+            self._sum_ms += wait_ms
+            self._max_ms = max(self._max_ms, wait_ms)
+            if timed_out:
+                self._timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            count, total, peak, timeouts = self._count, self._sum_ms, self._max_ms, self._timeouts
+
+        buckets, running = {}, 0
+        for bound, n in zip(self.BUCKETS_MS, counts):
+            running += n
+            buckets[f"le_{bound}ms"] = running
+        buckets["le_inf"] = running + counts[-1]
+
+        return {
+            "count": count,
+            "timeouts": timeouts,
+            "avg_ms": round(total / count, 3) if count else 0.0,
+            "max_ms": round(peak, 3),
+            "buckets": buckets,
+        }
+
+
+acquire_wait = WaitHistogram()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            acquire_wait.observe((time.perf_counter() - start) * 1000.0, timed_out)
+
+
+def pool_stats(engine) -> dict:
+    """Live pool counters (QueuePool family) plus the acquisition-wait histogram."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    if isinstance(pool, TimedQueuePool):
+        stats["acquire_wait"] = acquire_wait.snapshot()
+    return stats
@@ -0,0 +1,154 @@
+# backend/utils/recurring_expense_helper.py
+#
+# Recurring expenses: RecurringExpense definitions are materialized into
+# LandlordExpenses, one row per (definition, month). A run
+#
+#   1. loads every active definition that is behind the target month,
+#   2. works out the months each one is missing (LastGeneratedPeriod + 1 ..
+#      target, bounded by StartPeriod / EndPeriod), so missed runs catch up;
+#      a month is only due once its DayOfMonth has arrived, so no expense is
+#      ever dated in the future,
+#   3. drops (definition, month) pairs that already exist (one query),
+#   4. inserts the rest with one bulk insert and advances
+#      LastGeneratedPeriod with one executemany UPDATE, in one transaction.
+#
+# ux_expenses_recurring_period makes a concurrent run fail instead of
+# duplicating; the run is then retried once and finds nothing left to do.
+#
+#   flask --app app generate-recurring-expenses        (daily cron)
+
+import calendar
+from datetime import date, datetime
+
+from sqlalchemy import bindparam, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from models.models import db, LandlordExpense, RecurringExpense
+from utils.noi_helper import invalidate_noi
+
+MAX_CATCHUP_MONTHS = 24   # a definition never generates more than this per run
+
+
+def period_of(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def next_period(p: date) -> date:
+    return date(p.year + p.month // 12, p.month % 12 + 1, 1)
+
+
+def _expense_date(period: date, day: int) -> datetime:
+    last = calendar.monthrange(period.year, period.month)[1]
+    return datetime(period.year, period.month, min(max(day or 1, 1), last))
+
+
+def _missing_periods(rec, as_of: date) -> list[date]:
+    target = period_of(as_of)
+    p = next_period(rec.LastGeneratedPeriod) if rec.LastGeneratedPeriod else rec.StartPeriod
+    p = max(p, rec.StartPeriod)
+    end = min(target, rec.EndPeriod) if rec.EndPeriod else target
+    out = []
+    while (p <= end and len(out) < MAX_CATCHUP_MONTHS
+           and _expense_date(p, rec.DayOfMonth).date() <= as_of):
+        out.append(p)
+        p = next_period(p)
+    return out
+
+
+def _generate(as_of: date, user_id: int | None, definition_id: int | None) -> dict:
+    target = period_of(as_of)
+    q = (db.session.query(RecurringExpense)
+         .filter(RecurringExpense.IsActive.is_(True),
+                 RecurringExpense.StartPeriod <= target,
+                 or_(RecurringExpense.LastGeneratedPeriod.is_(None),
+                     RecurringExpense.LastGeneratedPeriod < target),
+                 or_(RecurringExpense.EndPeriod.is_(None),
+                     RecurringExpense.LastGeneratedPeriod.is_(None),
+                     RecurringExpense.LastGeneratedPeriod < RecurringExpense.EndPeriod)))
+    if user_id is not None:
+        q = q.filter(RecurringExpense.LandlordID == user_id)
+    if definition_id is not None:
+        q = q.filter(RecurringExpense.RecurringExpenseID == definition_id)
+    due = q.all()
+
+    wanted = {rec.RecurringExpenseID: (rec, _missing_periods(rec, as_of)) for rec in due}
+    wanted = {k: v for k, v in wanted.items() if v[1]}
+    if not wanted:
+        return {"definitions": 0, "generated": 0}
+
+    earliest = min(periods[0] for _, periods in wanted.values())
+    existing = set(
+        db.session.query(LandlordExpense.RecurringExpenseID, LandlordExpense.RecurringPeriod)
+        .filter(LandlordExpense.RecurringExpenseID.in_(list(wanted)),
+                LandlordExpense.RecurringPeriod >= earliest)
+        .all())
+
+    now = datetime.utcnow()
+    rows, advanced = [], []
+    for rec_id, (rec, periods) in wanted.items():
+        for p in periods:
+            if (rec_id, p) in existing:
+                continue
+            rows.append({
+                "ApartmentID": rec.ApartmentID,
+                "ExpenseType": rec.ExpenseType,
+                "Amount": rec.Amount,
+                "Description": rec.Description,
+                "ExpenseDate": _expense_date(p, rec.DayOfMonth),
+                "ExpensePaymentDate": None,
+                "Payee": rec.Payee,
+                "PaymentMethod": rec.PaymentMethod,
+                "PaymentRef": None,
+                "RecurringExpenseID": rec_id,
+                "RecurringPeriod": p,
+                "CreatedAt": now,
+            })
+        advanced.append({"rid": rec_id, "last": periods[-1]})
+
+    if rows:
+        db.session.bulk_insert_mappings(LandlordExpense, rows)
+    db.session.execute(
+        update(RecurringExpense.__table__)
+        .where(RecurringExpense.__table__.c.RecurringExpenseID == bindparam("rid"))
+        .values(LastGeneratedPeriod=bindparam("last")),
+        advanced)
+    db.session.commit()
+    if rows:
+        for landlord_id in {rec.LandlordID for rec, _ in wanted.values()}:
+            invalidate_noi(landlord_id)   # bulk inserts skip mapper events
+    return {"definitions": len(advanced), "generated": len(rows)}
+
+
+def generate_recurring_expenses(as_of: date | None = None, user_id: int | None = None,
+                                definition_id: int | None = None) -> dict:
+    """
+    Materialize every due month up to and including as_of's month (default:
+    today); as_of's own month only once its DayOfMonth is <= as_of.
+    Returns {"definitions": advanced, "generated": rows inserted}.
+    """
+    as_of = as_of or date.today()
+    try:
+        return _generate(as_of, user_id, definition_id)
+    except IntegrityError:
+        # another run inserted some of the same (definition, month) pairs
+        db.session.rollback()
+        return _generate(as_of, user_id, definition_id)
+
+
+def recurring_dict(rec: RecurringExpense) -> dict:
+    return {
+        "RecurringExpenseID": rec.RecurringExpenseID,
+        "ApartmentID": rec.ApartmentID,
+        "Apartment": rec.apartment.ApartmentName if rec.apartment else None,
+        "ExpenseType": rec.ExpenseType,
+        "Amount": float(rec.Amount or 0),
+        "Description": rec.Description,
+        "Payee": rec.Payee,
+        "PaymentMethod": rec.PaymentMethod,
+        "DayOfMonth": rec.DayOfMonth,
+        "StartPeriod": rec.StartPeriod.strftime("%Y-%m") if rec.StartPeriod else None,
+        "EndPeriod": rec.EndPeriod.strftime("%Y-%m") if rec.EndPeriod else None,
+        "LastGeneratedPeriod": (rec.LastGeneratedPeriod.strftime("%Y-%m")
+                                if rec.LastGeneratedPeriod else None),
+        "IsActive": bool(rec.IsActive),
+    }
@@ -0,0 +1,179 @@
+# backend/utils/scope_helper.py
+
+import os
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import and_, exists, or_, select, update
+from sqlalchemy.orm import aliased
+
+from models.models import (
+    db, Apartment, RentalUnit, TenantBill, RentPayment, PaymentAllocation,
+    TransferLog
+)
+
+# Short TTL: other workers may change a landlord's units, and we only
+# bump the version in the process that handled the write.
+SCOPE_CACHE_TTL = float(os.getenv("SCOPE_CACHE_TTL", "30"))
+
+# Compact, immutable view of what a landlord owns.
+#   apartment_ids   frozenset[int]
+#   unit_ids        frozenset[int]
+#   unit_apartment  {UnitID: ApartmentID}
+#   unit_label      {UnitID: Label}
+#   apartment_name  {ApartmentID: ApartmentName}
+LandlordScope = namedtuple(
+    "LandlordScope",
+    ["apartment_ids", "unit_ids", "unit_apartment", "unit_label", "apartment_name"]
+)
+
+_cache = {}     # user_id -> (version, expires_at, LandlordScope)
+_versions = {}  # user_id -> int, bumped on every write that changes the scope
+_lock = threading.Lock()
+
+
+def _load_scope(user_id: int) -> LandlordScope:
+    rows = (db.session.query(Apartment.ApartmentID, Apartment.ApartmentName,
+                             RentalUnit.UnitID, RentalUnit.Label)
+            .outerjoin(RentalUnit, RentalUnit.ApartmentID == Apartment.ApartmentID)
+            .filter(Apartment.UserID == user_id)
+            .all())
+
+    apartment_name, unit_apartment, unit_label = {}, {}, {}
+    for apt_id, apt_name, unit_id, label in rows:
+        apartment_name[apt_id] = apt_name
+        if unit_id is not None:
+            unit_apartment[unit_id] = apt_id
+            unit_label[unit_id] = label
+
+    return LandlordScope(
+        frozenset(apartment_name), frozenset(unit_apartment),
+        unit_apartment, unit_label, apartment_name
+    )
+
+
+def landlord_scope(user_id: int, apartment_id: int | None = None) -> LandlordScope:
+    """
+    Returns the landlord's LandlordScope from a single column-only query.
+    Memoized per process; invalidated by version bump or after SCOPE_CACHE_TTL.
+    With apartment_id, the cached scope is narrowed in memory (empty if not owned).
+    """
+    now = time.monotonic()
+    with _lock:
+        version = _versions.get(user_id, 0)
+        hit = _cache.get(user_id)
+
+    if hit and hit[0] == version and hit[1] > now:
+        scope = hit[2]
+    else:
+        scope = _load_scope(user_id)
+        with _lock:
+            # Only store if nobody invalidated while we were loading
+            if _versions.get(user_id, 0) == version:
+                _cache[user_id] = (version, now + SCOPE_CACHE_TTL, scope)
+
+    if apartment_id:
+        return narrow_scope(scope, apartment_id)
+    return scope
+
+
+def narrow_scope(scope: LandlordScope, apartment_id: int) -> LandlordScope:
+    if apartment_id not in scope.apartment_ids:
+        return LandlordScope(frozenset(), frozenset(), {}, {}, {})
+    unit_apartment = {u: a for u, a in scope.unit_apartment.items()
+                      if a == apartment_id}
+    return LandlordScope(
+        frozenset([apartment_id]), frozenset(unit_apartment),
+        unit_apartment,
+        {u: scope.unit_label[u] for u in unit_apartment},
+        {apartment_id: scope.apartment_name[apartment_id]}
+    )
+
+
+def invalidate_landlord_scope(user_id: int | None = None):
+    """Bump one landlord's scope version (or drop every cached scope)."""
+    with _lock:
+        if user_id is None:
+            _cache.clear()
+            for uid in _versions:
+                _versions[uid] += 1
+        else:
+            _versions[user_id] = _versions.get(user_id, 0) + 1
+            _cache.pop(user_id, None)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Query scopes: ownership as SQL (EXISTS / denormalized LandlordID)
+# instead of shipping unit/apartment ID lists back as IN (...) parameters.
+# ──────────────────────────────────────────────────────────────────────────────
+
+def apartment_owned(apartment_col, user_id: int, apartment_id: int | None = None):
+    """Criterion: apartment_col references an apartment owned by user_id."""
+    apt = aliased(Apartment)
+    cond = [apt.ApartmentID == apartment_col, apt.UserID == user_id]
+    if apartment_id:
+        cond.append(apt.ApartmentID == apartment_id)
+    return exists().where(*cond)
+
+
+def unit_owned(unit_col, user_id: int, apartment_id: int | None = None):
+    """Criterion: unit_col references a rental unit in one of user_id's apartments."""
+    unit, apt = aliased(RentalUnit), aliased(Apartment)
+    cond = [unit.UnitID == unit_col,
+            apt.ApartmentID == unit.ApartmentID,
+            apt.UserID == user_id]
+    if apartment_id:
+        cond.append(unit.ApartmentID == apartment_id)
+    return exists().where(*cond)
+
+
+def landlord_owned(model, user_id: int, apartment_id: int | None = None):
+    """
+    Criterion for TenantBill / RentPayment / PaymentAllocation using the
+    denormalized LandlordID (indexed). With apartment_id, the unit's apartment
+    is checked as well.
+    """
+    cond = model.LandlordID == user_id
+    if not apartment_id:
+        return cond
+    if model is PaymentAllocation:
+        bill = aliased(TenantBill)
+        return and_(cond, exists().where(
+            bill.BillID == PaymentAllocation.BillID,
+            unit_owned(bill.RentalUnitID, user_id, apartment_id)))
+    return and_(cond, unit_owned(model.RentalUnitID, user_id, apartment_id))
+
+
+def transfer_owned(user_id: int, apartment_id: int | None = None):
+    """Criterion: the transfer touched (from or to) one of user_id's units."""
+    return or_(unit_owned(TransferLog.OldUnitID, user_id, apartment_id),
+               unit_owned(TransferLog.NewUnitID, user_id, apartment_id))
+
+
+def backfill_landlord_ids() -> int:
+    """
+    Fill LandlordID on legacy TenantBill / RentPayment / PaymentAllocation rows
+    so landlord_owned() sees them. Idempotent; returns rows updated.
+    """
+    updated = 0
+    for model in (TenantBill, RentPayment):
+        owner = (select(Apartment.UserID)
+                 .join(RentalUnit, RentalUnit.ApartmentID == Apartment.ApartmentID)
+                 .where(RentalUnit.UnitID == model.RentalUnitID)
+                 .scalar_subquery())
+        res = db.session.execute(
+            update(model).where(model.LandlordID.is_(None)).values(LandlordID=owner))
+        updated += res.rowcount or 0
+
+    owner = (select(TenantBill.LandlordID)
+             .where(TenantBill.BillID == PaymentAllocation.BillID)
+             .scalar_subquery())
+    res = db.session.execute(
+        update(PaymentAllocation)
+        .where(PaymentAllocation.LandlordID.is_(None))
+        .values(LandlordID=owner))
+    updated += res.rowcount or 0
+
+    db.session.commit()
+    return updated
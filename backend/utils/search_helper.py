@@ -0,0 +1,427 @@
+# backend/utils/search_helper.py
+#
+# Ranked prefix / fuzzy search over tenants and activity events.
+#
+# Backends, picked once per process from the bound engine:
+#   sqlite      FTS5 external-content tables kept in sync by triggers
+#   postgresql  GIN-indexed to_tsvector('simple', ...) expressions
+#   mssql       full-text index (CHANGE_TRACKING AUTO) if Full-Text is installed
+#   trigram     in-process inverted trigram index (any other case), maintained
+#               from this process's Tenant / ActivityEvent flushes and rebuilt
+#               after TRIGRAM_INDEX_TTL so other workers' writes show up
+#
+# Phone / ID fragments (digit-only terms) are matched as substrings on every
+# backend: full-text indexes only match word prefixes, so the SQL backends
+# add a LIKE '%term%' predicate for them instead.
+#
+# Every backend exposes the same two shapes: a criterion to AND into an
+# existing query (so landlord scope and keyset paging stay in SQL) and a
+# ranked [(id, score)] list for /search.
+
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from sqlalchemy import Integer, Float, bindparam, column, event, select, text
+
+from models.models import db, Tenant, ActivityEvent
+from utils.scope_helper import landlord_scope, unit_owned
+
+SEARCH_MAX_TERMS = 8
+TRIGRAM_MIN_SCORE = 0.34     # share of query trigrams a fuzzy hit must contain
+TRIGRAM_INDEX_TTL = float(os.getenv("TRIGRAM_INDEX_TTL", "300"))
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# kind -> (table, key column, searchable columns)
+_DOCS = {
+    "tenants": ("Tenants", "TenantID", ("FullName", "Phone", "Email", "IDNumber")),
+    "activity": ("ActivityEvents", "EventID", ("SearchText",)),
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _terms(q: str) -> list[str]:
+    return _TOKEN_RE.findall((q or "").lower())[:SEARCH_MAX_TERMS]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Backend selection / DDL
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _sqlite_setup(conn):
+    for kind, (tbl, key, cols) in _DOCS.items():
+        fts = f"{tbl}FTS"
+        col_list = ", ".join(cols)
+        new_vals = ", ".join(f"new.{c}" for c in cols)
+        old_vals = ", ".join(f"old.{c}" for c in cols)
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"), {"n": fts}).first()
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{col_list}, content='{tbl}', content_rowid='{key}', prefix='2 3')"))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tbl} BEGIN "
+            f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.{key}, {new_vals}); END"))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tbl} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.{key}, {old_vals}); END"))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {tbl} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.{key}, {old_vals}); "
+            f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.{key}, {new_vals}); END"))
+        if not exists:
+            conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def _pg_vector(cols) -> str:
+    joined = " || ' ' || ".join(f'coalesce("{c}", \'\')' for c in cols)
+    return f"to_tsvector('simple', {joined})"
+
+
+def _pg_setup(conn):
+    for kind, (tbl, key, cols) in _DOCS.items():
+        conn.execute(text(
+            f'CREATE INDEX IF NOT EXISTS ix_{tbl.lower()}_fts ON "{tbl}" '
+            f"USING gin ({_pg_vector(cols)})"))
+
+
+def _mssql_setup(conn) -> bool:
+    installed = conn.execute(text(
+        "SELECT CAST(FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') AS INT)")).scalar()
+    if not installed:
+        return False
+    conn.execute(text(
+        "IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'NyumbaSmartFT') "
+        "CREATE FULLTEXT CATALOG NyumbaSmartFT"))
+    for kind, (tbl, key, cols) in _DOCS.items():
+        pk = conn.execute(text(
+            "SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID(:t) AND is_primary_key = 1"),
+            {"t": tbl}).scalar()
+        conn.execute(text(
+            f"IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('{tbl}')) "
+            f"CREATE FULLTEXT INDEX ON [{tbl}] ({', '.join(cols)}) KEY INDEX [{pk}] "
+            f"ON NyumbaSmartFT WITH CHANGE_TRACKING AUTO"))
+    return True
+
+
+def ensure_search_index() -> str:
+    """
+    Pick the search backend for this process and create its DB objects
+    (idempotent). Returns the backend name. Full-text DDL cannot run inside
+    a transaction, so it uses an AUTOCOMMIT connection.
+    """
+    global _backend
+    if _backend:
+        return _backend
+    with _backend_lock:
+        if _backend:
+            return _backend
+        dialect = db.engine.dialect.name
+        chosen = "trigram"
+        try:
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                if dialect == "sqlite":
+                    _sqlite_setup(conn)
+                    chosen = "sqlite"
+                elif dialect == "postgresql":
+                    _pg_setup(conn)
+                    chosen = "postgresql"
+                elif dialect == "mssql" and _mssql_setup(conn):
+                    chosen = "mssql"
+        except Exception as e:
+            print(f"⚠️ Full-text search unavailable ({e}); using in-process trigram index.")
+            chosen = "trigram"
+        _backend = chosen
+        return _backend
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# SQL backends: (k, r) subquery of matching keys and their rank
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _quote(backend: str, name: str) -> str:
+    return f"[{name}]" if backend == "mssql" else f'"{name}"'
+
+
+def _fts_sql(backend: str, kind: str, terms: list[str]):
+    tbl, key, cols = _DOCS[kind]
+    if backend == "sqlite":
+        fts = f"{tbl}FTS"
+        expr = " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+        sql = (f"SELECT rowid AS k, -bm25({fts}) AS r FROM {fts} "
+               f"WHERE {fts} MATCH :fts_q")
+    elif backend == "postgresql":
+        expr = " & ".join(f"{t}:*" for t in terms)
+        vec = _pg_vector(cols)
+        sql = (f'SELECT "{key}" AS k, ts_rank({vec}, to_tsquery(\'simple\', :fts_q)) AS r '
+               f'FROM "{tbl}" WHERE {vec} @@ to_tsquery(\'simple\', :fts_q)')
+    else:  # mssql
+        expr = " AND ".join(f'"{t}*"' for t in terms)
+        sql = (f"SELECT [KEY] AS k, CAST([RANK] AS FLOAT) AS r "
+               f"FROM CONTAINSTABLE([{tbl}], ({', '.join(cols)}), :fts_q)")
+    return sql, expr
+
+
+def _match_subquery(backend: str, kind: str, terms: list[str]):
+    """
+    Word terms go through the full-text index (prefix match); digit-only terms
+    are ANDed in as LIKE '%term%' over the searchable columns, so '5678'
+    still finds 0712345678.
+    """
+    tbl, key, cols = _DOCS[kind]
+    words = [t for t in terms if not t.isdigit()]
+    digits = [t for t in terms if t.isdigit()]
+    params = {}
+
+    if words:
+        sql, params["fts_q"] = _fts_sql(backend, kind, words)
+    if digits:
+        like = " AND ".join(
+            "(" + " OR ".join(f"d.{_quote(backend, c)} LIKE :digits_{i}" for c in cols) + ")"
+            for i in range(len(digits)))
+        params.update({f"digits_{i}": f"%{t}%" for i, t in enumerate(digits)})
+        key_q = _quote(backend, key)
+        if words:
+            sql = (f"SELECT m.k AS k, m.r AS r FROM ({sql}) m "
+                   f"JOIN {_quote(backend, tbl)} d ON d.{key_q} = m.k WHERE {like}")
+        else:
+            sql = (f"SELECT d.{key_q} AS k, CAST(1 AS FLOAT) AS r "
+                   f"FROM {_quote(backend, tbl)} d WHERE {like}")
+
+    return (text(sql).bindparams(**params)
+            .columns(column("k", Integer), column("r", Float))
+            .subquery(f"{kind}_match"))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Trigram fallback
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index trigram -> doc ids, plus per-doc tokens for prefix bonus.
+    `owner` is whatever the caller scopes by (RentalUnitID / LandlordID).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.postings = defaultdict(set)
+        self.by_owner = defaultdict(set)
+        self.docs = {}    # doc_id -> (owner, tokens)
+
+    def add(self, doc_id: int, owner, text_value: str):
+        tokens = tuple(_TOKEN_RE.findall((text_value or "").lower()))
+        with self._lock:
+            self.remove(doc_id)
+            self.docs[doc_id] = (owner, tokens)
+            self.by_owner[owner].add(doc_id)
+            for tok in tokens:
+                for g in _trigrams(tok):
+                    self.postings[g].add(doc_id)
+
+    def remove(self, doc_id: int):
+        with self._lock:
+            old = self.docs.pop(doc_id, None)
+            if not old:
+                return
+            self.by_owner[old[0]].discard(doc_id)
+            for tok in old[1]:
+                for g in _trigrams(tok):
+                    self.postings[g].discard(doc_id)
+
+    def _digit_scores(self, term: str, allowed: set) -> dict:
+        """
+        Phone / ID fragments are not typo-tolerant: every inner trigram must be
+        present (substring match), found by intersecting smallest-first.
+        """
+        grams = sorted((self.postings.get(term[i:i + 3], set())
+                        for i in range(len(term) - 2)), key=len)
+        found = allowed
+        for posting in grams:
+            found = found & posting
+            if not found:
+                return {}
+        return {d: 1.0 + (1.0 if any(t.startswith(term) for t in self.docs[d][1]) else 0.0)
+                for d in found}
+
+    def _term_scores(self, term: str, allowed: set) -> dict:
+        if term.isdigit() and len(term) >= 3:
+            return self._digit_scores(term, allowed)
+        grams = _trigrams(term)
+        hits = Counter()
+        for g in grams:
+            posting = self.postings.get(g)
+            if not posting:
+                continue
+            # set intersection runs in C and is bounded by the smaller side
+            hits.update(posting & allowed if len(allowed) < len(posting) else
+                        (d for d in posting if d in allowed))
+
+        scores = {}
+        min_hits = TRIGRAM_MIN_SCORE * len(grams)
+        for doc_id, n in hits.items():
+            if n < min_hits:
+                continue
+            prefix = any(tok.startswith(term) for tok in self.docs[doc_id][1])
+            scores[doc_id] = n / len(grams) + (1.0 if prefix else 0.0)
+        return scores
+
+    def search(self, terms: list[str], owners, limit: int | None) -> list[tuple[int, float]]:
+        """
+        Every term must hit (fuzzily) for a doc to match. Score is the mean
+        share of each term's trigrams found, +1 per term that is an exact prefix.
+        Postings are intersected with the owners' docs first, so cost follows
+        the landlord's portfolio rather than the whole index. limit=None
+        returns every hit.
+        """
+        with self._lock:
+            allowed = set().union(*(self.by_owner.get(o, ()) for o in owners))
+            totals = None
+            for term in terms:
+                per_term = self._term_scores(term, allowed)
+                if totals is None:
+                    totals = per_term
+                else:
+                    totals = {d: totals[d] + sc for d, sc in per_term.items() if d in totals}
+                if not totals:
+                    return []
+                allowed = set(totals)
+        ranked = sorted(((d, sc / len(terms)) for d, sc in totals.items()),
+                        key=lambda x: (-x[1], -x[0]))
+        return ranked[:limit]
+
+
+_trigram = {}    # kind -> (expires_at, TrigramIndex), built lazily
+_trigram_lock = threading.Lock()
+
+
+def _live_index(kind: str) -> TrigramIndex | None:
+    hit = _trigram.get(kind)
+    if hit is None or hit[0] <= time.monotonic():
+        return None
+    return hit[1]
+
+
+def _tenant_text(t) -> str:
+    return " ".join(filter(None, (t.FullName, t.Phone, t.Email, t.IDNumber)))
+
+
+def _trigram_index(kind: str) -> TrigramIndex:
+    idx = _live_index(kind)
+    if idx is not None:
+        return idx
+    with _trigram_lock:
+        idx = _live_index(kind)
+        if idx is not None:
+            return idx
+        idx = TrigramIndex()
+        if kind == "tenants":
+            rows = db.session.query(Tenant.TenantID, Tenant.RentalUnitID, Tenant.FullName,
+                                    Tenant.Phone, Tenant.Email, Tenant.IDNumber)
+            for tid, unit_id, *fields in rows.yield_per(2000):
+                idx.add(tid, unit_id, " ".join(filter(None, fields)))
+        else:
+            rows = db.session.query(ActivityEvent.EventID, ActivityEvent.LandlordID,
+                                    ActivityEvent.SearchText)
+            for eid, landlord_id, body in rows.yield_per(2000):
+                idx.add(eid, landlord_id, body or "")
+        _trigram[kind] = (time.monotonic() + TRIGRAM_INDEX_TTL, idx)
+        return idx
+
+
+def invalidate_trigram_index(kind: str | None = None):
+    """Drop the in-process index after bulk writes that skip ORM events."""
+    with _trigram_lock:
+        if kind:
+            _trigram.pop(kind, None)
+        else:
+            _trigram.clear()
+
+
+@event.listens_for(Tenant, "after_insert")
+@event.listens_for(Tenant, "after_update")
+def _tenant_written(mapper, connection, target):
+    idx = _live_index("tenants")
+    if idx is not None:
+        idx.add(target.TenantID, target.RentalUnitID, _tenant_text(target))
+
+
+@event.listens_for(Tenant, "after_delete")
+def _tenant_deleted(mapper, connection, target):
+    idx = _live_index("tenants")
+    if idx is not None:
+        idx.remove(target.TenantID)
+
+
+@event.listens_for(ActivityEvent, "after_insert")
+def _activity_written(mapper, connection, target):
+    idx = _live_index("activity")
+    if idx is not None:
+        idx.add(target.EventID, target.LandlordID, target.SearchText or "")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _owners(kind: str, user_id: int):
+    """Owner keys a landlord may see in the trigram index."""
+    if kind == "tenants":
+        return landlord_scope(user_id).unit_ids
+    return {user_id}
+
+
+def search_criterion(kind: str, q: str, user_id: int):
+    """
+    Criterion restricting Tenant.TenantID / ActivityEvent.EventID to search
+    hits (all of them, uncapped), or None when q has no searchable terms.
+    """
+    terms = _terms(q)
+    if not terms:
+        return None
+    key_col = Tenant.TenantID if kind == "tenants" else ActivityEvent.EventID
+    backend = ensure_search_index()
+    if backend == "trigram":
+        hits = _trigram_index(kind).search(terms, _owners(kind, user_id), None)
+        # every hit, inlined: a big portfolio can exceed the driver's bind-parameter limit
+        return key_col.in_(bindparam("search_ids", [doc_id for doc_id, _ in hits],
+                                     expanding=True, literal_execute=True, unique=True))
+    match = _match_subquery(backend, kind, terms)
+    return key_col.in_(select(match.c.k))
+
+
+def search_ranked(kind: str, q: str, user_id: int, limit: int = 20,
+                  fuzzy: bool = True) -> list[tuple[int, float]]:
+    """
+    Best-first [(id, score)] within the landlord's scope. SQL backends do
+    prefix matching (substring for digit-only terms); with fuzzy=True an empty result falls back to the
+    trigram index (typos such as 'kamua' -> 'Kamau').
+    """
+    terms = _terms(q)
+    if not terms:
+        return []
+    backend = ensure_search_index()
+    if backend != "trigram":
+        match = _match_subquery(backend, kind, terms)
+        if kind == "tenants":
+            stmt = (select(Tenant.TenantID, match.c.r)
+                    .join(match, match.c.k == Tenant.TenantID)
+                    .where(unit_owned(Tenant.RentalUnitID, user_id)))
+        else:
+            stmt = (select(ActivityEvent.EventID, match.c.r)
+                    .join(match, match.c.k == ActivityEvent.EventID)
+                    .where(ActivityEvent.LandlordID == user_id))
+        rows = db.session.execute(stmt.order_by(match.c.r.desc()).limit(limit)).all()
+        if rows or not fuzzy:
+            return [(k, float(r or 0)) for k, r in rows]
+    return _trigram_index(kind).search(terms, _owners(kind, user_id), limit)
@@ -0,0 +1,224 @@
+# backend/utils/statement_helper.py
+#
+# Tenant statements: bills (debits) and payments (credits) in a date window,
+# read with two column-only, SQL-filtered queries and merged into one
+# chronological ledger with a running balance in a single pass.
+#
+# A bill's TotalAmountDue already includes the balance carried forward from
+# earlier months, so the ledger debits only the new charges
+# (TotalAmountDue - CarriedForwardBalance); the running balance carries the
+# rest.
+#
+# Statements that end before the current month cannot gain new bills, so they
+# are cached per process. Any bill/payment write for the tenant bumps its
+# version; STATEMENT_CACHE_TTL bounds staleness from other workers.
+
+import heapq
+import io
+import os
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import event, func
+
+from models.models import db, TenantBill, RentPayment
+from utils.date_helper import day_bounds, day_range
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+except ImportError:  # optional: PDF statements
+    SimpleDocTemplate = None
+
+STATEMENT_CACHE_TTL = float(os.getenv("STATEMENT_CACHE_TTL", "600"))
+
+LEDGER_HEADER = ["Date", "Type", "BillingMonth", "Reference", "Debit", "Credit", "Balance"]
+
+_cache = {}     # (tenant_id, d_from, d_to) -> (version, expires_at, statement)
+_versions = {}  # tenant_id -> int
+_lock = threading.Lock()
+
+ZERO = Decimal("0.00")
+
+
+def _money(v) -> Decimal:
+    return Decimal(str(v or 0)).quantize(Decimal("0.01"))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cache invalidation
+# ──────────────────────────────────────────────────────────────────────────────
+
+def invalidate_statements(tenant_id: int | None = None):
+    with _lock:
+        if tenant_id is None:
+            _cache.clear()
+            for tid in _versions:
+                _versions[tid] += 1
+        else:
+            _versions[tenant_id] = _versions.get(tenant_id, 0) + 1
+
+
+def _ledger_written(mapper, connection, target):
+    invalidate_statements(target.TenantID)
+
+
+for _model in (TenantBill, RentPayment):
+    for _evt in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _evt, _ledger_written)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Ledger
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _opening_balance(tenant_id: int, d_from: date | None) -> Decimal:
+    """Everything billed minus everything paid before d_from."""
+    if not d_from:
+        return ZERO
+    start, _ = day_bounds(d_from, None)
+    billed = (db.session.query(func.coalesce(func.sum(
+                TenantBill.TotalAmountDue - func.coalesce(TenantBill.CarriedForwardBalance, 0)), 0))
+              .filter(TenantBill.TenantID == tenant_id, TenantBill.IssuedDate < start)
+              .scalar())
+    paid = (db.session.query(func.coalesce(func.sum(RentPayment.AmountPaid), 0))
+            .filter(RentPayment.TenantID == tenant_id, RentPayment.PaymentDate < start)
+            .scalar())
+    return _money(billed) - _money(paid)
+
+
+def _bill_entries(tenant_id, d_from, d_to):
+    q = (db.session.query(TenantBill.BillID, TenantBill.IssuedDate, TenantBill.BillingMonth,
+                          TenantBill.TotalAmountDue, TenantBill.CarriedForwardBalance,
+                          TenantBill.BillStatus)
+         .filter(TenantBill.TenantID == tenant_id))
+    window = day_range(TenantBill.IssuedDate, d_from, d_to)
+    if window is not None:
+        q = q.filter(window)
+    for bill_id, issued, label, total, carried, status in q.order_by(
+            TenantBill.IssuedDate.asc(), TenantBill.BillID.asc()):
+        yield (issued, 0, bill_id), {
+            "Date": issued.strftime("%Y-%m-%d %H:%M:%S") if issued else None,
+            "Type": "Bill", "BillingMonth": label, "Reference": f"BILL-{bill_id}",
+            "Debit": _money(total) - _money(carried), "Credit": ZERO,
+            "_bill": {"Issued": issued.strftime("%Y-%m-%d") if issued else None,
+                      "BillingMonth": label, "TotalAmountDue": total, "Status": status},
+        }
+
+
+def _payment_entries(tenant_id, d_from, d_to):
+    q = (db.session.query(RentPayment.PaymentID, RentPayment.PaymentDate, RentPayment.BillingMonth,
+                          RentPayment.AmountPaid, RentPayment.PaidViaMobile, RentPayment.TxRef,
+                          RentPayment.Balance)
+         .filter(RentPayment.TenantID == tenant_id))
+    window = day_range(RentPayment.PaymentDate, d_from, d_to)
+    if window is not None:
+        q = q.filter(window)
+    for pay_id, paid_at, label, amount, method, txref, balance_after in q.order_by(
+            RentPayment.PaymentDate.asc(), RentPayment.PaymentID.asc()):
+        yield (paid_at, 1, pay_id), {
+            "Date": paid_at.strftime("%Y-%m-%d %H:%M:%S") if paid_at else None,
+            "Type": "Payment", "BillingMonth": label,
+            "Reference": txref or f"{method or 'PAY'}-{pay_id}",
+            "Debit": ZERO, "Credit": _money(amount),
+            "_payment": {"Date": paid_at.strftime("%Y-%m-%d %H:%M:%S") if paid_at else None,
+                         "BillingMonth": label, "AmountPaid": amount,
+                         "Method": method, "BalanceAfter": balance_after},
+        }
+
+
+def _build(tenant_id: int, d_from: date | None, d_to: date | None) -> dict:
+    opening = running = _opening_balance(tenant_id, d_from)
+    billed = paid = ZERO
+    ledger, bills, payments = [], [], []
+
+    merged = heapq.merge(_bill_entries(tenant_id, d_from, d_to),
+                         _payment_entries(tenant_id, d_from, d_to),
+                         key=lambda kv: (kv[0][0] or datetime.min, kv[0][1], kv[0][2]))
+    for _, entry in merged:
+        running += entry["Debit"] - entry["Credit"]
+        billed += entry["Debit"]
+        paid += entry["Credit"]
+        if "_bill" in entry:
+            bills.append(entry.pop("_bill"))
+        else:
+            payments.append(entry.pop("_payment"))
+        entry["Balance"] = running
+        ledger.append({k: (float(v) if isinstance(v, Decimal) else v) for k, v in entry.items()})
+
+    return {
+        "OpeningBalance": float(opening),
+        "TotalBilled": float(billed),
+        "TotalPaid": float(paid),
+        "ClosingBalance": float(running),
+        "Ledger": ledger,
+        "Bills": bills,
+        "Payments": payments,
+    }
+
+
+def tenant_statement(tenant_id: int, d_from: date | None = None,
+                     d_to: date | None = None) -> dict:
+    """Statement for [d_from, d_to] (inclusive days; either side may be open)."""
+    closed = d_to is not None and d_to < date.today().replace(day=1)
+    if not closed:
+        return _build(tenant_id, d_from, d_to)
+
+    key = (tenant_id, d_from, d_to)
+    now = time.monotonic()
+    with _lock:
+        version = _versions.get(tenant_id, 0)
+        hit = _cache.get(key)
+    if hit and hit[0] == version and hit[1] > now:
+        return hit[2]
+
+    statement = _build(tenant_id, d_from, d_to)
+    with _lock:
+        if _versions.get(tenant_id, 0) == version:
+            _cache[key] = (version, now + STATEMENT_CACHE_TTL, statement)
+    return statement
+
+
+def ledger_rows(statement: dict):
+    for e in statement["Ledger"]:
+        yield [e[h] for h in LEDGER_HEADER]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# PDF
+# ──────────────────────────────────────────────────────────────────────────────
+
+def pdf_available() -> bool:
+    return SimpleDocTemplate is not None
+
+
+def render_statement_pdf(statement: dict, title: str, subtitle: str) -> bytes:
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4, title=title)
+    styles = getSampleStyleSheet()
+
+    rows = [LEDGER_HEADER]
+    rows.append(["", "Opening balance", "", "", "", "", f"{statement['OpeningBalance']:,.2f}"])
+    for e in statement["Ledger"]:
+        rows.append([e["Date"] or "", e["Type"], e["BillingMonth"] or "", e["Reference"],
+                     f"{e['Debit']:,.2f}" if e["Debit"] else "",
+                     f"{e['Credit']:,.2f}" if e["Credit"] else "",
+                     f"{e['Balance']:,.2f}"])
+    rows.append(["", "Closing balance", "", "", f"{statement['TotalBilled']:,.2f}",
+                 f"{statement['TotalPaid']:,.2f}", f"{statement['ClosingBalance']:,.2f}"])
+
+    table = Table(rows, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("ALIGN", (4, 1), (-1, -1), "RIGHT"),
+        ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.black),
+        ("LINEABOVE", (0, -1), (-1, -1), 0.5, colors.black),
+    ]))
+    doc.build([Paragraph(title, styles["Title"]), Paragraph(subtitle, styles["Normal"]),
+               Spacer(1, 12), table])
+    return buf.getvalue()
@@ -0,0 +1,559 @@
+# backend/utils/tenant_bulk_helper.py
+#
+# Bulk tenant operations: onboarding (POST /tenants/bulk, /tenants/import),
+# vacating (POST /tenants/vacate/bulk) and transfers (POST
+# /tenants/transfer/bulk).
+#
+# Validation is set-based: the affected tenants and units are read with one
+# query each, ownership is checked against the landlord's cached scope, and
+# rows that fail are reported by position and left out. The rest are applied
+# with a fixed number of statements whatever the batch size, e.g. onboarding:
+#
+#   INSERT Tenants (executemany, RETURNING TenantID)
+#   UPDATE RentalUnits SET StatusID = occupied, CurrentTenantID = CASE ...
+#          WHERE UnitID IN (...) AND StatusID = vacant          (one statement)
+#   INSERT OutgoingMessages (welcome SMS, executemany)
+#
+# in a single transaction. The UPDATEs carry the state they were validated
+# against in their WHERE clause; if a concurrent request changed a row they
+# touch fewer rows than expected and the whole batch is rolled back
+# (BulkConflict).
+#
+# Core statements skip ORM events, so PhoneE164 and the activity feed rows are
+# written here and the search indexes are invalidated after commit.
+
+import re
+from datetime import datetime
+
+from sqlalchemy import case, insert, or_, select, update
+
+from models.models import (
+    db, RentalUnit, Tenant, OutgoingMessage, TransferLog, VacateLog, ActivityEvent
+)
+from utils.activity_helper import EVENT_TRANSFER, EVENT_VACATE, search_text
+from utils.phone_helper import canonical_phone, legacy_phone
+from utils.scope_helper import landlord_scope
+from utils.search_helper import invalidate_trigram_index
+from utils.unit_status_helper import status_id, VACANT, OCCUPIED
+
+MAX_ROWS = 1000
+
+TENANT_PHONE_RE = re.compile(r'^\+2547\d{8}$')
+
+FIELDS = ("FullName", "Phone", "Email", "IDNumber", "RentalUnitID", "Unit", "MoveInDate")
+
+
+class BulkConflict(Exception):
+    """The batch could not be applied as validated (e.g. a unit was taken)."""
+
+
+def _first_name(full_name: str | None) -> str:
+    return full_name.split(' ')[0] if full_name else "Tenant"
+
+
+def welcome_body(full_name: str, apartment_name: str, unit_label: str, rent, move_in) -> str:
+    return (
+        f"Welcome {_first_name(full_name)}! You're set for "
+        f"{apartment_name} {unit_label}. Monthly rent: KES {rent}. "
+        f"Move-in: {move_in.strftime('%Y-%m-%d')}."
+    )
+
+
+def transfer_body(full_name: str, old_apartment: str, old_label: str,
+                  new_apartment: str, new_label: str, move_in, rent) -> str:
+    if old_apartment == new_apartment:
+        moved = (f"your unit in {new_apartment} has been changed "
+                 f"from {old_label} to {new_label}. ")
+    else:
+        moved = (f"your unit has been changed from {old_apartment} {old_label} "
+                 f"to {new_apartment} {new_label}. ")
+    return (
+        f"Hi {_first_name(full_name)}, {moved}"
+        f"Move-in: {move_in.strftime('%Y-%m-%d')}"
+        f"{f'. Monthly rent: KES {rent}.' if rent is not None else '.'}"
+    )
+
+
+def vacate_body(full_name: str, apartment_name: str, unit_label: str, when) -> str:
+    return (
+        f"Hi {_first_name(full_name)}, your move-out from {apartment_name} {unit_label} "
+        f"was recorded on {when.strftime('%Y-%m-%d')}. Thank you for staying with us."
+    )
+
+
+def _parse(row: dict, scope, apartment_id: int | None, labels: dict):
+    """Validated values for one row, or raises ValueError."""
+    def get(key):
+        v = row.get(key)
+        return str(v).strip() if v is not None else ""
+
+    full_name, raw_phone, id_number = get("FullName"), get("Phone"), get("IDNumber")
+    move_in_in = get("MoveInDate")
+    unit_in, label_in = get("RentalUnitID"), get("Unit")
+    if not all([full_name, raw_phone, id_number, unit_in or label_in, move_in_in]):
+        raise ValueError("All required fields must be filled.")
+
+    phone = canonical_phone(raw_phone)
+    if not phone or not TENANT_PHONE_RE.match(phone):
+        raise ValueError("Invalid phone. Use 07XXXXXXXX, 7XXXXXXXXX, 2547XXXXXXXX or +2547XXXXXXXX.")
+
+    try:
+        move_in = datetime.strptime(move_in_in, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD.")
+
+    if unit_in:
+        try:
+            unit_id = int(unit_in)
+        except ValueError:
+            raise ValueError("RentalUnitID must be a number.")
+        if unit_id not in scope.unit_ids:
+            raise ValueError("Rental unit not found.")
+    else:
+        if not apartment_id:
+            raise ValueError("Unit labels need an apartment_id.")
+        unit_id = labels.get(label_in.lower())
+        if unit_id is None:
+            raise ValueError(f"Unit '{label_in}' not found in this apartment.")
+
+    return {
+        "FullName": full_name[:100],
+        "Phone": legacy_phone(phone),
+        "PhoneE164": phone,
+        "Email": get("Email")[:100] or None,
+        "IDNumber": id_number[:50],
+        "RentalUnitID": unit_id,
+        "MoveInDate": move_in,
+        "Status": "Active",
+    }
+
+
+def onboard_tenants(user_id: int, rows: list[dict], apartment_id: int | None = None,
+                    send_welcome: bool = True, all_or_nothing: bool = False) -> dict:
+    """
+    Returns {"created": [...], "errors": [{"row", "message"}], "applied": bool}.
+    Row numbers are 1-based positions in `rows` unless a row carries "_row".
+    Raises BulkConflict when a unit was occupied concurrently (nothing applied).
+    """
+    vacant, occupied = status_id(VACANT), status_id(OCCUPIED)
+    scope = landlord_scope(user_id)
+    labels = {scope.unit_label[u].strip().lower(): u
+              for u, a in scope.unit_apartment.items()
+              if a == apartment_id and scope.unit_label.get(u)}
+
+    errors, valid = [], []
+    for pos, row in enumerate(rows, start=1):
+        n = row.get("_row", pos)
+        try:
+            valid.append((n, _parse(row, scope, apartment_id, labels)))
+        except ValueError as e:
+            errors.append({"row": n, "message": str(e)})
+
+    # in-batch conflicts: one tenant per unit, one row per (phone, ID)
+    seen_units, seen_keys, unique = {}, {}, []
+    for n, t in valid:
+        key = (t["PhoneE164"], t["IDNumber"])
+        if t["RentalUnitID"] in seen_units:
+            errors.append({"row": n, "message": f"Unit already assigned on row {seen_units[t['RentalUnitID']]}."})
+        elif key in seen_keys:
+            errors.append({"row": n, "message": f"Duplicate of row {seen_keys[key]}."})
+        else:
+            seen_units[t["RentalUnitID"]] = n
+            seen_keys[key] = n
+            unique.append((n, t))
+    valid = unique
+
+    # unit availability and existing tenants: one query each
+    unit_ids = [t["RentalUnitID"] for _, t in valid]
+    units = {uid: (status, rent) for uid, status, rent in
+             db.session.query(RentalUnit.UnitID, RentalUnit.StatusID, RentalUnit.MonthlyRent)
+             .filter(RentalUnit.UnitID.in_(unit_ids)).all()} if unit_ids else {}
+    phones = list({t["PhoneE164"] for _, t in valid})
+    existing = {(p, i): status for p, i, status in
+                db.session.query(Tenant.PhoneE164, Tenant.IDNumber, Tenant.Status)
+                .filter(Tenant.PhoneE164.in_(phones)).all()} if phones else {}
+
+    ready = []
+    for n, t in valid:
+        status = existing.get((t["PhoneE164"], t["IDNumber"]))
+        if status == "Active":
+            errors.append({"row": n, "message": "A tenant with this phone number is already active."})
+        elif status is not None:
+            errors.append({"row": n, "message": "Returning tenant: reassign them with /tenants/add."})
+        elif units.get(t["RentalUnitID"], (None,))[0] != vacant:
+            errors.append({"row": n, "message": "This unit is not available. Only vacant units can be assigned."})
+        else:
+            ready.append((n, t))
+
+    errors.sort(key=lambda e: e["row"])
+    if not ready or (all_or_nothing and errors):
+        return {"created": [], "errors": errors, "applied": False}
+
+    try:
+        ids = db.session.execute(
+            insert(Tenant).returning(Tenant.TenantID, sort_by_parameter_order=True),
+            [t for _, t in ready]).scalars().all()
+
+        by_unit = {t["RentalUnitID"]: tid for (_, t), tid in zip(ready, ids)}
+        res = db.session.execute(
+            update(RentalUnit)
+            .where(RentalUnit.UnitID.in_(list(by_unit)), RentalUnit.StatusID == vacant)
+            .values(StatusID=occupied,
+                    CurrentTenantID=case(by_unit, value=RentalUnit.UnitID))
+            .execution_options(synchronize_session=False))
+        if res.rowcount != len(by_unit):
+            raise BulkConflict("Some units were occupied while importing; nothing was saved.")
+
+        if send_welcome:
+            messages = []
+            for (_, t), tid in zip(ready, ids):
+                uid = t["RentalUnitID"]
+                apt_id = scope.unit_apartment[uid]
+                messages.append({
+                    "Channel": "SMS", "Status": "PENDING", "ToPhone": t["PhoneE164"],
+                    "Body": welcome_body(t["FullName"], scope.apartment_name.get(apt_id) or "",
+                                         scope.unit_label.get(uid) or "", units[uid][1],
+                                         t["MoveInDate"]),
+                    "UserID": user_id, "ApartmentID": apt_id, "UnitID": uid,
+                    "TenantID": tid, "RelatedModel": "Tenant", "RelatedID": tid,
+                })
+            db.session.execute(insert(OutgoingMessage), messages)
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    invalidate_trigram_index("tenants")
+
+    created = [{"row": n, "TenantID": tid, "FullName": t["FullName"],
+                "PhoneE164": t["PhoneE164"], "RentalUnitID": t["RentalUnitID"],
+                "RentalUnit": scope.unit_label.get(t["RentalUnitID"]),
+                "MoveInDate": t["MoveInDate"].strftime("%Y-%m-%d")}
+               for (n, t), tid in zip(ready, ids)]
+    return {"created": created, "errors": errors, "applied": True}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Vacate / transfer
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _tenant_ids(items: list[dict], errors: list) -> list:
+    """(row, item, TenantID) for items with a usable, unrepeated TenantID."""
+    out, seen = [], {}
+    for pos, item in enumerate(items, start=1):
+        try:
+            tid = int(item.get("TenantID"))
+        except (TypeError, ValueError):
+            errors.append({"row": pos, "message": "TenantID is required."})
+            continue
+        if tid in seen:
+            errors.append({"row": pos, "message": f"Duplicate of row {seen[tid]}."})
+            continue
+        seen[tid] = pos
+        out.append((pos, item, tid))
+    return out
+
+
+def _load_tenants(ids) -> dict:
+    """{TenantID: row} with the tenant's current unit, one query."""
+    if not ids:
+        return {}
+    rows = db.session.execute(
+        select(Tenant.TenantID, Tenant.FullName, Tenant.Status, Tenant.PhoneE164,
+               Tenant.SmsOptOut, Tenant.RentalUnitID,
+               RentalUnit.StatusID, RentalUnit.MonthlyRent)
+        .outerjoin(RentalUnit, RentalUnit.UnitID == Tenant.RentalUnitID)
+        .where(Tenant.TenantID.in_(list(ids)))).all()
+    return {r.TenantID: r for r in rows}
+
+
+def _notify(t) -> bool:
+    return bool(t.PhoneE164) and not t.SmsOptOut
+
+
+def _finish(errors: list, ready: list, all_or_nothing: bool) -> bool:
+    errors.sort(key=lambda e: e["row"])
+    return bool(ready) and not (all_or_nothing and errors)
+
+
+def apply_vacates(entries: list[dict], now: datetime, notify: bool = False) -> list[int]:
+    """
+    Vacate validated tenants in bulk; the caller commits (or rolls back).
+    entries: [{"TenantID", "UnitID", "ApartmentID", "LandlordID", "FullName",
+    "UnitLabel", "ApartmentName", "Phone" (None: no SMS), "Reason", "Notes",
+    "FreeUnit" (False when the unit is already vacant)}].
+    Returns the VacateLog IDs in entry order. Raises BulkConflict when a
+    tenant or unit no longer matches what was validated.
+    """
+    vacant = status_id(VACANT)
+    tids = [e["TenantID"] for e in entries]
+    units = {e["UnitID"] for e in entries if e["FreeUnit"]}
+
+    res = db.session.execute(
+        update(Tenant)
+        .where(Tenant.TenantID.in_(tids), Tenant.Status == "Active")
+        .values(Status="Inactive", MoveOutDate=now.date())
+        .execution_options(synchronize_session=False))
+    if res.rowcount != len(tids):
+        raise BulkConflict("Some tenants changed while vacating; nothing was saved.")
+    if units:
+        res = db.session.execute(
+            update(RentalUnit)
+            .where(RentalUnit.UnitID.in_(list(units)), RentalUnit.StatusID != vacant)
+            .values(StatusID=vacant, CurrentTenantID=None)
+            .execution_options(synchronize_session=False))
+        if res.rowcount != len(units):
+            raise BulkConflict("Some units changed while vacating; nothing was saved.")
+
+    log_ids = db.session.execute(
+        insert(VacateLog).returning(VacateLog.LogID, sort_by_parameter_order=True),
+        [{"TenantID": e["TenantID"], "UnitID": e["UnitID"], "ApartmentID": e["ApartmentID"],
+          "VacatedBy": e["LandlordID"], "VacateDate": now,
+          "Reason": e["Reason"], "Notes": e["Notes"]} for e in entries]).scalars().all()
+
+    events, messages = [], []
+    for e, log_id in zip(entries, log_ids):
+        events.append({
+            "LandlordID": e["LandlordID"], "EventType": EVENT_VACATE, "SourceLogID": log_id,
+            "ApartmentID": e["ApartmentID"], "FromApartmentID": None,
+            "UnitID": e["UnitID"], "FromUnitID": None, "TenantID": e["TenantID"],
+            "Reason": e["Reason"], "Notes": e["Notes"], "OccurredAt": now,
+            "SearchText": search_text(e["Reason"], e["Notes"], e["FullName"], e["UnitLabel"]),
+        })
+        if notify and e["Phone"]:
+            messages.append({
+                "Channel": "SMS", "Status": "PENDING", "ToPhone": e["Phone"],
+                "Body": vacate_body(e["FullName"], e["ApartmentName"] or "",
+                                    e["UnitLabel"] or "", now),
+                "UserID": e["LandlordID"], "ApartmentID": e["ApartmentID"],
+                "UnitID": e["UnitID"], "TenantID": e["TenantID"],
+                "RelatedModel": "VacateLog", "RelatedID": log_id,
+            })
+    db.session.execute(insert(ActivityEvent), events)
+    if messages:
+        db.session.execute(insert(OutgoingMessage), messages)
+    return log_ids
+
+
+def vacate_tenants(user_id: int, items: list[dict], reason: str | None = None,
+                   notes: str | None = None, notify: bool = False,
+                   all_or_nothing: bool = False) -> dict:
+    """
+    Immediately vacate tenants. items: [{"TenantID", "Reason"?, "Notes"?}].
+    Returns {"vacated": [...], "errors": [{"row", "message"}], "applied": bool}.
+    Raises BulkConflict when a tenant or unit changed concurrently.
+    """
+    vacant = status_id(VACANT)
+    scope = landlord_scope(user_id)
+    errors = []
+    wanted = _tenant_ids(items, errors)
+    tenants = _load_tenants(tid for _, _, tid in wanted)
+
+    ready, units = [], set()
+    for n, item, tid in wanted:
+        t = tenants.get(tid)
+        if not t:
+            errors.append({"row": n, "message": "Tenant not found."})
+        elif t.RentalUnitID not in scope.unit_ids:
+            errors.append({"row": n, "message": "Unauthorized: You do not own the apartment for this unit."})
+        elif t.Status != "Active":
+            errors.append({"row": n, "message": "This tenant is already inactive."})
+        elif t.StatusID == vacant:
+            errors.append({"row": n, "message": "This unit is already vacant."})
+        elif t.RentalUnitID in units:
+            errors.append({"row": n, "message": "Another tenant in this batch is vacating the same unit."})
+        else:
+            units.add(t.RentalUnitID)
+            ready.append((n, item, t))
+
+    if not _finish(errors, ready, all_or_nothing):
+        return {"vacated": [], "errors": errors, "applied": False}
+
+    now = datetime.utcnow()
+    entries = []
+    for _, item, t in ready:
+        apt_id = scope.unit_apartment[t.RentalUnitID]
+        entries.append({
+            "TenantID": t.TenantID, "UnitID": t.RentalUnitID, "ApartmentID": apt_id,
+            "LandlordID": user_id, "FullName": t.FullName,
+            "UnitLabel": scope.unit_label.get(t.RentalUnitID),
+            "ApartmentName": scope.apartment_name.get(apt_id),
+            "Phone": t.PhoneE164 if _notify(t) else None,
+            "Reason": item.get("Reason", reason), "Notes": item.get("Notes", notes),
+            "FreeUnit": True,
+        })
+    try:
+        log_ids = apply_vacates(entries, now, notify)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    invalidate_trigram_index("tenants")
+    invalidate_trigram_index("activity")
+
+    vacated = [{"row": n, "LogID": log_id, "TenantID": e["TenantID"], "FullName": e["FullName"],
+                "UnitID": e["UnitID"], "RentalUnit": e["UnitLabel"],
+                "ApartmentID": e["ApartmentID"], "Reason": e["Reason"], "Notes": e["Notes"],
+                "VacateDate": now.strftime('%Y-%m-%d %H:%M:%S')}
+               for (n, _, _), e, log_id in zip(ready, entries, log_ids)]
+    return {"vacated": vacated, "errors": errors, "applied": True}
+
+
+def transfer_tenants(user_id: int, items: list[dict], reason: str | None = None,
+                     notify: bool = True, all_or_nothing: bool = False) -> dict:
+    """
+    Move tenants to other units of the same landlord (any apartment).
+    items: [{"TenantID", "NewRentalUnitID", "MoveInDate": "YYYY-MM-DD", "Reason"?}].
+    A target unit must be vacant, or be vacated by another move in the same
+    batch (rotations during renovations).
+    Returns {"transferred": [...], "errors": [{"row", "message"}], "applied": bool}.
+    Raises BulkConflict when a tenant or unit changed concurrently.
+    """
+    vacant, occupied = status_id(VACANT), status_id(OCCUPIED)
+    scope = landlord_scope(user_id)
+    errors = []
+    wanted = _tenant_ids(items, errors)
+
+    moves, targets = [], {}
+    for n, item, tid in wanted:
+        try:
+            new_unit = int(item.get("NewRentalUnitID"))
+            move_in = datetime.strptime(str(item.get("MoveInDate") or ""), "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            errors.append({"row": n, "message": "NewRentalUnitID and MoveInDate (YYYY-MM-DD) are required."})
+            continue
+        if new_unit not in scope.unit_ids:
+            errors.append({"row": n, "message": "Unauthorized: You can only transfer between your own units."})
+        elif new_unit in targets:
+            errors.append({"row": n, "message": f"Unit already assigned on row {targets[new_unit]}."})
+        else:
+            targets[new_unit] = n
+            moves.append((n, item, tid, new_unit, move_in))
+
+    tenants = _load_tenants(tid for _, _, tid, _, _ in moves)
+    statuses = dict(db.session.execute(
+        select(RentalUnit.UnitID, RentalUnit.StatusID)
+        .where(RentalUnit.UnitID.in_(list(targets)))).all()) if targets else {}
+    rents = {}
+
+    checked, moving_out = [], set()
+    for n, item, tid, new_unit, move_in in moves:
+        t = tenants.get(tid)
+        if not t:
+            errors.append({"row": n, "message": "Tenant not found."})
+        elif t.RentalUnitID not in scope.unit_ids:
+            errors.append({"row": n, "message": "Unauthorized: You can only transfer between your own units."})
+        elif t.Status != "Active":
+            errors.append({"row": n, "message": "Only active tenants can be transferred."})
+        elif t.RentalUnitID == new_unit:
+            errors.append({"row": n, "message": "Tenant already occupies this unit."})
+        elif t.RentalUnitID in moving_out:
+            errors.append({"row": n, "message": "Another tenant in this batch is moving out of the same unit."})
+        else:
+            moving_out.add(t.RentalUnitID)
+            checked.append((n, item, t, new_unit, move_in))
+
+    # a target is free if vacant or left by another move that is still valid;
+    # drop moves until that holds for every one left
+    ready = checked
+    while True:
+        leaving = {t.RentalUnitID for _, _, t, _, _ in ready}
+        keep = [m for m in ready if statuses.get(m[3]) == vacant or m[3] in leaving]
+        if len(keep) == len(ready):
+            break
+        for m in ready:
+            if m not in keep:
+                errors.append({"row": m[0], "message": "New unit is not available. Only vacant units can be assigned."})
+        ready = keep
+
+    if not _finish(errors, ready, all_or_nothing):
+        return {"transferred": [], "errors": errors, "applied": False}
+
+    now = datetime.utcnow()
+    by_tenant_unit = {t.TenantID: new_unit for _, _, t, new_unit, _ in ready}
+    by_tenant_date = {t.TenantID: move_in for _, _, t, _, move_in in ready}
+    by_tenant_old = {t.TenantID: t.RentalUnitID for _, _, t, _, _ in ready}
+    by_unit_tenant = {new_unit: t.TenantID for _, _, t, new_unit, _ in ready}
+    by_old_unit_tenant = {old: tid for tid, old in by_tenant_old.items()}
+    logs = [{"TenantID": t.TenantID, "OldUnitID": t.RentalUnitID, "NewUnitID": new_unit,
+             "TransferredBy": user_id, "TransferDate": now,
+             "Reason": item.get("Reason", reason)}
+            for _, item, t, new_unit, _ in ready]
+    try:
+        res = db.session.execute(
+            update(Tenant)
+            .where(Tenant.TenantID.in_(list(by_tenant_unit)), Tenant.Status == "Active",
+                   Tenant.RentalUnitID == case(by_tenant_old, value=Tenant.TenantID))
+            .values(RentalUnitID=case(by_tenant_unit, value=Tenant.TenantID),
+                    MoveInDate=case(by_tenant_date, value=Tenant.TenantID),
+                    MoveOutDate=None, Status="Active")
+            .execution_options(synchronize_session=False))
+        if res.rowcount != len(by_tenant_unit):
+            raise BulkConflict("Some tenants changed while transferring; nothing was saved.")
+
+        # free the old units first so rotations see their targets vacant;
+        # only while they still belong to the tenant moving out (or nobody)
+        res = db.session.execute(
+            update(RentalUnit)
+            .where(RentalUnit.UnitID.in_(list(by_old_unit_tenant)),
+                   or_(RentalUnit.CurrentTenantID.is_(None),
+                       RentalUnit.CurrentTenantID == case(by_old_unit_tenant,
+                                                          value=RentalUnit.UnitID)))
+            .values(StatusID=vacant, CurrentTenantID=None)
+            .execution_options(synchronize_session=False))
+        if res.rowcount != len(by_old_unit_tenant):
+            raise BulkConflict("Some units changed tenants while transferring; nothing was saved.")
+        res = db.session.execute(
+            update(RentalUnit)
+            .where(RentalUnit.UnitID.in_(list(by_unit_tenant)), RentalUnit.StatusID == vacant)
+            .values(StatusID=occupied,
+                    CurrentTenantID=case(by_unit_tenant, value=RentalUnit.UnitID))
+            .execution_options(synchronize_session=False))
+        if res.rowcount != len(by_unit_tenant):
+            raise BulkConflict("Some units were occupied while transferring; nothing was saved.")
+
+        log_ids = db.session.execute(
+            insert(TransferLog).returning(TransferLog.LogID, sort_by_parameter_order=True),
+            logs).scalars().all()
+
+        if notify:
+            rents = dict(db.session.execute(
+                select(RentalUnit.UnitID, RentalUnit.MonthlyRent)
+                .where(RentalUnit.UnitID.in_(list(by_unit_tenant)))).all())
+
+        events, messages = [], []
+        for (_, _, t, new_unit, move_in), log, log_id in zip(ready, logs, log_ids):
+            old_apt, new_apt = scope.unit_apartment[t.RentalUnitID], scope.unit_apartment[new_unit]
+            old_label, new_label = scope.unit_label.get(t.RentalUnitID), scope.unit_label.get(new_unit)
+            events.append({
+                "LandlordID": user_id, "EventType": EVENT_TRANSFER, "SourceLogID": log_id,
+                "ApartmentID": new_apt, "FromApartmentID": old_apt,
+                "UnitID": new_unit, "FromUnitID": t.RentalUnitID, "TenantID": t.TenantID,
+                "Reason": log["Reason"], "Notes": None, "OccurredAt": now,
+                "SearchText": search_text(log["Reason"], t.FullName, old_label, new_label),
+            })
+            if notify and _notify(t):
+                messages.append({
+                    "Channel": "SMS", "Status": "PENDING", "ToPhone": t.PhoneE164,
+                    "Body": transfer_body(t.FullName, scope.apartment_name.get(old_apt) or "",
+                                          old_label or "", scope.apartment_name.get(new_apt) or "",
+                                          new_label or "", move_in, rents.get(new_unit)),
+                    "UserID": user_id, "ApartmentID": new_apt, "UnitID": new_unit,
+                    "TenantID": t.TenantID, "RelatedModel": "TransferLog", "RelatedID": log_id,
+                })
+        db.session.execute(insert(ActivityEvent), events)
+        if messages:
+            db.session.execute(insert(OutgoingMessage), messages)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    invalidate_trigram_index("tenants")
+    invalidate_trigram_index("activity")
+
+    transferred = [{"row": n, "LogID": log_id, "TenantID": t.TenantID, "FullName": t.FullName,
+                    "FromUnitID": t.RentalUnitID, "FromUnit": scope.unit_label.get(t.RentalUnitID),
+                    "ToUnitID": new_unit, "ToUnit": scope.unit_label.get(new_unit),
+                    "MoveInDate": move_in.strftime('%Y-%m-%d'), "Reason": log["Reason"]}
+                   for (n, _, t, new_unit, move_in), log, log_id in zip(ready, logs, log_ids)]
+    return {"transferred": transferred, "errors": errors, "applied": True}
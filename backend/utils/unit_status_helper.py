@@ -0,0 +1,77 @@
+# backend/utils/unit_status_helper.py
+#
+# RentalUnitStatus name <-> ID registry. The statuses are a handful of rows
+# that almost never change, so they are read once (at startup, or on first
+# use) and looked up in memory instead of joining RentalUnitStatuses or
+# hard-coding IDs. Creating or renaming a status through the ORM drops the
+# registry; other workers pick the change up after UNIT_STATUS_TTL.
+#
+#   status_id(VACANT)    -> 1
+#   status_name(2)       -> "Occupied"
+
+import os
+import threading
+import time
+
+from sqlalchemy import event, select
+
+from models.models import db, RentalUnitStatus
+
+UNIT_STATUS_TTL = float(os.getenv("UNIT_STATUS_TTL", "3600"))
+
+VACANT, OCCUPIED, RESERVED = "Vacant", "Occupied", "Reserved"
+
+# IDs the seed data has always used; only consulted when the table lacks the row
+LEGACY_IDS = {VACANT: 1, OCCUPIED: 2}
+
+_registry = None   # (expires_at, {name_lower: id}, {id: name})
+_lock = threading.Lock()
+
+
+def load_unit_statuses() -> dict:
+    """(Re)load the registry with one query. Returns {StatusName: StatusID}."""
+    global _registry
+    rows = db.session.execute(
+        select(RentalUnitStatus.StatusID, RentalUnitStatus.StatusName)).all()
+    by_name = {name.strip().lower(): sid for sid, name in rows if name}
+    by_id = {sid: name for sid, name in rows}
+    with _lock:
+        _registry = (time.monotonic() + UNIT_STATUS_TTL, by_name, by_id)
+    return {name: sid for sid, name in rows}
+
+
+def invalidate_unit_statuses():
+    global _registry
+    with _lock:
+        _registry = None
+
+
+def _current():
+    hit = _registry
+    if hit is None or hit[0] <= time.monotonic():
+        load_unit_statuses()
+        hit = _registry
+    return hit
+
+
+def status_id(name: str) -> int | None:
+    """StatusID for a status name (case-insensitive); None if unknown."""
+    sid = _current()[1].get(name.strip().lower())
+    return sid if sid is not None else LEGACY_IDS.get(name)
+
+
+def status_name(sid: int | None) -> str | None:
+    if sid is None:
+        return None
+    name = _current()[2].get(sid)
+    if name is None:
+        name = next((n for n, i in LEGACY_IDS.items() if i == sid), None)
+    return name
+
+
+def _statuses_written(mapper, connection, target):
+    invalidate_unit_statuses()
+
+
+for _evt in ("after_insert", "after_update", "after_delete"):
+    event.listen(RentalUnitStatus, _evt, _statuses_written)
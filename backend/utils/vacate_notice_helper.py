@@ -0,0 +1,141 @@
+# backend/utils/vacate_notice_helper.py
+#
+# Completes vacate notices whose ExpectedVacateDate has arrived. A run works
+# in batches of BATCH_SIZE:
+#
+#   1. picks due notices with a seek on ix_vacate_notices_status_date
+#      (Status = 'Pending' AND ExpectedVacateDate <= as_of),
+#   2. claims them with one UPDATE ... SET Status = 'Completed'
+#      WHERE NoticeID IN (...) AND Status = 'Pending' RETURNING NoticeID,
+#   3. loads the claimed notices with their tenant, unit and apartment (one
+#      query) and vacates the tenants still living in the noticed unit with
+#      tenant_bulk_helper.apply_vacates (bulk UPDATEs, VacateLog and activity
+#      rows in one insert each),
+#   4. commits claim and vacate together.
+#
+# Several workers can run at once: a notice another worker has claimed no
+# longer matches Status = 'Pending', so the claiming UPDATE skips it (it waits
+# for the other transaction first) and each notice is processed exactly once.
+# If a tenant or unit changes between load and UPDATE the batch is rolled back
+# (claims included) and retried once.
+#
+# Notices whose tenant has already left are just marked Completed; notices
+# whose tenant has since moved to another unit are Canceled.
+#
+#   flask --app app process-vacate-notices        (daily cron)
+
+from datetime import date, datetime
+
+from sqlalchemy import select, update
+
+from models.models import db, Apartment, RentalUnit, Tenant, VacateNotice
+from utils.search_helper import invalidate_trigram_index
+from utils.tenant_bulk_helper import apply_vacates, BulkConflict
+from utils.unit_status_helper import status_id, VACANT
+
+BATCH_SIZE = 500
+
+
+def _due_ids(as_of: date, limit: int) -> list[int]:
+    return list(db.session.execute(
+        select(VacateNotice.NoticeID)
+        .where(VacateNotice.Status == "Pending",
+               VacateNotice.ExpectedVacateDate <= as_of)
+        .order_by(VacateNotice.ExpectedVacateDate, VacateNotice.NoticeID)
+        .limit(limit)).scalars())
+
+
+def _claim(ids: list[int]) -> list[int]:
+    return list(db.session.execute(
+        update(VacateNotice)
+        .where(VacateNotice.NoticeID.in_(ids), VacateNotice.Status == "Pending")
+        .values(Status="Completed")
+        .returning(VacateNotice.NoticeID)
+        .execution_options(synchronize_session=False)).scalars())
+
+
+def _load(ids: list[int]):
+    return db.session.execute(
+        select(VacateNotice.NoticeID, VacateNotice.TenantID, VacateNotice.RentalUnitID,
+               VacateNotice.Reason, Tenant.FullName, Tenant.Status,
+               Tenant.RentalUnitID.label("CurrentUnitID"), Tenant.PhoneE164, Tenant.SmsOptOut,
+               RentalUnit.StatusID, RentalUnit.Label, RentalUnit.ApartmentID,
+               Apartment.ApartmentName, Apartment.UserID)
+        .join(Tenant, Tenant.TenantID == VacateNotice.TenantID)
+        .join(RentalUnit, RentalUnit.UnitID == VacateNotice.RentalUnitID)
+        .join(Apartment, Apartment.ApartmentID == RentalUnit.ApartmentID)
+        .where(VacateNotice.NoticeID.in_(ids))
+        .order_by(VacateNotice.NoticeID)).all()
+
+
+def _process_batch(ids: list[int], now: datetime, notify: bool) -> dict:
+    out = {"claimed": 0, "vacated": 0, "already_vacated": 0, "canceled": 0}
+    claimed = _claim(ids)
+    if not claimed:
+        db.session.commit()
+        return out
+    out["claimed"] = len(claimed)
+
+    vacant = status_id(VACANT)
+    entries, canceled, seen = [], [], set()
+    for n in _load(claimed):
+        if n.Status != "Active" or n.TenantID in seen:
+            out["already_vacated"] += 1
+        elif n.CurrentUnitID != n.RentalUnitID:
+            canceled.append(n.NoticeID)
+        else:
+            seen.add(n.TenantID)
+            entries.append({
+                "TenantID": n.TenantID, "UnitID": n.RentalUnitID, "ApartmentID": n.ApartmentID,
+                "LandlordID": n.UserID, "FullName": n.FullName, "UnitLabel": n.Label,
+                "ApartmentName": n.ApartmentName,
+                "Phone": n.PhoneE164 if n.PhoneE164 and not n.SmsOptOut else None,
+                "Reason": n.Reason, "Notes": f"Vacate notice #{n.NoticeID}",
+                "FreeUnit": n.StatusID != vacant,
+            })
+
+    if canceled:
+        db.session.execute(
+            update(VacateNotice)
+            .where(VacateNotice.NoticeID.in_(canceled))
+            .values(Status="Canceled")
+            .execution_options(synchronize_session=False))
+    if entries:
+        apply_vacates(entries, now, notify)
+    db.session.commit()
+    out["vacated"], out["canceled"] = len(entries), len(canceled)
+    return out
+
+
+def process_vacate_notices(as_of: date | None = None, notify: bool = False,
+                           batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Vacate every tenant whose Pending notice is due on or before as_of
+    (default: today). Returns {"claimed", "vacated", "already_vacated", "canceled"}.
+    """
+    as_of = as_of or date.today()
+    totals = {"claimed": 0, "vacated": 0, "already_vacated": 0, "canceled": 0}
+    while True:
+        ids = _due_ids(as_of, batch_size)
+        if not ids:
+            break
+        now = datetime.utcnow()
+        for attempt in (1, 2):
+            try:
+                result = _process_batch(ids, now, notify)
+                break
+            except BulkConflict:
+                # a tenant or unit changed under us; claims were rolled back too
+                db.session.rollback()
+                if attempt == 2:
+                    raise
+            except Exception:
+                db.session.rollback()
+                raise
+        for k, v in result.items():
+            totals[k] += v
+
+    if totals["vacated"]:
+        invalidate_trigram_index("tenants")   # Core updates skip ORM events
+        invalidate_trigram_index("activity")
+    return totals